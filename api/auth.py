@@ -1,15 +1,25 @@
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
-from services.mongo_client import get_db
-from utils.jwt_utils import create_jwt
-from datetime import datetime
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from services.repositories import repository
+from services.passwords import HashPoolBusy, hash_password, verify_password, needs_rehash, rehash_in_background
+from services.roster import open_roster, import_roster
+from utils.auth import require_auth, require_admin, evict_cached_token
+from config import settings
+import io
+import json
+from utils.jwt_utils import verify_jwt
+from services.revocation import revoke
+from services import refresh_sessions
 
 auth_bp = Blueprint('auth_bp', __name__, url_prefix='/api/auth')
 
-db = get_db()
-users = db.users
-users.create_index('username', unique=True)
-users.create_index('email', unique=True)
+users = repository('users')
+
+
+def _busy():
+    response = jsonify({'error': 'Too many sign-ins right now, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+    return response
 
 
 @auth_bp.post('/register')
@@ -23,12 +33,12 @@ def register():
         return jsonify({'error': 'Missing fields'}), 400
 
     try:
-        users.insert_one({
-            'username': username,
-            'email': email,
-            'password_hash': generate_password_hash(password),
-            'created_at': datetime.utcnow()
-        })
+        password_hash = hash_password(password)
+    except HashPoolBusy:
+        return _busy()
+
+    try:
+        users.create(username, email, password_hash)
         return jsonify({'ok': True}), 201
     except Exception as e:
         return jsonify({'error': 'User exists or DB error', 'detail': str(e)}), 409
@@ -40,9 +50,120 @@ def login():
     username = (data.get('username') or '').strip()
     password = data.get('password') or ''
 
-    user = users.find_one({'username': username})
-    if not user or not check_password_hash(user['password_hash'], password):
+    user = users.find_by_username(username)
+    if not user:
+        return jsonify({'error': 'Invalid credentials'}), 401
+    try:
+        valid = verify_password(user['password_hash'], password)
+    except HashPoolBusy:
+        return _busy()
+    if not valid:
         return jsonify({'error': 'Invalid credentials'}), 401
 
-    token = create_jwt({'sub': str(user['_id']), 'username': username})
-    return jsonify({'token': token, 'username': username})
+    # Move the stored hash to the configured KDF parameters without blocking the login
+    if needs_rehash(user['password_hash']):
+        rehash_in_background(password, lambda new_hash: users.replace_password_hash(
+            str(user['_id']), user['password_hash'], new_hash
+        ))
+
+    return jsonify({**refresh_sessions.start(str(user['_id']), username), 'username': username})
+
+
+def _refresh_payload(refresh_token: str):
+    try:
+        payload = verify_jwt(refresh_token)
+    except Exception:
+        return None
+    if payload.get('type') != 'refresh' or not payload.get('jti'):
+        return None
+    return payload
+
+
+@auth_bp.post('/refresh')
+def refresh():
+    """Swap a refresh token for a new access/refresh pair; each refresh token works once.
+
+    Reuse within the grace window after a rotation is allowed (see
+    ``services.refresh_sessions``); later reuse ends the whole family.
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    payload = _refresh_payload(data.get('refresh_token') or '')
+    if payload is None:
+        return jsonify({'error': 'Invalid or expired refresh token'}), 401
+    user = users.find_by_id(payload.get('sub'))
+    if not user:
+        return jsonify({'error': 'Invalid or expired refresh token'}), 401
+    if payload.get('fid'):
+        tokens = refresh_sessions.rotate(payload, user['username'])
+        if tokens is None:
+            return jsonify({'error': 'Refresh token already used'}), 401
+    else:
+        # Issued before refresh families: claim it once through the
+        # revocation list, then move the client onto a family
+        if not revoke(payload['jti'], payload['exp']):
+            return jsonify({'error': 'Refresh token already used'}), 401
+        tokens = refresh_sessions.start(str(user['_id']), user['username'])
+    return jsonify({**tokens, 'username': user['username']})
+
+
+@auth_bp.route('/logout', methods=['POST', 'OPTIONS'])
+def logout():
+    """Revoke the refresh token in the body and, if one is presented, the access token.
+
+    Each token is checked on its own signature, so a client whose access token
+    has already expired can still revoke its refresh token.
+    """
+    if request.method == 'OPTIONS':
+        return ('', 204)
+    data = request.get_json(force=True, silent=True) or {}
+    refresh_token = data.get('refresh_token') or ''
+    auth = request.headers.get('Authorization', '')
+    access_token = auth.split(' ', 1)[1].strip() if auth.startswith('Bearer ') else ''
+    if not refresh_token and not access_token:
+        return jsonify({'error': 'No token to revoke'}), 400
+
+    revoked = 0
+    payload = _refresh_payload(refresh_token) if refresh_token else None
+    if payload is not None:
+        if payload.get('fid'):
+            refresh_sessions.end(payload)
+        else:
+            revoke(payload['jti'], payload['exp'])
+        revoked += 1
+    if access_token:
+        try:
+            access = verify_jwt(access_token)
+        except Exception:
+            # Expired or invalid: nothing left to revoke
+            access = None
+        if access and access.get('type', 'access') == 'access' and access.get('jti'):
+            revoke(access['jti'], access['exp'])
+            revoked += 1
+        evict_cached_token(access_token)
+    return jsonify({'ok': True, 'revoked': revoked})
+
+
+@auth_bp.route('/roster', methods=['POST', 'OPTIONS'])
+@require_auth
+@require_admin
+def roster_import():
+    """Create accounts from a roster CSV upload; streams one NDJSON report per chunk."""
+    if request.method == 'OPTIONS':
+        return ('', 204)
+    f = request.files.get('roster')
+    if not f or not f.filename.lower().endswith('.csv'):
+        return jsonify({'error': 'Upload a .csv roster as "roster"'}), 400
+    try:
+        reader = open_roster(io.TextIOWrapper(f.stream, encoding='utf-8-sig', newline=''))
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    def generate():
+        inserted = failed = 0
+        for report in import_roster(reader, settings.ROSTER_CHUNK_SIZE, settings.BULK_WORKERS):
+            inserted += report['inserted']
+            failed += len(report['errors'])
+            yield json.dumps(report) + '\n'
+        yield json.dumps({'done': True, 'inserted': inserted, 'failed': failed}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
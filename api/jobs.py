@@ -0,0 +1,70 @@
+from flask import Blueprint, request, jsonify, g
+from bson.errors import InvalidId
+from utils.auth import require_auth, require_admin
+from config import settings
+from services.job_catalog import add_job, deactivate_job, list_jobs, recommend_jobs
+from services.resume_vectors import student_skills
+
+jobs_bp = Blueprint('jobs_bp', __name__, url_prefix='/api/jobs')
+
+MAX_RECOMMENDATIONS = 50
+
+
+@jobs_bp.route('', methods=['POST', 'OPTIONS'])
+@require_auth
+@require_admin
+def create_job():
+    if request.method == 'OPTIONS':
+        return ('', 204)
+    data = request.get_json(silent=True) or {}
+    title = (data.get('title') or '').strip()
+    job_description = (data.get('job_description') or '').strip()
+    if not title or not job_description:
+        return jsonify({'error': 'title and job_description are required'}), 400
+    if len(job_description) > settings.MAX_JOB_DESCRIPTION_CHARS:
+        return jsonify({'error': 'Job description too long'}), 413
+
+    job_id = add_job(title, (data.get('company') or '').strip(), job_description, g.user.get('sub'))
+    if not job_id:
+        return jsonify({'error': 'No recognizable skills in job description'}), 400
+    return jsonify({'ok': True, 'id': job_id}), 201
+
+
+@jobs_bp.route('', methods=['GET', 'OPTIONS'])
+@require_auth
+def get_jobs():
+    if request.method == 'OPTIONS':
+        return ('', 204)
+    return jsonify({'jobs': list_jobs()})
+
+
+@jobs_bp.route('/<job_id>', methods=['DELETE', 'OPTIONS'])
+@require_auth
+@require_admin
+def close_job(job_id: str):
+    if request.method == 'OPTIONS':
+        return ('', 204)
+    try:
+        closed = deactivate_job(job_id)
+    except InvalidId:
+        return jsonify({'error': 'Not found'}), 404
+    if not closed:
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify({'ok': True})
+
+
+@jobs_bp.route('/recommendations', methods=['GET', 'OPTIONS'])
+@require_auth
+def recommendations():
+    """Open roles ranked by how well the student's latest resume covers their skills."""
+    if request.method == 'OPTIONS':
+        return ('', 204)
+    try:
+        k = max(1, min(int(request.args.get('k', 10)), MAX_RECOMMENDATIONS))
+    except ValueError:
+        return jsonify({'error': 'k must be a number'}), 400
+
+    skills = student_skills(g.user.get('sub'))
+    if skills is None:
+        return jsonify({'error': 'Upload a resume first'}), 404
+    return jsonify({'skills': skills, 'results': recommend_jobs(skills, k)})
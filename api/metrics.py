@@ -0,0 +1,33 @@
+from flask import Blueprint, jsonify, request
+from config import settings
+from services.metrics import snapshot, server_timing_header
+from utils.auth import require_auth, require_admin
+
+metrics_bp = Blueprint('metrics_bp', __name__, url_prefix='/api/metrics')
+
+
+@require_auth
+@require_admin
+def _admin_snapshot():
+    return jsonify(snapshot())
+
+
+@metrics_bp.get('')
+def get_metrics():
+    # Per-process numbers: each gunicorn worker reports its own window.
+    # Without a scraper token configured, only admins may read them
+    if not settings.METRICS_TOKEN:
+        return _admin_snapshot()
+    auth = request.headers.get('Authorization', '')
+    if auth != f'Bearer {settings.METRICS_TOKEN}':
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    return jsonify(snapshot())
+
+
+@metrics_bp.after_app_request
+def add_server_timing(response):
+    if settings.SERVER_TIMING_ENABLED:
+        value = server_timing_header()
+        if value:
+            response.headers['Server-Timing'] = value
+    return response
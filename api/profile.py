@@ -1,13 +1,11 @@
 from flask import Blueprint, request, jsonify, g
-from services.mongo_client import get_db
+from services.repositories import repository
 from utils.auth import require_auth
 from datetime import datetime
 
 profile_bp = Blueprint('profile_bp', __name__, url_prefix='/api/profile')
 
-db = get_db()
-profiles = db.profiles
-profiles.create_index('user_id')
+profiles = repository('profiles')
 
 
 @profile_bp.route('', methods=['POST', 'OPTIONS'])
@@ -18,7 +16,6 @@ def save_profile():
     data = request.get_json(force=True) or {}
     # expected keys: cgpa, backlogs, certifications, internship, aptitude, technical, communication, projects, hackathon, resume, branch
     doc = {
-        'user_id': g.user.get('sub'),
         'cgpa': float(data.get('cgpa', 0)),
         'backlogs': int(data.get('backlogs', 0)),
         'certifications': int(data.get('certifications', 0)),
@@ -28,7 +25,7 @@ def save_profile():
         'branch': (data.get('branch') or 'CSE'),
         'updated_at': datetime.utcnow(),
     }
-    profiles.update_one({'user_id': doc['user_id']}, {'$set': doc}, upsert=True)
+    profiles.update(g.user.get('sub'), doc)
     return jsonify({'ok': True})
 
 
@@ -37,5 +34,5 @@ def save_profile():
 def get_profile():
     if request.method == 'OPTIONS':
         return ('', 204)
-    p = profiles.find_one({'user_id': g.user.get('sub')}, {'_id': 0})
+    p = profiles.get(g.user.get('sub'))
     return jsonify(p or {})
@@ -1,14 +1,11 @@
 from flask import Blueprint, jsonify, request
-from services.mongo_client import get_db
+from services.repositories import repository
 from random import sample
 from typing import List
-from bson.objectid import ObjectId
 
 questions_bp = Blueprint('questions_bp', __name__, url_prefix='/api/questions')
 
-db = get_db()
-coll = db.questions
-coll.create_index([('category', 1)])
+questions = repository('questions')
 
 
 def _format(q):
@@ -24,7 +21,7 @@ def _format(q):
 @questions_bp.get('/<category>')
 def get_questions(category: str):
     # Fetch 30 random questions from Mongo; fallback to CSV loader if empty
-    docs: List[dict] = list(coll.find({'category': category.upper()}))
+    docs: List[dict] = questions.by_category(category.upper())
     if not docs:
         return jsonify({'questions': []}), 200
 
@@ -36,9 +33,9 @@ def get_questions(category: str):
 @questions_bp.get('/byid/<qid>')
 def get_question_by_id(qid: str):
     try:
-        q = coll.find_one({'_id': ObjectId(qid)})
-        if not q:
-            return jsonify({'error': 'Not found'}), 404
-        return jsonify(_format(q))
-    except Exception:
+        q = questions.get(qid)
+    except ValueError:
         return jsonify({'error': 'Invalid id'}), 400
+    if not q:
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(_format(q))
@@ -0,0 +1,93 @@
+from flask import Blueprint, request, jsonify
+from utils.auth import require_auth, require_admin
+from config import settings
+from services.repositories import repository
+from services.jd_cache import get_job_requirements
+from services.metrics import stage_timer
+from services.skill_vectors import requirement_weights, weight_matrix, top_k
+from services.resume_vectors import ranking_matrix, select_rows
+
+ranking_bp = Blueprint('ranking_bp', __name__, url_prefix='/api/ranking')
+
+users = repository('users')
+profiles = repository('profiles')
+
+MAX_TOP_K = 200
+
+
+def _profile_filter(data: dict) -> dict:
+    """Profile filters from optional min_cgpa / max_backlogs / branch."""
+    filters = {}
+    if data.get('min_cgpa') is not None:
+        filters['min_cgpa'] = float(data['min_cgpa'])
+    if data.get('max_backlogs') is not None:
+        filters['max_backlogs'] = int(data['max_backlogs'])
+    if data.get('branch'):
+        filters['branch'] = str(data['branch'])
+    return filters
+
+
+@ranking_bp.route('/students', methods=['POST', 'OPTIONS'])
+@require_auth
+@require_admin
+def rank_students():
+    """Top-k students whose stored resume skills best cover a job description."""
+    if request.method == 'OPTIONS':
+        return ('', 204)
+    data = request.get_json(silent=True) or {}
+    job_description = (data.get('job_description') or '').strip()
+    if not job_description:
+        return jsonify({'error': 'job_description is required'}), 400
+    if len(job_description) > settings.MAX_JOB_DESCRIPTION_CHARS:
+        return jsonify({'error': 'Job description too long'}), 413
+    try:
+        k = max(1, min(int(data.get('k', 20)), MAX_TOP_K))
+        profile_filters = _profile_filter(data)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'k, min_cgpa and max_backlogs must be numbers'}), 400
+
+    requirements = get_job_requirements(job_description)
+    weights = requirement_weights(requirements)
+    if not weights:
+        return jsonify({'error': 'No recognizable skills in job description'}), 400
+
+    with stage_timer('rank_students', group='ranking_ms'):
+        vectors = ranking_matrix()
+        matrix = vectors['matrix']
+        if profile_filters:
+            rows = select_rows(vectors, profiles.find_user_ids(**profile_filters))
+            matrix = matrix[rows]
+        else:
+            rows = range(len(vectors['user_ids']))
+
+        scores = matrix @ weight_matrix([weights]).T
+        scores = scores.toarray().ravel() * 100
+        best = [(int(i), rows[int(i)]) for i in top_k(scores, k)]
+
+    top_ids = [vectors['user_ids'][row] for _, row in best]
+    profile_docs = profiles.get_many(top_ids)
+    names = users.usernames(top_ids)
+
+    results = []
+    for rank, (i, row) in enumerate(best, start=1):
+        user_id = vectors['user_ids'][row]
+        profile = profile_docs.get(user_id, {})
+        results.append({
+            'rank': rank,
+            'user_id': user_id,
+            'username': names.get(user_id),
+            'skills_coverage': round(float(scores[i]), 1),
+            'matched_skills': sorted(set(vectors['skills'][row]) & weights.keys()),
+            # Skills found under an older taxonomy; newer skills may be missing
+            'stale': user_id in vectors['stale'],
+            'cgpa': profile.get('cgpa'),
+            'backlogs': profile.get('backlogs'),
+            'branch': profile.get('branch'),
+        })
+
+    return jsonify({
+        'role_category': requirements.get('role_category'),
+        'required_skills': sorted(weights),
+        'candidates': len(rows),
+        'results': results,
+    })
@@ -1,14 +1,13 @@
 from flask import Blueprint, jsonify, g, request
-from services.mongo_client import get_db
+from services.repositories import repository
 from utils.auth import require_auth
 from score_predictor import predict_score
 from utils.personalized_recommendations import generate_personalized_recommendations
 
 results_bp = Blueprint('results_bp', __name__, url_prefix='/api/results')
 
-db = get_db()
-profiles = db.profiles
-sessions = db.test_sessions
+profiles = repository('profiles')
+sessions = repository('test_sessions')
 
 
 def _safe_int(v, d=0):
@@ -32,10 +31,10 @@ def _safe_float(v, d=0.0):
 @require_auth
 def get_results():
     user_id = g.user.get('sub')
-    profile = profiles.find_one({'user_id': user_id}) or {}
+    profile = profiles.get(user_id) or {}
 
     # pull latest test scores if present
-    tests = {doc['type'].lower(): doc for doc in sessions.find({'user_id': user_id})}
+    tests = {doc['type'].lower(): doc for doc in sessions.for_user(user_id)}
     aptitude = _safe_int((tests.get('APTITUDE') or {}).get('score', (tests.get('aptitude') or {}).get('score', 0)))
     technical = _safe_int((tests.get('TECHNICAL') or {}).get('score', (tests.get('technical') or {}).get('score', 0)))
     communication = _safe_int((tests.get('COMMUNICATION') or {}).get('score', (tests.get('communication') or {}).get('score', 0)))
@@ -1,13 +1,11 @@
 from flask import Blueprint, request, jsonify, g
-from services.mongo_client import get_db
+from services.repositories import repository
 from utils.auth import require_auth
 from datetime import datetime
 
 tests_bp = Blueprint('tests_bp', __name__, url_prefix='/api/tests')
 
-db = get_db()
-sessions = db.test_sessions
-sessions.create_index([('user_id', 1), ('type', 1)])
+sessions = repository('test_sessions')
 
 
 # Compute score: count matches of selected against correct
@@ -36,14 +34,11 @@ def submit_test(test_type: str):
     data = request.get_json(force=True) or {}
     answers = data.get('answers') or []
     score, details = _calculate_score(answers)
-    doc = {
-        'user_id': g.user.get('sub'),
-        'type': test_type.upper(),
+    sessions.save(g.user.get('sub'), test_type.upper(), {
         'score': int(score),
         'details': details,
         'submitted_at': datetime.utcnow(),
-    }
-    sessions.update_one({'user_id': doc['user_id'], 'type': doc['type']}, {'$set': doc}, upsert=True)
+    })
     return jsonify({'score': score})
 
 
@@ -51,5 +46,5 @@ def submit_test(test_type: str):
 @require_auth
 def get_overview():
     user_id = g.user.get('sub')
-    docs = list(sessions.find({'user_id': user_id}, {'_id': 0}))
+    docs = sessions.for_user(user_id)
     return jsonify({'tests': docs})
@@ -23,7 +23,11 @@ from api.profile import profile_bp
 from api.resume import resume_bp
 from api.tests import tests_bp
 from api.results import results_bp
+from api.metrics import metrics_bp
+from api.ranking import ranking_bp
+from api.jobs import jobs_bp
 from services.mailer import send_email as brevo_send_email
+from services.indexes import verify_indexes_once
 
 app = Flask(__name__, template_folder='templates', static_folder='frontend/dist', static_url_path='')
 app.secret_key = settings.FLASK_SECRET_KEY
@@ -58,6 +62,16 @@ app.register_blueprint(profile_bp)
 app.register_blueprint(resume_bp)
 app.register_blueprint(tests_bp)
 app.register_blueprint(results_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(ranking_bp)
+app.register_blueprint(jobs_bp)
+
+# Indexes are created by scripts/migrate.py. Each worker reports gaps in the
+# background once it serves its first request, i.e. after any fork, never at import
+@app.before_request
+def check_indexes_once():
+    if settings.REPOSITORY_BACKEND == 'mongo':
+        verify_indexes_once()
 
 # Legacy CSV authentication functions removed - using MongoDB API authentication instead
 
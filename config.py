@@ -12,15 +12,112 @@ class Settings:
     # MongoDB - Updated for production compatibility
     MONGO_URI = os.getenv('MONGODB_URI', os.getenv('MONGO_URI', 'mongodb://localhost:27017'))
     MONGO_DB = os.getenv('MONGO_DB', 'campusfit')
+    # Storage for users, profiles, test sessions, questions and revoked tokens:
+    # mongo, or memory for benchmarks without a database (per process, not persisted)
+    REPOSITORY_BACKEND = os.getenv('REPOSITORY_BACKEND', 'mongo').lower()
+    # Connection pool, per worker process
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000'))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '20000'))  # 0 = no timeout
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '10000'))
+    # Per-command latency metrics; commands over MONGO_SLOW_QUERY_MS are reported as slow.
+    # MONGO_EXPLAIN_SAMPLE_RATE > 0 (debug) explains that share of slow queries in the background.
+    MONGO_COMMAND_MONITORING = os.getenv('MONGO_COMMAND_MONITORING', 'True').lower() == 'true'
+    MONGO_SLOW_QUERY_MS = float(os.getenv('MONGO_SLOW_QUERY_MS', '100'))
+    MONGO_EXPLAIN_SAMPLE_RATE = float(os.getenv('MONGO_EXPLAIN_SAMPLE_RATE', '0'))
+    # Optional JSON-lines log of slow queries, rotated by size
+    MONGO_SLOW_QUERY_LOG = os.getenv('MONGO_SLOW_QUERY_LOG', '')
+    MONGO_SLOW_QUERY_LOG_BYTES = int(os.getenv('MONGO_SLOW_QUERY_LOG_BYTES', str(10 * 1024 * 1024)))
+    MONGO_SLOW_QUERY_LOG_BACKUPS = int(os.getenv('MONGO_SLOW_QUERY_LOG_BACKUPS', '3'))
 
     # JWT - Updated variable names for consistency
     JWT_SECRET = os.getenv('JWT_SECRET_KEY', os.getenv('JWT_SECRET', os.urandom(32).hex()))
-    JWT_EXPIRES_SECONDS = int(os.getenv('JWT_EXPIRES_SECONDS', '86400'))  # 1 day
+    JWT_EXPIRES_SECONDS = int(os.getenv('JWT_EXPIRES_SECONDS', '900'))  # access token, 15 min
+    JWT_REFRESH_EXPIRES_SECONDS = int(os.getenv('JWT_REFRESH_EXPIRES_SECONDS', '1209600'))  # 14 days
+    # A just-rotated refresh token still works this long, for tabs refreshing at once
+    REFRESH_GRACE_SECONDS = int(os.getenv('REFRESH_GRACE_SECONDS', '10'))
+
+    # Revoked token ids, mirrored per worker in a Bloom filter
+    REVOCATION_SYNC_SECONDS = int(os.getenv('REVOCATION_SYNC_SECONDS', '5'))
+    REVOCATION_REBUILD_SECONDS = int(os.getenv('REVOCATION_REBUILD_SECONDS', '600'))
+    REVOCATION_FILTER_CAPACITY = int(os.getenv('REVOCATION_FILTER_CAPACITY', '100000'))
+    REVOCATION_FILTER_ERROR_RATE = float(os.getenv('REVOCATION_FILTER_ERROR_RATE', '0.001'))
+
+    # Password hashing - werkzeug method string, e.g. scrypt:32768:8:1 or pbkdf2:sha256:600000.
+    # Stored hashes made with other parameters are upgraded on the next login.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    # Keep WORKERS + QUEUE below each gunicorn worker's --threads
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', '2'))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv('PASSWORD_HASH_TIMEOUT_SECONDS', '5'))
+    PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv('PASSWORD_HASH_RETRY_AFTER_SECONDS', '2'))
+
+    # Verified-token cache in require_auth (per worker process)
+    AUTH_TOKEN_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_CACHE_SIZE', '4096'))
+    AUTH_TOKEN_CACHE_TTL_SECONDS = int(os.getenv('AUTH_TOKEN_CACHE_TTL_SECONDS', '300'))
 
     # Uploads - Production-ready paths
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', '/tmp/uploads' if os.getenv('FLASK_ENV') == 'production' else 'static/uploads')
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', str(16 * 1024 * 1024)))  # 16MB
 
+    # Bulk resume scoring
+    BULK_CHECKPOINT_FOLDER = os.getenv('BULK_CHECKPOINT_FOLDER', os.path.join(UPLOAD_FOLDER, 'bulk'))
+    BULK_WORKERS = int(os.getenv('BULK_WORKERS', '0')) or None  # None = one per CPU
+    # Checkpoints of runs that never completed are deleted after this long
+    BULK_CHECKPOINT_MAX_AGE_SECONDS = int(os.getenv('BULK_CHECKPOINT_MAX_AGE_SECONDS', str(7 * 24 * 3600)))
+    # Limits on an uploaded zip, checked against the uncompressed sizes
+    BULK_MAX_FILES = int(os.getenv('BULK_MAX_FILES', '2000'))
+    BULK_MAX_FILE_BYTES = int(os.getenv('BULK_MAX_FILE_BYTES', str(10 * 1024 * 1024)))  # 10MB
+    BULK_MAX_TOTAL_BYTES = int(os.getenv('BULK_MAX_TOTAL_BYTES', str(512 * 1024 * 1024)))  # 512MB
+    ROSTER_CHUNK_SIZE = int(os.getenv('ROSTER_CHUNK_SIZE', '500'))
+    MATCH_MANY_MAX_RESUMES = int(os.getenv('MATCH_MANY_MAX_RESUMES', '1000'))
+    MATCH_MANY_CHUNK_SIZE = int(os.getenv('MATCH_MANY_CHUNK_SIZE', '16'))
+
+    # Admission control for resume processing. Limits are per worker process
+    # and not shared: the whole deployment admits (workers x RESUME_MAX_CONCURRENT)
+    RESUME_MAX_CONCURRENT = int(os.getenv('RESUME_MAX_CONCURRENT', '2'))
+    RESUME_MAX_QUEUE = int(os.getenv('RESUME_MAX_QUEUE', '4'))
+    RESUME_QUEUE_TIMEOUT_SECONDS = float(os.getenv('RESUME_QUEUE_TIMEOUT_SECONDS', '2'))
+    RESUME_PER_USER_CONCURRENT = int(os.getenv('RESUME_PER_USER_CONCURRENT', '1'))
+    RESUME_RETRY_AFTER_SECONDS = int(os.getenv('RESUME_RETRY_AFTER_SECONDS', '5'))
+
+    # Pre-extracted resume text submissions
+    MAX_RESUME_TEXT_CHARS = int(os.getenv('MAX_RESUME_TEXT_CHARS', '100000'))
+    MAX_JOB_DESCRIPTION_CHARS = int(os.getenv('MAX_JOB_DESCRIPTION_CHARS', '20000'))
+
+    # Resume handles - parsed resumes kept for re-scoring against new job descriptions
+    RESUME_HANDLE_TTL_SECONDS = int(os.getenv('RESUME_HANDLE_TTL_SECONDS', '1800'))  # 30 min
+    RESUME_HANDLE_CACHE_SIZE = int(os.getenv('RESUME_HANDLE_CACHE_SIZE', '256'))
+
+    # Versioned role/skill taxonomy, reloaded when the file's mtime changes
+    TAXONOMY_PATH = os.getenv('TAXONOMY_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'taxonomy.json'))
+    TAXONOMY_RELOAD_SECONDS = float(os.getenv('TAXONOMY_RELOAD_SECONDS', '5'))
+
+    # Job-description analysis cache; JD_CACHE_PERSIST shares parses across workers via Mongo
+    JD_CACHE_SIZE = int(os.getenv('JD_CACHE_SIZE', '512'))
+    JD_CACHE_PERSIST = os.getenv('JD_CACHE_PERSIST', 'False').lower() == 'true'
+
+    # Keyword component of the job match: 'priority' (top JD words) or 'bm25'
+    # (corpus IDF-weighted relevance, used once RELEVANCE_MIN_DOCS are indexed).
+    # Uploads and postings are added to the BM25 corpus only while it is 'bm25'
+    KEYWORD_SCORER = os.getenv('KEYWORD_SCORER', 'priority').lower()
+    RELEVANCE_MIN_DOCS = int(os.getenv('RELEVANCE_MIN_DOCS', '20'))
+    RELEVANCE_IDF_CACHE_SECONDS = int(os.getenv('RELEVANCE_IDF_CACHE_SECONDS', '300'))
+    # Most common terms loaded into each worker's IDF table
+    RELEVANCE_MAX_TERMS = int(os.getenv('RELEVANCE_MAX_TERMS', '50000'))
+
+    # Job catalog matrix is reloaded from Mongo at most this often per worker
+    JOB_CATALOG_CACHE_SECONDS = int(os.getenv('JOB_CATALOG_CACHE_SECONDS', '60'))
+    # Students' skill matrix for ranking, likewise; an upload on this worker refreshes it at once
+    RANKING_CACHE_SECONDS = int(os.getenv('RANKING_CACHE_SECONDS', '60'))
+
+    # Metrics - METRICS_TOKEN, when set, is required as a Bearer token on /api/metrics;
+    # when empty the endpoint needs an admin's access token instead
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'False').lower() == 'true'
+
     # CORS Configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000,http://localhost:5173').split(',')
 
@@ -0,0 +1,45 @@
+# ===== conftest.py =====
+# Shared fixtures. Endpoint tests run on the in-memory repositories, so no
+# MongoDB is needed; each test gets a fresh, empty set.
+import json
+import os
+
+import pytest
+
+from config import settings
+from services.repositories import repositories, reset_repositories
+import utils.taxonomy as taxonomy
+
+
+@pytest.fixture
+def memory_repos(monkeypatch):
+    monkeypatch.setattr(settings, 'REPOSITORY_BACKEND', 'memory')
+    reset_repositories()
+    yield repositories()
+    reset_repositories()
+
+
+@pytest.fixture
+def client(memory_repos):
+    from app import app
+    return app.test_client()
+
+
+@pytest.fixture
+def taxonomy_file(tmp_path, monkeypatch):
+    """Point the taxonomy at a temp file; returns a writer that makes each edit visible."""
+    path = tmp_path / 'taxonomy.json'
+    monkeypatch.setattr(settings, 'TAXONOMY_PATH', str(path))
+    monkeypatch.setattr(settings, 'TAXONOMY_RELOAD_SECONDS', 0)
+    monkeypatch.setattr(taxonomy, '_current', None)
+    monkeypatch.setattr(taxonomy, '_loaded_mtime', None)
+    monkeypatch.setattr(taxonomy, '_next_check', 0.0)
+    edits = [0]
+
+    def write(content):
+        path.write_text(content if isinstance(content, str) else json.dumps(content))
+        # Every edit must look new even within one mtime tick
+        edits[0] += 1
+        os.utime(path, ns=(edits[0] * 10 ** 9, edits[0] * 10 ** 9))
+
+    return write
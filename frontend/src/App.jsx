@@ -11,13 +11,14 @@ import Tests from './pages/Tests.jsx'
 import TestPage from './pages/TestPage.jsx'
 import Results from './pages/Results.jsx'
 import TestTransition from './components/TestTransition.jsx'
+import { storeTokens } from './lib/api'
 
 export default function App(){
   const [token, setToken] = useState(localStorage.getItem('token') || '')
 
-  const onAuth = (tk) => {
-    localStorage.setItem('token', tk)
-    setToken(tk)
+  const onAuth = (tokens) => {
+    storeTokens(tokens)
+    setToken(tokens.token)
   }
 
   return (
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import { Link, useLocation, useNavigate } from 'react-router-dom'
+import api, { clearTokens } from '../lib/api'
 
 export default function Navbar(){
   const { pathname } = useLocation()
@@ -14,7 +15,12 @@ export default function Navbar(){
   }, [pathname])
 
   const handleLogout = () => {
-    localStorage.removeItem('token')
+    // Revoke both tokens server-side; log out locally even if that fails
+    api.post('/auth/logout',
+      { refresh_token: localStorage.getItem('refresh_token') },
+      { headers: { Authorization: `Bearer ${localStorage.getItem('token')}` } }
+    ).catch(() => {})
+    clearTokens()
     setIsLoggedIn(false)
     setIsMenuOpen(false)
     navigate('/auth/login')
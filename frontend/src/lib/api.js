@@ -11,4 +11,59 @@ api.interceptors.request.use((config) => {
   return config
 })
 
+export function storeTokens({ token, refresh_token }) {
+  localStorage.setItem('token', token)
+  if (refresh_token) localStorage.setItem('refresh_token', refresh_token)
+}
+
+export function clearTokens() {
+  localStorage.removeItem('token')
+  localStorage.removeItem('refresh_token')
+}
+
+// One refresh at a time: requests that fail together wait for the same new token
+let refreshing = null
+
+export function refreshAccessToken() {
+  const refresh_token = localStorage.getItem('refresh_token')
+  if (!refresh_token) return Promise.resolve(null)
+  if (!refreshing) {
+    refreshing = axios.post(`${api.defaults.baseURL}/auth/refresh`, { refresh_token })
+      .then(({ data }) => {
+        storeTokens(data)
+        return data.token
+      })
+      .catch(() => {
+        clearTokens()
+        return null
+      })
+      .finally(() => { refreshing = null })
+  }
+  return refreshing
+}
+
+// Access tokens are short-lived: on a 401, refresh once and replay the request
+api.interceptors.response.use(null, async (error) => {
+  const config = error.config
+  if (error.response?.status !== 401 || !config || config._retried || config.url?.startsWith('/auth/')) {
+    throw error
+  }
+  const token = await refreshAccessToken()
+  if (!token) throw error
+  config._retried = true
+  config.headers.Authorization = `Bearer ${token}`
+  return api(config)
+})
+
+// fetch() with the access token, refreshing it once on a 401
+export async function authFetch(url, options = {}) {
+  const send = () => fetch(url, {
+    ...options,
+    headers: { ...options.headers, Authorization: `Bearer ${localStorage.getItem('token')}` },
+  })
+  const response = await send()
+  if (response.status === 401 && await refreshAccessToken()) return send()
+  return response
+}
+
 export default api
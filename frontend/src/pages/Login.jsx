@@ -15,7 +15,7 @@ export default function Login({ onAuth }){
     setLoading(true)
     try {
       const { data } = await api.post('/auth/login', { username, password })
-      onAuth?.(data.token)
+      onAuth?.(data)
       navigate('/dashboard')
     } catch (err) {
       setError(err?.response?.data?.error || 'Login failed')
@@ -1,5 +1,6 @@
 import React, { useState } from 'react'
 import Layout from '../components/Layout'
+import { authFetch } from '../lib/api'
 
 export default function Resume() {
   const [file, setFile] = useState(null)
@@ -14,6 +15,7 @@ export default function Resume() {
   const [processingSteps, setProcessingSteps] = useState([])
   const [currentStep, setCurrentStep] = useState(0)
   const [resumeContent, setResumeContent] = useState('')
+  const [rescoring, setRescoring] = useState(false)
 
   const handleFile = async (selectedFile) => {
     if (!selectedFile) return
@@ -71,11 +73,8 @@ export default function Resume() {
       // Start the visual processing simulation
       simulateProcessing()
 
-      const response = await fetch('/api/resume/upload', {
+      const response = await authFetch('/api/resume/upload', {
         method: 'POST',
-        headers: {
-          'Authorization': `Bearer ${localStorage.getItem('token')}`
-        },
         body: formData
       })
 
@@ -108,6 +107,34 @@ export default function Resume() {
     }
   }
 
+  // Re-score the already uploaded resume against a new job description
+  const rescoreWithJob = async () => {
+    if (!analysis?.handle) return
+    setRescoring(true)
+    setError('')
+    try {
+      const response = await authFetch(`/api/resume/${analysis.handle}/match`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ job_description: jobDescription.trim() })
+      })
+      const data = await response.json()
+      if (response.ok) {
+        setAnalysis(data)
+      } else if (response.status === 404) {
+        setError('Your resume session expired, please upload the file again')
+      } else {
+        setError(data.error || 'Re-analysis failed')
+      }
+    } catch (err) {
+      setError('Network error occurred')
+    } finally {
+      setRescoring(false)
+    }
+  }
+
   const onFile = (e) => {
     const selectedFile = e.target.files?.[0]
     if (selectedFile) {
@@ -474,6 +501,31 @@ export default function Resume() {
                 
                 {/* Right Column - Detailed Analysis */}
                 <div className="lg:col-span-2 space-y-6">
+                  {/* Try Another Job Description */}
+                  {analysis.handle && (
+                    <div className="bg-white rounded-xl shadow-lg p-6">
+                      <h3 className="text-md font-semibold text-gray-900 mb-3">🎯 Match Against a Job Description</h3>
+                      <textarea
+                        value={jobDescription}
+                        onChange={(e) => setJobDescription(e.target.value)}
+                        placeholder="Paste a job description to re-check your ATS match without re-uploading..."
+                        className="w-full h-24 p-3 border border-gray-300 rounded-lg resize-none focus:ring-2 focus:ring-blue-500 focus:border-transparent text-sm"
+                      />
+                      <div className="flex items-center justify-between mt-3">
+                        <span className="text-xs text-gray-500">
+                          {error ? <span className="text-red-600">{error}</span> : '💡 Only the ATS match is recomputed'}
+                        </span>
+                        <button
+                          onClick={rescoreWithJob}
+                          disabled={rescoring}
+                          className="bg-gradient-to-r from-blue-600 to-purple-600 text-white px-4 py-2 rounded-lg text-sm font-semibold disabled:opacity-50"
+                        >
+                          {rescoring ? 'Matching...' : 'Re-check Match'}
+                        </button>
+                      </div>
+                    </div>
+                  )}
+
                   {/* Content & Structure Quality */}
                   <div className="bg-white rounded-xl shadow-lg p-6">
                     <div 
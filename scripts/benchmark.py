@@ -0,0 +1,140 @@
+"""
+End-to-end throughput benchmark of the API on the in-memory repositories.
+
+Seeds users, profiles, test sessions and questions in process memory, then
+drives the endpoints through Flask's test client, so no MongoDB or network is
+involved and the numbers reflect the Python request path alone.
+
+Usage:
+  python scripts/benchmark.py
+  python scripts/benchmark.py --requests 2000 --users 500
+  python scripts/benchmark.py --only results --profile     # cProfile one endpoint
+
+Endpoints that still use Mongo collections directly (resume, jobs, ranking)
+are not covered.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import cProfile
+import pstats
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+# Must be set before config is imported
+os.environ['REPOSITORY_BACKEND'] = 'memory'
+
+from services.repositories import repositories
+from services.passwords import hash_password
+from utils.jwt_utils import create_token_pair
+
+CATEGORIES = ('APTITUDE', 'TECHNICAL', 'COMMUNICATION')
+
+
+def seed(users: int, questions: int):
+    repos = repositories()
+    password_hash = hash_password('benchmark')
+    tokens = []
+    for i in range(users):
+        username = f'student{i}'
+        user_id = repos.users.create(username, f'{username}@example.com', password_hash)
+        repos.profiles.update(user_id, {
+            'cgpa': round(random.uniform(5, 10), 2),
+            'backlogs': random.randint(0, 3),
+            'certifications': random.randint(0, 6),
+            'internship': random.randint(0, 2),
+            'projects': random.randint(0, 5),
+            'hackathon': random.randint(0, 2),
+            'branch': random.choice(['CSE', 'ECE', 'ME']),
+            'resume_score': random.randint(30, 95),
+        })
+        for category in CATEGORIES:
+            repos.test_sessions.save(user_id, category, {'score': random.randint(0, 30), 'details': []})
+        tokens.append(create_token_pair(user_id, username)['token'])
+    for category in CATEGORIES:
+        repos.questions.add_many([{
+            'category': category,
+            'question': f'{category} question {n}',
+            'options': ['a', 'b', 'c', 'd'],
+            'correct_letter': 'A',
+        } for n in range(questions)])
+    return tokens
+
+
+def scenarios(client, tokens):
+    """Name -> callable issuing one request as a random user."""
+    answers = [{'questionId': str(n), 'selected': 'a', 'correct': random.choice('ab')} for n in range(30)]
+
+    def auth():
+        return {'Authorization': f'Bearer {random.choice(tokens)}'}
+
+    return {
+        'profile_get': lambda: client.get('/api/profile', headers=auth()),
+        'profile_post': lambda: client.post('/api/profile', headers=auth(), json={
+            'cgpa': 8.1, 'backlogs': 0, 'certifications': 2, 'internship': 1, 'projects': 3, 'hackathon': 1,
+            'branch': 'CSE'}),
+        'tests_submit': lambda: client.post('/api/tests/aptitude', headers=auth(), json={'answers': answers}),
+        'tests_overview': lambda: client.get('/api/tests', headers=auth()),
+        'questions': lambda: client.get(f'/api/questions/{random.choice(CATEGORIES).lower()}'),
+        'results': lambda: client.get('/api/results', headers=auth()),
+        'login': lambda: client.post('/api/auth/login', json={
+            'username': f'student{random.randrange(len(tokens))}', 'password': 'benchmark'}),
+    }
+
+
+def run(name, request, count):
+    timings = []
+    started = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        response = request()
+        timings.append((time.perf_counter() - t0) * 1000)
+        if response.status_code >= 400:
+            raise SystemExit(f'{name}: HTTP {response.status_code} {response.get_data(as_text=True)[:200]}')
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    print(f'{name:15} {count / elapsed:9.1f} req/s  p50 {timings[len(timings) // 2]:7.2f} ms  '
+          f'p95 {timings[int(len(timings) * 0.95)]:7.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark API endpoints on in-memory repositories')
+    parser.add_argument('--users', type=int, default=200, help='Seeded students')
+    parser.add_argument('--questions', type=int, default=100, help='Seeded questions per category')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint')
+    parser.add_argument('--only', action='append', help='Run only this scenario (repeatable)')
+    parser.add_argument('--profile', action='store_true', help='Print the top functions by cumulative time')
+    args = parser.parse_args()
+
+    random.seed(0)
+    tokens = seed(args.users, args.questions)
+
+    from app import app
+    client = app.test_client()
+    selected = scenarios(client, tokens)
+    unknown = set(args.only or ()) - selected.keys()
+    if unknown:
+        parser.error(f'unknown scenario(s): {", ".join(sorted(unknown))}; choose from {", ".join(selected)}')
+    if args.only:
+        selected = {name: selected[name] for name in args.only}
+
+    profiler = cProfile.Profile() if args.profile else None
+    for name, request in selected.items():
+        # Login runs the password KDF; fewer requests keep it from dominating
+        count = max(1, args.requests // 20) if name == 'login' else args.requests
+        request()  # warm up
+        if profiler:
+            profiler.enable()
+        run(name, request, count)
+        if profiler:
+            profiler.disable()
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Score a whole placement batch of resumes and print one JSON result per line.
+
+Usage:
+  python scripts/bulk_score_resumes.py resumes.zip --jd-file jd.txt --out results.ndjson
+  python scripts/bulk_score_resumes.py path/to/resume_dir --workers 8
+
+Results are checkpointed (by default next to --out, or in BULK_CHECKPOINT_FOLDER),
+so re-running the same command after an interruption only scores what is left.
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from config import settings
+from services.bulk_resume import collect_resume_files, iter_bulk_scores, run_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-score resumes from a zip archive or directory')
+    parser.add_argument('source', help='Zip archive or directory of .pdf/.doc/.docx resumes')
+    parser.add_argument('--jd', dest='jd', default='', help='Shared job description text')
+    parser.add_argument('--jd-file', dest='jd_file', help='File containing the shared job description')
+    parser.add_argument('--out', dest='out', help='Write NDJSON results here instead of stdout')
+    parser.add_argument('--checkpoint', dest='checkpoint', help='Checkpoint file (default: derived from --out or the run)')
+    parser.add_argument('--workers', dest='workers', type=int, default=settings.BULK_WORKERS, help='Worker processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    job_description = args.jd
+    if args.jd_file:
+        job_description = Path(args.jd_file).read_text(encoding='utf-8')
+    job_description = job_description.strip()
+
+    if not os.path.exists(args.source):
+        print(f'ERROR: {args.source} not found', file=sys.stderr)
+        raise SystemExit(1)
+
+    checkpoint = args.checkpoint
+    if not checkpoint:
+        if args.out:
+            checkpoint = args.out + '.checkpoint'
+        elif os.path.isfile(args.source):
+            os.makedirs(settings.BULK_CHECKPOINT_FOLDER, exist_ok=True)
+            checkpoint = os.path.join(settings.BULK_CHECKPOINT_FOLDER, run_key(args.source, job_description) + '.ndjson')
+
+    workdir = tempfile.mkdtemp(prefix='bulk-')
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+    try:
+        files = collect_resume_files(args.source, workdir)
+        print(f'Scoring {len(files)} resumes (checkpoint: {checkpoint or "none"})', file=sys.stderr)
+        scored = 0
+        for row in iter_bulk_scores(files, job_description, checkpoint, args.workers):
+            out.write(json.dumps(row) + '\n')
+            out.flush()
+            scored += 1
+        print(f'Done. {scored} results', file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
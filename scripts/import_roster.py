@@ -0,0 +1,46 @@
+"""
+Create student accounts from a roster CSV (columns: username,email,password).
+
+Usage:
+  python scripts/import_roster.py roster.csv
+  python scripts/import_roster.py roster.csv --workers 8 --chunk-size 1000
+
+Rows that fail (missing fields, duplicate username or email) are listed on
+stderr; every other row is created.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from config import settings
+from services.roster import open_roster, import_roster
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-create student accounts from a roster CSV')
+    parser.add_argument('roster', help='CSV file with username,email,password columns')
+    parser.add_argument('--chunk-size', dest='chunk_size', type=int, default=settings.ROSTER_CHUNK_SIZE, help='Rows per insert_many batch')
+    parser.add_argument('--workers', dest='workers', type=int, default=settings.BULK_WORKERS, help='Hashing processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    inserted = failed = 0
+    with open(args.roster, 'r', encoding='utf-8-sig', newline='') as f:
+        try:
+            reader = open_roster(f)
+        except ValueError as e:
+            print(f'ERROR: {e}', file=sys.stderr)
+            raise SystemExit(1)
+        for report in import_roster(reader, args.chunk_size, args.workers):
+            inserted += report['inserted']
+            failed += len(report['errors'])
+            for error in report['errors']:
+                print(f"row {error['row']} ({error['username'] or '-'}): {error['error']}", file=sys.stderr)
+            print(f"rows {report['rows'][0]}-{report['rows'][1]}: {report['inserted']} created", file=sys.stderr)
+    print(f'Done. {inserted} accounts created, {failed} rows failed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Create the Mongo indexes declared in services/indexes.py.
+
+Usage:
+  python scripts/migrate.py            # create missing indexes, update TTLs
+  python scripts/migrate.py --check    # report only, exit 1 if anything is missing
+  python scripts/migrate.py --replace  # also drop and rebuild indexes whose options differ
+
+Run it on deploy, before starting the app. Re-running is safe: indexes that
+already match are left alone. A unique index fails to build while duplicates
+exist (e.g. two profiles for one user_id); those are reported with the
+offending key so they can be cleaned up first.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from services.mongo_client import get_db
+from services.indexes import apply_indexes, index_status
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create the Mongo indexes the app relies on')
+    parser.add_argument('--check', action='store_true', help='Only report missing or differing indexes')
+    parser.add_argument('--replace', action='store_true', help='Drop and rebuild indexes whose options differ')
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.check:
+        problems = index_status(db)
+        for problem in problems:
+            print(f"{problem['collection']}.{problem['index']}: {problem['problem']}")
+        print('Indexes up to date' if not problems else f'{len(problems)} index(es) need migrating')
+        raise SystemExit(1 if problems else 0)
+
+    failed = 0
+    for result in apply_indexes(db, replace=args.replace):
+        line = f"{result['collection']}.{result['index']}: {result['status']}"
+        if result.get('detail'):
+            line += f" ({result['detail']})"
+        print(line, file=sys.stderr if result['status'] in ('conflict', 'error') else sys.stdout)
+        failed += result['status'] in ('conflict', 'error')
+    if failed:
+        print(f'{failed} index(es) could not be migrated', file=sys.stderr)
+        raise SystemExit(1)
+    print('Done.')
+
+
+if __name__ == '__main__':
+    main()
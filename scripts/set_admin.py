@@ -0,0 +1,34 @@
+"""
+Grant or withdraw admin rights (bulk scoring, job catalog, roster import).
+
+Usage:
+  python scripts/set_admin.py alice
+  python scripts/set_admin.py alice --revoke
+
+Admin rights live on the user record and can only be changed here, so
+registering an account never makes anyone an admin.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from services.repositories import repositories
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Grant or withdraw admin rights for an existing account')
+    parser.add_argument('username', help='Account to change')
+    parser.add_argument('--revoke', action='store_true', help='Withdraw admin rights instead of granting them')
+    args = parser.parse_args()
+
+    if not repositories().users.set_admin(args.username, not args.revoke):
+        print(f'ERROR: no user named {args.username}', file=sys.stderr)
+        raise SystemExit(1)
+    print(f"{args.username} is {'no longer' if args.revoke else 'now'} an admin")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Admission control for expensive endpoints.
+
+A worker process admits at most ``max_concurrent`` requests to the guarded
+work at once. Up to ``max_queue`` more may wait briefly for a slot, and each
+user has a separate budget. Anything beyond that is turned away with a fast
+429, so threads are not tied up in extraction while cheap endpoints queue
+behind them.
+
+The counts live in this process and are guarded by a ``threading.Condition``,
+so they assume threaded workers (gunicorn's sync or gthread workers, not
+gevent or eventlet). Nothing is shared between worker processes: with N
+workers the deployment admits up to N * ``max_concurrent`` requests, and one
+user can hold ``per_user`` slots in each worker.
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Optional
+
+from flask import g, jsonify, request
+
+from services.metrics import increment, observe
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded wait queue and per-user budget."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int,
+                 queue_timeout: float, per_user: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.per_user = per_user
+        self.active = 0
+        self.waiting = 0
+        self._users = {}
+        self._cond = threading.Condition()
+
+    def acquire(self, user_id: str) -> Optional[str]:
+        """Take a slot for ``user_id``; return a rejection reason, or None once admitted."""
+        with self._cond:
+            if self._users.get(user_id, 0) >= self.per_user:
+                return 'user_limit'
+            if self.active >= self.max_concurrent and self.waiting >= self.max_queue:
+                return 'queue_full'
+
+            self._users[user_id] = self._users.get(user_id, 0) + 1
+            start = time.monotonic()
+            deadline = start + self.queue_timeout
+            self.waiting += 1
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._release_user(user_id)
+                        return 'timeout'
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+        observe('admission_wait_ms', self.name, (time.monotonic() - start) * 1000)
+        return None
+
+    def release(self, user_id: str) -> None:
+        with self._cond:
+            self.active -= 1
+            self._release_user(user_id)
+            self._cond.notify()
+
+    def _release_user(self, user_id: str) -> None:
+        left = self._users.get(user_id, 0) - 1
+        if left > 0:
+            self._users[user_id] = left
+        else:
+            self._users.pop(user_id, None)
+
+
+def admission_controlled(controller: AdmissionController, retry_after: int):
+    """Guard a view with ``controller``; use after require_auth."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method == 'OPTIONS':
+                return fn(*args, **kwargs)
+            user_id = (g.get('user') or {}).get('sub') or request.remote_addr or ''
+            reason = controller.acquire(user_id)
+            if reason:
+                increment('admission_rejected', f'{controller.name}.{reason}')
+                response = jsonify({'error': 'Server busy, please retry shortly', 'reason': reason})
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+            increment('admission_admitted', controller.name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                controller.release(user_id)
+        return wrapper
+    return decorator
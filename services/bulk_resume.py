@@ -0,0 +1,257 @@
+"""
+Bulk resume scoring for a whole placement batch.
+
+Resumes come from a zip archive or a directory. Extraction and scoring fan
+out across a process pool, results are yielded as each resume completes, and
+every result is appended to an NDJSON checkpoint so an interrupted run picks
+up where it stopped; the checkpoint is deleted once the run completes. ``score_many`` does the same for resume texts already in
+hand, matched against one pre-parsed job description.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from werkzeug.utils import secure_filename
+
+from services.resume_analysis import ALLOWED_EXT, extract_resume_text, analyze_resume_quality, job_scorer
+from utils.resume_parser import ParsedResume
+
+
+class ArchiveTooLarge(Exception):
+    """A zip archive exceeds one of the extraction limits."""
+
+    def __init__(self, limit: str, maximum: int):
+        super().__init__(f'{limit} exceeds {maximum}')
+        self.limit = limit
+        self.maximum = maximum
+
+
+def _extension(name: str) -> str:
+    return name.rsplit('.', 1)[1].lower() if '.' in name else ''
+
+
+def _allowed(name: str) -> bool:
+    return _extension(name) in ALLOWED_EXT
+
+
+def collect_resume_files(source: str, workdir: str, max_files: Optional[int] = None,
+                         max_file_bytes: Optional[int] = None,
+                         max_total_bytes: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Return (key, path) pairs for every resume in a zip archive or directory.
+
+    The key is the resume's path inside the archive or directory and is what
+    results and checkpoints are recorded under. Zip members are extracted
+    into ``workdir`` under sanitized names. The optional limits apply to zip
+    archives and raise ``ArchiveTooLarge``; sizes are checked against each
+    member's declared size and again against the bytes actually extracted,
+    since the header can lie.
+    """
+    files = []
+    if os.path.isdir(source):
+        for root, _, names in os.walk(source):
+            for name in sorted(names):
+                if _allowed(name):
+                    path = os.path.join(root, name)
+                    files.append((os.path.relpath(path, source), path))
+        return sorted(files)
+
+    def check(limit, value, maximum):
+        if maximum is not None and value > maximum:
+            raise ArchiveTooLarge(limit, maximum)
+
+    total = 0
+    with zipfile.ZipFile(source) as zf:
+        members = [(i, info) for i, info in enumerate(zf.infolist())
+                   if not info.is_dir() and _allowed(info.filename)]
+        check('files', len(members), max_files)
+        check('total_bytes', sum(info.file_size for _, info in members), max_total_bytes)
+        for i, info in members:
+            check('file_bytes', info.file_size, max_file_bytes)
+            # Never trust member paths; flatten them to a safe, unique name.
+            # The extension is taken before sanitizing, which drops non-ASCII
+            # names entirely ('简历.pdf' -> 'pdf')
+            stem = secure_filename(os.path.splitext(os.path.basename(info.filename))[0]) or 'resume'
+            target = os.path.join(workdir, f'{i}_{stem}.{_extension(info.filename)}')
+            written = 0
+            with zf.open(info) as src, open(target, 'wb') as dst:
+                while True:
+                    chunk = src.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    total += len(chunk)
+                    check('file_bytes', written, max_file_bytes)
+                    check('total_bytes', total, max_total_bytes)
+                    dst.write(chunk)
+            files.append((info.filename, target))
+    return files
+
+
+def run_key(source_path: str, job_description: str = '') -> str:
+    """Stable id for a (zip archive, job description) run, used to name its checkpoint."""
+    digest = hashlib.sha256()
+    with open(source_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    digest.update(job_description.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def score_resume_file(key: str, path: str, job_description: str = '') -> Dict:
+    """Extract and score one resume; runs inside a pool worker."""
+    if not _allowed(path):
+        return {'file': key, 'error': 'Unsupported file type', 'allowed': sorted(ALLOWED_EXT)}
+    try:
+        text = extract_resume_text(path)
+        analysis = analyze_resume_quality(ParsedResume(text), path, job_description)
+    except Exception as e:
+        return {'file': key, 'error': str(e)}
+    return {
+        'file': key,
+        'overall_score': analysis['overall_score'],
+        'ats_score': analysis['ats_score'],
+        'quality_score': analysis['quality_score'],
+        'word_count': analysis.get('word_count', 0),
+        'overall_assessment': analysis['overall_assessment'],
+        'job_aware': bool(job_description),
+    }
+
+
+def load_checkpoint(checkpoint_path: Optional[str]) -> Dict[str, Dict]:
+    """Read completed results from an NDJSON checkpoint, keyed by file."""
+    done = {}
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                # A run killed mid-write can leave a truncated last line
+                continue
+            if 'file' in row:
+                done[row['file']] = row
+    return done
+
+
+def prune_checkpoints(folder: str, max_age_seconds: float) -> int:
+    """Delete checkpoints of runs abandoned more than ``max_age_seconds`` ago."""
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(folder, name)
+        try:
+            if name.endswith('.ndjson') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _discard(checkpoint_path: Optional[str]) -> None:
+    if checkpoint_path:
+        try:
+            os.remove(checkpoint_path)
+        except OSError:
+            pass
+
+
+def iter_bulk_scores(files: List[Tuple[str, str]], job_description: str = '',
+                     checkpoint_path: Optional[str] = None, workers: Optional[int] = None) -> Iterator[Dict]:
+    """Score ``files`` across a process pool, yielding each result as it completes.
+
+    Results already present in the checkpoint are yielded first without
+    being recomputed. Once every file has a result the checkpoint is
+    deleted; a run that stops early keeps it for the next attempt.
+    """
+    done = load_checkpoint(checkpoint_path)
+    for key, _ in files:
+        if key in done:
+            yield done[key]
+
+    pending = [(key, path) for key, path in files if key not in done]
+    if not pending:
+        _discard(checkpoint_path)
+        return
+
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = open(checkpoint_path, 'a+', encoding='utf-8')
+        # Terminate a line left truncated by an interrupted run before appending
+        if checkpoint.tell() > 0:
+            checkpoint.seek(checkpoint.tell() - 1)
+            if checkpoint.read(1) != '\n':
+                checkpoint.write('\n')
+    # Spawn, not fork, so workers never inherit this process's Mongo client,
+    # locks or threads. A spawned worker imports this module and its imports
+    # (Flask and pymongo among them, as libraries) and, under ``python app.py``,
+    # re-imports app.py as __mp_main__; none of that opens a connection
+    ctx = multiprocessing.get_context('spawn')
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    try:
+        futures = [pool.submit(score_resume_file, key, path, job_description) for key, path in pending]
+        for future in as_completed(futures):
+            row = future.result()
+            if checkpoint:
+                checkpoint.write(json.dumps(row) + '\n')
+                checkpoint.flush()
+            yield row
+    finally:
+        # Not a ``with`` block: on a client disconnect (GeneratorExit) its
+        # shutdown(wait=True) would score the rest of the batch first
+        pool.shutdown(wait=False, cancel_futures=True)
+        if checkpoint:
+            checkpoint.close()
+    _discard(checkpoint_path)
+
+
+def _match_chunk(start: int, resume_texts: List[str], job_requirements: Dict) -> List[Tuple[int, Dict]]:
+    """Job-match a chunk of resumes; runs inside a pool worker."""
+    scorer = job_scorer()
+    rows = []
+    for offset, text in enumerate(resume_texts):
+        try:
+            result = scorer.calculate_job_match_score(ParsedResume(text), job_requirements)
+        except Exception as e:
+            result = {'error': str(e)}
+        rows.append((start + offset, result))
+    return rows
+
+
+def score_many(resume_texts: List[str], job_requirements: Dict, workers: Optional[int] = None,
+               chunk_size: int = 16) -> Iterator[Tuple[int, Dict]]:
+    """Match every resume against already-extracted ``job_requirements``.
+
+    Yields (index, calculate_job_match_score result) pairs in completion
+    order. Resumes are sent to a process pool in chunks; a batch that fits in
+    one chunk is scored in-process rather than paying for pool startup.
+    """
+    chunk_size = max(1, chunk_size)
+    if len(resume_texts) <= chunk_size or workers == 1:
+        for start in range(0, len(resume_texts), chunk_size):
+            yield from _match_chunk(start, resume_texts[start:start + chunk_size], job_requirements)
+        return
+
+    ctx = multiprocessing.get_context('spawn')
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    try:
+        futures = [
+            pool.submit(_match_chunk, start, resume_texts[start:start + chunk_size], job_requirements)
+            for start in range(0, len(resume_texts), chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        # As in iter_bulk_scores: a disconnected client must not wait for the batch
+        pool.shutdown(wait=False, cancel_futures=True)
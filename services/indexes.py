@@ -0,0 +1,218 @@
+"""
+Every Mongo index the app relies on, declared in one place.
+
+``scripts/migrate.py`` creates them. The app itself never builds indexes on
+import; each worker process checks once, on a background thread started by
+its first request, that each declared index exists with the declared
+options, and reports any gaps in the log and under ``indexes`` in the
+metrics. Nothing runs at import, so no client or thread exists before a
+``gunicorn --preload`` fork.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from config import settings
+from services.metrics import register_source
+from services.mongo_client import get_db
+
+# Options compared against the server's copy of an index
+CHECKED_OPTIONS = ('unique', 'expireAfterSeconds')
+# Server error codes for "an index with this name/key exists with other options"
+INDEX_CONFLICT_CODES = (85, 86)
+
+
+def declared_indexes() -> Dict[str, List[IndexModel]]:
+    """Collection name -> indexes it should have."""
+    return {
+        'users': [
+            IndexModel([('username', ASCENDING)], unique=True),
+            IndexModel([('email', ASCENDING)], unique=True),
+        ],
+        'profiles': [
+            IndexModel([('user_id', ASCENDING)], unique=True),
+        ],
+        'questions': [
+            IndexModel([('category', ASCENDING)]),
+        ],
+        'test_sessions': [
+            IndexModel([('user_id', ASCENDING), ('type', ASCENDING)]),
+        ],
+        'resume_sessions': [
+            IndexModel([('handle', ASCENDING)], unique=True),
+            IndexModel([('created_at', ASCENDING)], expireAfterSeconds=settings.RESUME_HANDLE_TTL_SECONDS),
+        ],
+        'resume_analyses': [
+            IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING)]),
+        ],
+        'resume_vectors': [
+            IndexModel([('user_id', ASCENDING)], unique=True),
+        ],
+        'job_catalog': [
+            IndexModel([('active', ASCENDING), ('created_at', DESCENDING)]),
+        ],
+        'term_stats': [
+            # The IDF table loads the most common terms first
+            IndexModel([('df', DESCENDING)]),
+        ],
+        'revoked_tokens': [
+            # Entries disappear once the token they name has expired anyway
+            IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0),
+            IndexModel([('revoked_at', ASCENDING)]),
+        ],
+        'refresh_sessions': [
+            IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0),
+            IndexModel([('user_id', ASCENDING)]),
+        ],
+    }
+
+
+def _expected(model: IndexModel) -> Dict:
+    spec = model.document
+    return {
+        'key': list(spec['key'].items()),
+        **{option: spec[option] for option in CHECKED_OPTIONS if option in spec},
+    }
+
+
+def _actual(info: Dict) -> Dict:
+    return {
+        'key': [(field, int(direction)) for field, direction in info['key']],
+        **{option: info[option] for option in CHECKED_OPTIONS if option in info},
+    }
+
+
+def _only_ttl_differs(info: Dict, model: IndexModel) -> bool:
+    actual, expected = _actual(info), _expected(model)
+    actual.pop('expireAfterSeconds', None)
+    expected.pop('expireAfterSeconds', None)
+    return actual == expected
+
+
+def _duplicate_key(collection, model: IndexModel) -> Optional[Dict]:
+    """One key value shared by several documents, which would fail a unique build."""
+    fields = list(model.document['key'])
+    group = {field.replace('.', '_'): f'${field}' for field in fields}
+    found = list(collection.aggregate([
+        {'$group': {'_id': group, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}},
+        {'$limit': 1},
+    ], allowDiskUse=True))
+    return found[0] if found else None
+
+
+def _rebuild(collection, current: Dict, model: IndexModel) -> None:
+    index_name = model.document['name']
+    collection.drop_index(index_name)
+    try:
+        collection.create_indexes([model])
+    except PyMongoError:
+        # Put the old index back rather than leave the collection without one
+        collection.create_indexes([IndexModel(current['key'], name=index_name, **{
+            option: current[option] for option in CHECKED_OPTIONS if option in current})])
+        raise
+
+
+def index_status(db) -> List[Dict]:
+    """Declared indexes that are missing or differ from the declaration."""
+    problems = []
+    for name, models in declared_indexes().items():
+        existing = db[name].index_information()
+        for model in models:
+            index_name = model.document['name']
+            if index_name not in existing:
+                problems.append({'collection': name, 'index': index_name, 'problem': 'missing'})
+            elif _actual(existing[index_name]) != _expected(model):
+                problems.append({'collection': name, 'index': index_name, 'problem': 'options differ',
+                                 'expected': _expected(model), 'actual': _actual(existing[index_name])})
+    return problems
+
+
+def apply_indexes(db, replace: bool = False) -> List[Dict]:
+    """Create every declared index; returns one result per index.
+
+    A TTL that differs is updated in place with ``collMod``. Any other
+    difference is reported as a conflict, or the index is dropped and rebuilt
+    when ``replace`` is set. A unique index is only dropped once no duplicate
+    values are found, and the old index is restored if the rebuild fails.
+    """
+    results = []
+    for name, models in declared_indexes().items():
+        existing = db[name].index_information()
+        for model in models:
+            index_name = model.document['name']
+            result = {'collection': name, 'index': index_name}
+            results.append(result)
+            current = existing.get(index_name)
+            if current is not None and _actual(current) == _expected(model):
+                result['status'] = 'ok'
+                continue
+            try:
+                if current is None:
+                    db[name].create_indexes([model])
+                    result['status'] = 'created'
+                elif 'expireAfterSeconds' in model.document and _only_ttl_differs(current, model):
+                    db.command('collMod', name, index={'name': index_name,
+                                                       'expireAfterSeconds': model.document['expireAfterSeconds']})
+                    result['status'] = 'ttl updated'
+                elif replace:
+                    duplicate = _duplicate_key(db[name], model) if model.document.get('unique') else None
+                    if duplicate is not None:
+                        result['status'] = 'conflict'
+                        result['detail'] = (f"{duplicate['count']} documents share {duplicate['_id']}; "
+                                            f"remove the duplicates before rebuilding as unique")
+                    else:
+                        _rebuild(db[name], current, model)
+                        result['status'] = 'rebuilt'
+                else:
+                    result['status'] = 'conflict'
+                    result['detail'] = f'exists as {_actual(current)}; rerun with --replace to rebuild'
+            except OperationFailure as e:
+                result['status'] = 'conflict' if e.code in INDEX_CONFLICT_CODES else 'error'
+                result['detail'] = str(e.details.get('errmsg') if e.details else e)
+    return results
+
+
+_verification: Dict = {'checked': False}
+_verified_pid = None
+_verify_lock = threading.Lock()
+
+
+def _verify() -> None:
+    global _verification
+    try:
+        problems = index_status(get_db())
+    except PyMongoError as e:
+        print('Index check skipped, Mongo unavailable:', e)
+        _verification = {'checked': False, 'error': str(e)}
+        return
+    for problem in problems:
+        print(f"Index {problem['collection']}.{problem['index']} {problem['problem']}; "
+              f"run python scripts/migrate.py")
+    _verification = {'checked': True, 'problems': problems}
+
+
+def verify_indexes_async() -> threading.Thread:
+    """Check the declared indexes on a daemon thread so startup never waits on Mongo."""
+    thread = threading.Thread(target=_verify, name='index-check', daemon=True)
+    thread.start()
+    return thread
+
+
+def verify_indexes_once() -> None:
+    """Start the index check the first time this process calls it; later calls are free."""
+    global _verified_pid
+    pid = os.getpid()
+    if _verified_pid == pid:
+        return
+    with _verify_lock:
+        if _verified_pid != pid:
+            _verified_pid = pid
+            verify_indexes_async()
+
+
+register_source('indexes', lambda: _verification)
@@ -0,0 +1,76 @@
+"""
+Memoized job-description analysis.
+
+Placement drives share one job description across hundreds of students, so
+extracted requirements are cached by a hash of the normalized JD text and the
+taxonomy key (a taxonomy change starts a fresh set of entries): first in an
+in-process LRU, then optionally in the ``jd_requirements`` Mongo collection
+so every worker shares one parse per distinct JD.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict
+
+from config import settings
+from utils.job_matching import JobDescriptionAnalyzer
+from utils.taxonomy import current_taxonomy
+from utils.lru import TTLCache
+from services.metrics import register_source
+
+_cache = TTLCache(maxsize=settings.JD_CACHE_SIZE)
+
+
+def normalize_job_description(job_description: str) -> str:
+    """Lowercase and collapse whitespace so trivially different copies share a key."""
+    return ' '.join(job_description.lower().split())
+
+
+def jd_hash(normalized: str, taxonomy_key: str) -> str:
+    return hashlib.sha256(f'{taxonomy_key}\n{normalized}'.encode('utf-8')).hexdigest()
+
+
+def _collection():
+    # Imported lazily so worker processes without persistence never open a client
+    from services.mongo_client import get_db
+    return get_db().jd_requirements
+
+
+def get_job_requirements(job_description: str, persist: bool = None) -> Dict:
+    """Return extracted requirements for ``job_description``, parsing each distinct JD once.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    if persist is None:
+        persist = settings.JD_CACHE_PERSIST
+    normalized = normalize_job_description(job_description)
+    taxonomy = current_taxonomy()
+    key = jd_hash(normalized, taxonomy.key)
+
+    requirements = _cache.get(key)
+    if requirements is not None:
+        return requirements
+
+    if persist:
+        doc = _collection().find_one({'_id': key}, {'requirements': 1})
+        if doc:
+            requirements = doc['requirements']
+
+    if requirements is None:
+        requirements = JobDescriptionAnalyzer(taxonomy).extract_job_requirements(normalized)
+        if persist:
+            _collection().update_one(
+                {'_id': key},
+                {'$setOnInsert': {'requirements': requirements, 'created_at': datetime.utcnow()}},
+                upsert=True,
+            )
+
+    _cache.set(key, requirements)
+    return requirements
+
+
+def cache_stats() -> Dict:
+    return _cache.stats()
+
+
+register_source('jd_cache', cache_stats)
@@ -0,0 +1,113 @@
+"""
+Catalog of open job postings for resume-to-job recommendations.
+
+Each posting is analyzed once on insert and stored with its skill weight
+vector. Workers keep the active catalog as one sparse matrix, so scoring a
+resume against every posting is a single matrix-vector product.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson.objectid import ObjectId
+
+from config import settings
+from utils.lru import TTLCache
+from services.jd_cache import get_job_requirements
+from services.mongo_client import collection
+from services.relevance_index import index_document, remove_document, text_terms
+from services.skill_vectors import vocabulary, requirement_weights, skill_matrix, weight_matrix, top_k
+
+job_catalog = collection('job_catalog')
+
+# The catalog matrix is rebuilt at most once per TTL per worker, or right
+# after this worker changes the catalog
+_matrix_cache = TTLCache(maxsize=1, ttl=settings.JOB_CATALOG_CACHE_SECONDS)
+
+
+def add_job(title: str, company: str, job_description: str, created_by: str) -> Optional[str]:
+    """Analyze and store a posting; returns its id, or None if no skills were recognized."""
+    requirements = get_job_requirements(job_description)
+    weights = requirement_weights(requirements)
+    if not weights:
+        return None
+    result = job_catalog.insert_one({
+        'title': title,
+        'company': company,
+        'job_description': job_description,
+        'role_category': requirements.get('role_category'),
+        'requirements': requirements,
+        # Stored as pairs: skill names such as node.js are not valid field names
+        'skill_weights': sorted(weights.items()),
+        'active': True,
+        'created_by': created_by,
+        'created_at': datetime.utcnow(),
+    })
+    if settings.KEYWORD_SCORER == 'bm25':
+        index_document(f'job:{result.inserted_id}', text_terms(job_description))
+    _matrix_cache.clear()
+    return str(result.inserted_id)
+
+
+def deactivate_job(job_id: str) -> bool:
+    result = job_catalog.update_one({'_id': ObjectId(job_id), 'active': True},
+                                    {'$set': {'active': False, 'closed_at': datetime.utcnow()}})
+    if result.modified_count:
+        # A closed posting no longer counts towards term rarity
+        remove_document(f'job:{job_id}')
+    _matrix_cache.clear()
+    return result.modified_count > 0
+
+
+def list_jobs(limit: int = 100) -> List[Dict]:
+    cursor = job_catalog.find({'active': True}, {'title': 1, 'company': 1, 'role_category': 1, 'created_at': 1})
+    return [{
+        'id': str(doc['_id']),
+        'title': doc.get('title'),
+        'company': doc.get('company'),
+        'role_category': doc.get('role_category'),
+        'created_at': doc.get('created_at'),
+    } for doc in cursor.sort('created_at', -1).limit(limit)]
+
+
+def _catalog() -> Dict:
+    vocab = vocabulary()
+    entry = _matrix_cache.get('catalog')
+    if entry is not None and entry['vocab'] is vocab:
+        return entry
+    jobs = list(job_catalog.find({'active': True}, {'title': 1, 'company': 1, 'role_category': 1, 'skill_weights': 1}))
+    for job in jobs:
+        job['skill_weights'] = dict(job['skill_weights'])
+    entry = {
+        'vocab': vocab,
+        'jobs': jobs,
+        'matrix': weight_matrix([job['skill_weights'] for job in jobs]),
+    }
+    _matrix_cache.set('catalog', entry)
+    return entry
+
+
+def recommend_jobs(skills: List[str], k: int = 10) -> List[Dict]:
+    """Top-k active postings for a resume's skill set, with per-posting breakdowns."""
+    catalog = _catalog()
+    jobs = catalog['jobs']
+    if not jobs:
+        return []
+    scores = (catalog['matrix'] @ skill_matrix([skills]).T).toarray().ravel() * 100
+
+    have = set(skills)
+    results = []
+    for i in top_k(scores, k):
+        job = jobs[int(i)]
+        weights = job['skill_weights']
+        missing = sorted((s for s in weights if s not in have), key=lambda s: -weights[s])
+        results.append({
+            'id': str(job['_id']),
+            'title': job.get('title'),
+            'company': job.get('company'),
+            'role_category': job.get('role_category'),
+            'skills_coverage': round(float(scores[i]), 1),
+            'matched_skills': sorted(have & weights.keys()),
+            'missing_skills': missing[:5],
+        })
+    return results
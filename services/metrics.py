@@ -0,0 +1,119 @@
+"""
+In-process latency and size histograms.
+
+Each worker process keeps its own sliding window of recent observations per
+metric and reports count, sum and p50/p95/p99 over that window. Stage timers
+also record onto the current Flask request so they can be sent back in a
+``Server-Timing`` header.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Tuple
+
+from flask import g, has_request_context
+
+WINDOW = 2048
+
+
+class Histogram:
+    """Sliding-window histogram reporting percentiles over recent samples."""
+
+    def __init__(self, window: int = WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.samples.append(value)
+            self.count += 1
+            self.total += value
+
+    def summary(self) -> Dict:
+        with self._lock:
+            ordered = sorted(self.samples)
+            count, total = self.count, self.total
+        if not ordered:
+            return {'count': 0}
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+        return {
+            'count': count,
+            'sum': round(total, 3),
+            'p50': pct(0.50),
+            'p95': pct(0.95),
+            'p99': pct(0.99),
+            'max': round(ordered[-1], 3),
+        }
+
+
+_histograms: Dict[Tuple[str, str], Histogram] = {}
+_counters: Dict[Tuple[str, str], int] = {}
+_sources: Dict[str, Callable[[], Dict]] = {}
+_lock = threading.Lock()
+
+
+def _histogram(group: str, name: str) -> Histogram:
+    key = (group, name)
+    hist = _histograms.get(key)
+    if hist is None:
+        with _lock:
+            hist = _histograms.setdefault(key, Histogram())
+    return hist
+
+
+def observe(group: str, name: str, value: float) -> None:
+    _histogram(group, name).observe(value)
+
+
+def increment(group: str, name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[(group, name)] = _counters.get((group, name), 0) + amount
+
+
+def register_source(group: str, fn: Callable[[], Dict]) -> None:
+    """Report ``fn()`` under ``group`` in every snapshot (cache stats, pool gauges, ...)."""
+    with _lock:
+        _sources[group] = fn
+
+
+@contextmanager
+def stage_timer(stage: str, group: str = 'resume_stage_ms'):
+    """Time a pipeline stage in milliseconds into ``group``/``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        observe(group, stage, elapsed_ms)
+        if has_request_context():
+            timings = g.setdefault('stage_timings', [])
+            timings.append((stage, elapsed_ms))
+
+
+def server_timing_header() -> str:
+    """Format the current request's stage timings as a Server-Timing value."""
+    timings = g.get('stage_timings') or []
+    return ', '.join(f'{stage};dur={elapsed_ms:.1f}' for stage, elapsed_ms in timings)
+
+
+def snapshot() -> Dict:
+    """All histograms and counters grouped by metric group."""
+    out: Dict[str, Dict] = {}
+    with _lock:
+        histograms = list(_histograms.items())
+        counters = list(_counters.items())
+        sources = list(_sources.items())
+    for (group, name), hist in histograms:
+        out.setdefault(group, {})[name] = hist.summary()
+    for (group, name), value in counters:
+        out.setdefault(group, {})[name] = value
+    for group, fn in sources:
+        out[group] = fn()
+    return out
@@ -1,16 +1,155 @@
-from pymongo import MongoClient
-from typing import Optional
+"""
+Per-process Mongo client, created on first use.
+
+A ``MongoClient`` must not cross a fork: under ``gunicorn --preload`` modules
+are imported in the master, so a client made at import time would be shared
+by every worker. The client is therefore created lazily and tagged with the
+pid that made it; a forked worker sees a different pid and builds its own.
+Blueprints hold ``LazyCollection`` proxies, which bind to the current
+process's client when first used and rebind if that client changes.
+
+Pool sizing and timeouts come from ``config.Settings``. A pool listener feeds
+checkout waits, checkout failures and connections in use into the metrics;
+per-command timing is in ``services.query_monitor``.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from pymongo import MongoClient, monitoring
 from config import settings
+from services.metrics import increment, observe, register_source
+from services.query_monitor import command_monitor
 
 _client: Optional[MongoClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool gauges and checkout wait times for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open = 0
+        self.in_use = 0
+        self.pools_cleared = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        increment('mongo_pool_checkout_failed', str(event.reason))
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, 'started', None)
+        if started is not None:
+            observe('mongo_pool_wait_ms', 'checkout', (time.perf_counter() - started) * 1000)
+            self._local.started = None
+        with self._lock:
+            self.in_use += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'pid': _client_pid,
+                'open': self.open,
+                'in_use': self.in_use,
+                'max_pool_size': settings.MONGO_MAX_POOL_SIZE,
+                'pools_cleared': self.pools_cleared,
+            }
+
+
+_pool_metrics = PoolMetrics()
+register_source('mongo_pool', _pool_metrics.stats)
 
 
 def get_mongo_client() -> MongoClient:
-    global _client
-    if _client is None:
-        _client = MongoClient(settings.MONGO_URI)
+    """This process's client, created on first use and again after a fork."""
+    global _client, _client_pid, _pool_metrics
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                # The parent's client (if any) is left alone: closing it
+                # here would touch sockets the parent still owns
+                _pool_metrics = PoolMetrics()
+                register_source('mongo_pool', _pool_metrics.stats)
+                listeners = [_pool_metrics]
+                if settings.MONGO_COMMAND_MONITORING:
+                    listeners.append(command_monitor())
+                _client = MongoClient(
+                    settings.MONGO_URI,
+                    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                    waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                    connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+                    socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS or None,
+                    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    event_listeners=listeners,
+                )
+                _client_pid = pid
     return _client
 
 
 def get_db():
     return get_mongo_client()[settings.MONGO_DB]
+
+
+class LazyCollection:
+    """Stand-in for a collection that resolves against this process's client on use."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._bound = (None, None)
+
+    def _collection(self):
+        client = get_mongo_client()
+        bound_client, coll = self._bound
+        if bound_client is not client:
+            coll = client[settings.MONGO_DB][self.name]
+            self._bound = (client, coll)
+        return coll
+
+    def __getattr__(self, attr):
+        return getattr(self._collection(), attr)
+
+    def __repr__(self):
+        return f'LazyCollection({self.name!r})'
+
+
+def collection(name: str) -> LazyCollection:
+    """Module-level handle to a collection that is safe to create before fork."""
+    return LazyCollection(name)
@@ -0,0 +1,98 @@
+"""
+Password hashing on a dedicated, bounded thread pool.
+
+KDFs are slow on purpose. Running them inline lets a login storm (a whole
+class signing in at exam start) occupy every request thread. Hashes run on a
+small executor instead; once ``PASSWORD_HASH_WORKERS`` are busy and
+``PASSWORD_HASH_QUEUE`` more are waiting, new requests fail fast with
+``HashPoolBusy`` and the caller answers 503. A request that did get a slot
+waits at most ``PASSWORD_HASH_TIMEOUT_SECONDS`` for its hash before giving up
+the same way.
+
+The requesting threads still block while they wait, so the bound only
+protects other endpoints if workers + queue stays below the request threads
+of a gunicorn worker (``--threads``); the defaults (2 + 2) assume at least
+8. hashlib's scrypt and PBKDF2 release the GIL, so the pool uses real
+cores.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Optional
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from config import settings
+from services.metrics import increment, observe
+
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix='pwhash')
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE)
+_method_prefix: Optional[str] = None
+
+
+class HashPoolBusy(Exception):
+    """The hashing pool and its queue are full."""
+
+
+def _run(name: str, fn: Callable, *args):
+    if not _slots.acquire(blocking=False):
+        increment('password_hash_rejected', name)
+        raise HashPoolBusy()
+    submitted = time.perf_counter()
+
+    def task():
+        started = time.perf_counter()
+        observe('password_hash_wait_ms', name, (started - submitted) * 1000)
+        try:
+            return fn(*args)
+        finally:
+            observe('password_hash_ms', name, (time.perf_counter() - started) * 1000)
+            _slots.release()
+
+    return _executor.submit(task)
+
+
+def _result(name: str, future: Future):
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except TimeoutError:
+        increment('password_hash_timed_out', name)
+        if future.cancel():
+            # Never started, so its task will not release the slot itself
+            _slots.release()
+        raise HashPoolBusy()
+
+
+def hash_password(password: str) -> str:
+    """Hash with the configured PASSWORD_HASH_METHOD; raises HashPoolBusy."""
+    return _result('hash', _run('hash', generate_password_hash, password, settings.PASSWORD_HASH_METHOD))
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """check_password_hash on the pool; raises HashPoolBusy."""
+    return _result('verify', _run('verify', check_password_hash, password_hash, password))
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True when a stored hash was made with other KDF parameters than configured."""
+    global _method_prefix
+    if _method_prefix is None:
+        # Werkzeug fills in default parameters, so compare against a real hash's prefix
+        _method_prefix = generate_password_hash('', settings.PASSWORD_HASH_METHOD).split('$', 1)[0]
+    return password_hash.split('$', 1)[0] != _method_prefix
+
+
+def rehash_in_background(password: str, store: Callable[[str], None]) -> None:
+    """Re-hash with current parameters and ``store`` the result, skipping it if the pool is busy."""
+    def task(pw):
+        try:
+            store(generate_password_hash(pw, settings.PASSWORD_HASH_METHOD))
+        except Exception as e:
+            print('Password rehash error:', e)
+
+    try:
+        _run('rehash', task, password)
+    except HashPoolBusy:
+        # Rehash is opportunistic; the next login tries again
+        pass
@@ -0,0 +1,196 @@
+"""
+Per-command Mongo latency and slow-query capture.
+
+A pymongo ``CommandListener`` on each process's client times every command
+into the ``mongo_command_ms`` histograms, keyed ``<collection>.<operation>``.
+Commands slower than ``MONGO_SLOW_QUERY_MS`` are counted and kept in a short
+list of recent slow queries, with filter values masked so no student data is
+reported. In debug mode (``MONGO_EXPLAIN_SAMPLE_RATE`` > 0) a sample of them
+is re-run as ``explain`` on a background thread, and the winning plan's stages
+(e.g. ``COLLSCAN`` vs ``IXSCAN``) and indexes are attached. With
+``MONGO_SLOW_QUERY_LOG`` set, each slow query is also written as one JSON line
+to a size-rotated log file.
+"""
+
+import json
+import logging
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from pymongo import monitoring
+
+from config import settings
+from services.metrics import increment, observe, register_source
+
+# Recent slow queries kept for the metrics endpoint
+SLOW_QUERY_KEEP = 50
+# Explains queued at once; further slow queries are recorded without a plan
+MAX_PENDING_EXPLAINS = 4
+EXPLAINABLE = {'find', 'aggregate', 'count', 'distinct', 'update', 'delete', 'findAndModify'}
+# Query fields shown in a slow-query entry, values masked
+FILTER_FIELDS = {'find': 'filter', 'count': 'query', 'distinct': 'query', 'findAndModify': 'query',
+                 'aggregate': 'pipeline', 'update': 'updates', 'delete': 'deletes'}
+# Driver-added fields that explain rejects or ignores
+SESSION_FIELDS = {'lsid', 'txnNumber', 'autocommit', 'startTransaction', 'readConcern', 'writeConcern'}
+
+
+def query_shape(value):
+    """``value`` with every leaf replaced by ``'?'``, keeping keys and operators."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [query_shape(item) for item in value[:5]]
+    return '?'
+
+
+def _plan_summary(explain: Dict) -> Dict:
+    stages: List[str] = []
+    indexes: List[str] = []
+
+    def walk(plan):
+        if not isinstance(plan, dict):
+            return
+        if plan.get('stage'):
+            stages.append(plan['stage'])
+        if plan.get('indexName'):
+            indexes.append(plan['indexName'])
+        for child in [plan.get('inputStage'), plan.get('queryPlan')] + list(plan.get('inputStages') or []):
+            walk(child)
+
+    planner = explain.get('queryPlanner') or {}
+    if not planner:
+        # Aggregations nest the planner under their first stage
+        for stage in explain.get('stages') or []:
+            planner = (stage.get('$cursor') or {}).get('queryPlanner') or {}
+            if planner:
+                break
+    walk(planner.get('winningPlan'))
+    return {'stages': stages, 'indexes': indexes}
+
+
+_slow_log: Optional[logging.Logger] = None
+_slow_log_lock = threading.Lock()
+
+
+def _slow_query_log() -> Optional[logging.Logger]:
+    global _slow_log
+    if not settings.MONGO_SLOW_QUERY_LOG:
+        return None
+    if _slow_log is None:
+        with _slow_log_lock:
+            if _slow_log is None:
+                logger = logging.getLogger('campusfit.slow_queries')
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                handler = RotatingFileHandler(settings.MONGO_SLOW_QUERY_LOG,
+                                              maxBytes=settings.MONGO_SLOW_QUERY_LOG_BYTES,
+                                              backupCount=settings.MONGO_SLOW_QUERY_LOG_BACKUPS)
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger.addHandler(handler)
+                _slow_log = logger
+    return _slow_log
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Times commands on one client and captures the slow ones."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict = {}
+        self.recent = deque(maxlen=SLOW_QUERY_KEEP)
+        self._explainer: Optional[ThreadPoolExecutor] = None
+        self._explains_pending = 0
+
+    def started(self, event):
+        name = event.command_name
+        target = event.command.get('collection') if name == 'getMore' else event.command.get(name)
+        if not isinstance(target, str) or name == 'explain':
+            return
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = (target, event.command, event.database_name)
+
+    def _finish(self, event):
+        with self._lock:
+            return self._pending.pop((event.request_id, event.connection_id), None)
+
+    def succeeded(self, event):
+        pending = self._finish(event)
+        if pending is None:
+            return
+        collection, command, database = pending
+        key = f'{collection}.{event.command_name}'
+        elapsed_ms = event.duration_micros / 1000
+        observe('mongo_command_ms', key, elapsed_ms)
+        if elapsed_ms >= settings.MONGO_SLOW_QUERY_MS:
+            self._slow(key, event.command_name, command, database, elapsed_ms)
+
+    def failed(self, event):
+        pending = self._finish(event)
+        if pending is not None:
+            increment('mongo_command_failed', f'{pending[0]}.{event.command_name}')
+
+    def _slow(self, key, operation, command, database, elapsed_ms):
+        increment('mongo_slow_commands', key)
+        field = FILTER_FIELDS.get(operation)
+        entry = {
+            'at': datetime.utcnow().isoformat(timespec='seconds'),
+            'command': key,
+            'ms': round(elapsed_ms, 1),
+            'query': query_shape(command.get(field)) if field else None,
+        }
+        if command.get('sort'):
+            entry['sort'] = query_shape(command['sort'])
+        if operation in EXPLAINABLE and random.random() < settings.MONGO_EXPLAIN_SAMPLE_RATE \
+                and self._claim_explain():
+            # The listener runs on the command's own thread: explain elsewhere
+            explained = {k: v for k, v in command.items() if k not in SESSION_FIELDS and not k.startswith('$')}
+            self._explainer.submit(self._explain, entry, database, explained)
+        else:
+            self._record(entry)
+
+    def _claim_explain(self) -> bool:
+        with self._lock:
+            if self._explains_pending >= MAX_PENDING_EXPLAINS:
+                return False
+            self._explains_pending += 1
+            if self._explainer is None:
+                self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mongo-explain')
+        return True
+
+    def _explain(self, entry, database, command):
+        from services.mongo_client import get_mongo_client
+        try:
+            result = get_mongo_client()[database].command('explain', command, verbosity='queryPlanner')
+            entry['plan'] = _plan_summary(result)
+        except Exception as e:
+            entry['plan'] = {'error': str(e)}
+        finally:
+            with self._lock:
+                self._explains_pending -= 1
+        self._record(entry)
+
+    def _record(self, entry):
+        # Entries are complete (plan included) before anyone else can see them
+        self.recent.append(entry)
+        logger = _slow_query_log()
+        if logger is not None:
+            logger.info(json.dumps(entry, default=str))
+
+    def stats(self) -> Dict:
+        return {
+            'threshold_ms': settings.MONGO_SLOW_QUERY_MS,
+            'explain_sample_rate': settings.MONGO_EXPLAIN_SAMPLE_RATE,
+            'recent': list(self.recent),
+        }
+
+
+def command_monitor() -> CommandMonitor:
+    """A monitor for a new client; its slow queries show up under ``mongo_slow_queries``."""
+    monitor = CommandMonitor()
+    register_source('mongo_slow_queries', monitor.stats)
+    return monitor
@@ -0,0 +1,64 @@
+"""
+Refresh-token families.
+
+Login starts a family: a ``refresh_sessions`` record naming the family's one
+current refresh token id. Refreshing swaps that id for a new one with a
+single conditional update, so rotation never writes to ``revoked_tokens``
+and the revocation filter only holds logged-out access tokens.
+
+The id just replaced stays usable for ``REFRESH_GRACE_SECONDS``: two tabs
+refreshing with the same token at once both succeed, the later one receiving
+a token with the current id rather than rotating again and locking the other
+tab out. Presenting a replaced id after that window means the token was
+copied, so the whole family is ended and every holder must sign in again.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from config import settings
+from services.metrics import increment
+from services.repositories import repository
+from utils.jwt_utils import create_token_pair, new_jti
+
+sessions = repository('refresh_sessions')
+
+
+def _expires_at() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.JWT_REFRESH_EXPIRES_SECONDS)
+
+
+def start(user_id: str, username: str) -> Dict:
+    """A token pair opening a new family."""
+    family, jti = new_jti(), new_jti()
+    sessions.create(family, user_id, jti, _expires_at())
+    return create_token_pair(user_id, username, family, jti)
+
+
+def rotate(payload: Dict, username: str) -> Optional[Dict]:
+    """A new token pair for a verified refresh token's claims, or None if it no longer works."""
+    family, jti, user_id = payload['fid'], payload['jti'], payload['sub']
+    now = datetime.utcnow()
+    replacement = new_jti()
+    if sessions.rotate(family, jti, replacement, now, _expires_at()):
+        return create_token_pair(user_id, username, family, replacement)
+
+    session = sessions.get(family)
+    if session is None:
+        return None
+    if session['previous_jti'] == jti and now - session['rotated_at'] <= timedelta(seconds=settings.REFRESH_GRACE_SECONDS):
+        increment('refresh_rotation', 'grace')
+        return create_token_pair(user_id, username, family, session['current_jti'])
+    increment('refresh_rotation', 'reuse')
+    sessions.delete(family)
+    return None
+
+
+def end(payload: Dict) -> bool:
+    """End the family of a verified refresh token (logout)."""
+    return sessions.delete(payload['fid'])
+
+
+def end_all(user_id: str) -> int:
+    """End every family of ``user_id``, signing them out on all devices."""
+    return sessions.delete_for_user(user_id)
@@ -0,0 +1,190 @@
+"""
+Corpus-level BM25 relevance between resumes and job descriptions.
+
+Document frequencies over every stored resume and catalog posting are kept
+in Mongo and updated incrementally as documents are added, replaced or
+removed. Each change is applied only if the document is still at the
+revision it was read at, so concurrent updates of one document cannot count
+its terms twice. Indexing happens only while ``KEYWORD_SCORER=bm25``. Each
+worker caches an IDF table of the ``RELEVANCE_MAX_TERMS`` most common terms,
+and documents become sparse vectors over that table's vocabulary. The resulting relevance score weights
+JD terms by rarity, so generic words such as "with" or "team" count for
+almost nothing once the corpus is large enough.
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from scipy import sparse
+
+from config import settings
+from utils.resume_parser import ParsedResume
+from utils.term_index import tokenize
+from services.metrics import register_source
+
+K1 = 1.2
+B = 0.75
+CORPUS_ID = 'corpus'
+# Attempts at a conditional update before giving up on a contended document
+INDEX_RETRIES = 5
+
+
+def _db():
+    # Imported lazily so scoring workers without BM25 never open a client
+    from services.mongo_client import get_db
+    return get_db()
+
+
+def document_terms(tokens: Iterable[str]) -> Counter:
+    """Term counts over already-tokenized text (e.g. ``ParsedResume.tokens``)."""
+    return Counter(token for token in tokens if len(token) > 1 and not token.isdigit())
+
+
+def text_terms(text: str) -> Counter:
+    return document_terms(tokenize(text))
+
+
+def _apply_deltas(db, previous: Optional[Dict], terms: set, length: int, docs: int) -> None:
+    old_terms = set(previous['terms']) if previous else set()
+    old_length = previous['length'] if previous else 0
+    dropped = old_terms - terms
+    ops = [UpdateOne({'_id': term}, {'$inc': {'df': 1}}, upsert=True) for term in terms - old_terms]
+    ops += [UpdateOne({'_id': term}, {'$inc': {'df': -1}}) for term in dropped]
+    if ops:
+        db.term_stats.bulk_write(ops, ordered=False)
+    if dropped:
+        # Terms no document uses any more would otherwise pile up forever
+        db.term_stats.delete_many({'_id': {'$in': sorted(dropped)}, 'df': {'$lte': 0}})
+    db.corpus_stats.update_one(
+        {'_id': CORPUS_ID},
+        {'$inc': {'docs': docs, 'total_length': length - old_length}},
+        upsert=True,
+    )
+
+
+def index_document(key: str, term_freq: Counter, version: Optional[str] = None) -> bool:
+    """Add or replace document ``key`` in the corpus statistics.
+
+    ``version`` (e.g. a file hash) is stored with the document; indexing the
+    same version again is a no-op. Returns True if the statistics changed.
+    """
+    db = _db()
+    terms = set(term_freq)
+    length = sum(term_freq.values())
+    for _ in range(INDEX_RETRIES):
+        previous = db.corpus_docs.find_one({'_id': key})
+        if previous is not None and version is not None and previous.get('version') == version:
+            return False
+        fields = {'terms': sorted(terms), 'length': length, 'version': version, 'updated_at': datetime.utcnow()}
+        if previous is None:
+            try:
+                db.corpus_docs.insert_one({'_id': key, 'rev': 1, **fields})
+            except DuplicateKeyError:
+                continue
+        else:
+            # A missing rev (documents indexed before revisions) matches None
+            result = db.corpus_docs.update_one({'_id': key, 'rev': previous.get('rev')},
+                                               {'$set': fields, '$inc': {'rev': 1}})
+            if not result.matched_count:
+                continue
+        _apply_deltas(db, previous, terms, length, 0 if previous else 1)
+        return True
+    print('Relevance index: gave up on contended document', key)
+    return False
+
+
+def remove_document(key: str) -> bool:
+    """Take document ``key`` out of the corpus statistics; False if it was not indexed."""
+    db = _db()
+    for _ in range(INDEX_RETRIES):
+        previous = db.corpus_docs.find_one({'_id': key})
+        if previous is None:
+            return False
+        if not db.corpus_docs.delete_one({'_id': key, 'rev': previous.get('rev')}).deleted_count:
+            continue
+        _apply_deltas(db, previous, set(), 0, -1)
+        return True
+    print('Relevance index: gave up on contended document', key)
+    return False
+
+
+class IdfTable:
+    """BM25 inverse document frequencies with a term -> column vocabulary."""
+
+    def __init__(self, doc_freq: Dict[str, int], docs: int, total_length: int):
+        self.docs = docs
+        self.avg_length = total_length / docs if docs else 0.0
+        self.vocab = {term: col for col, term in enumerate(sorted(doc_freq))}
+        df = np.array([doc_freq[term] for term in sorted(doc_freq)], dtype=np.float64)
+        self.idf = np.log1p((docs - df + 0.5) / (df + 0.5))
+
+    def document_vector(self, term_freq: Counter, length: int) -> sparse.csr_matrix:
+        """BM25-saturated term weights (1.0 = one mention in an average-length document)."""
+        cols = [self.vocab[term] for term in term_freq if term in self.vocab]
+        tf = np.array([term_freq[term] for term in term_freq if term in self.vocab], dtype=np.float64)
+        norm = K1 * (1 - B + B * length / self.avg_length) if self.avg_length else K1
+        weights = np.minimum(1.0, tf * (K1 + 1) / (tf + norm))
+        return sparse.csr_matrix((weights, ([0] * len(cols), cols)), shape=(1, len(self.vocab)))
+
+    def query_vector(self, terms: Iterable[str]) -> sparse.csr_matrix:
+        """IDF weights of the query terms; terms no stored document contains are left out."""
+        cols = sorted({self.vocab[term] for term in terms if term in self.vocab})
+        return sparse.csr_matrix((self.idf[cols], ([0] * len(cols), cols)), shape=(1, len(self.vocab)))
+
+
+_table: Optional[IdfTable] = None
+_table_loaded_at = 0.0
+_table_lock = threading.Lock()
+
+
+def idf_table() -> IdfTable:
+    """The cached IDF table, reloaded from Mongo every RELEVANCE_IDF_CACHE_SECONDS."""
+    global _table, _table_loaded_at
+    if _table is not None and time.monotonic() - _table_loaded_at < settings.RELEVANCE_IDF_CACHE_SECONDS:
+        return _table
+    with _table_lock:
+        if _table is None or time.monotonic() - _table_loaded_at >= settings.RELEVANCE_IDF_CACHE_SECONDS:
+            db = _db()
+            corpus = db.corpus_stats.find_one({'_id': CORPUS_ID}) or {}
+            # Bounded: the rarest terms (mostly typos and names) are left out
+            cursor = db.term_stats.find({'df': {'$gt': 0}}).sort('df', DESCENDING).limit(settings.RELEVANCE_MAX_TERMS)
+            doc_freq = {doc['_id']: doc['df'] for doc in cursor}
+            _table = IdfTable(doc_freq, corpus.get('docs', 0), corpus.get('total_length', 0))
+            _table_loaded_at = time.monotonic()
+    return _table
+
+
+def relevance_score(parsed: ParsedResume, job_requirements: Dict) -> Optional[float]:
+    """IDF-weighted share of the JD's terms the resume covers, 0-100.
+
+    Returns None when the JD has no query terms or the corpus is still too
+    small for its IDF values to mean anything, so callers can fall back.
+    """
+    query_terms = job_requirements.get('query_terms')
+    table = idf_table()
+    if not query_terms or table.docs < settings.RELEVANCE_MIN_DOCS:
+        return None
+    term_freq = document_terms(parsed.tokens)
+    doc = table.document_vector(term_freq, sum(term_freq.values()))
+    query = table.query_vector(query_terms)
+    mass = query.sum()
+    if not mass:
+        return None
+    return round(100 * float(doc.multiply(query).sum()) / float(mass), 1)
+
+
+def index_stats() -> Dict:
+    table = _table
+    if table is None:
+        return {'loaded': False}
+    return {'loaded': True, 'docs': table.docs, 'vocabulary': len(table.vocab),
+            'avg_length': round(table.avg_length, 1)}
+
+
+register_source('relevance_index', index_stats)
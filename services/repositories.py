@@ -0,0 +1,524 @@
+"""
+Storage for users, profiles, test sessions, questions, revoked tokens and
+refresh sessions.
+
+Blueprints talk to these small repositories instead of Mongo collections, so
+the same endpoints run against either backend chosen by
+``REPOSITORY_BACKEND``:
+
+- ``mongo`` (default): thin wrappers over the collections.
+- ``memory``: dicts in this process, for benchmarks and profiling with no
+  database. Nothing is shared between workers or persisted.
+
+Blueprints hold ``repository(name)`` handles, which resolve through the
+``repositories()`` singleton on each use, so the backend is chosen when
+the first request runs, not when the module is imported.
+
+Both backends return fresh dicts that callers may mutate, raise
+``DuplicateKey`` on unique-field clashes and are held to the same behaviour
+by ``test_repositories.py``.
+"""
+
+import copy
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from config import settings
+
+
+class DuplicateKey(Exception):
+    """A unique field (username, email, token id) is already taken."""
+
+    def __init__(self, field: str):
+        super().__init__(f'Duplicate {field}')
+        self.field = field
+
+
+def _object_id(value) -> Optional[ObjectId]:
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+def _duplicate_field(details: Optional[Dict], fields: Iterable[str]) -> str:
+    """The clashing field of a duplicate-key error, from its server details."""
+    details = details or {}
+    key = details.get('keyValue') or {}
+    if key:
+        return next(iter(key))
+    message = details.get('errmsg', '')
+    return next((field for field in fields if field in message), 'key')
+
+
+# --- Mongo -----------------------------------------------------------------
+
+class MongoUserRepository:
+    def __init__(self, users):
+        self._users = users
+
+    def create(self, username: str, email: str, password_hash: str) -> str:
+        try:
+            result = self._users.insert_one({
+                'username': username,
+                'email': email,
+                'password_hash': password_hash,
+                'created_at': datetime.utcnow(),
+            })
+        except DuplicateKeyError as e:
+            raise DuplicateKey(_duplicate_field(e.details or {'errmsg': str(e)}, ('username', 'email')))
+        return str(result.inserted_id)
+
+    def create_many(self, users: List[Dict]) -> Dict[int, str]:
+        """Insert ``users`` (username, email, password_hash) unordered.
+
+        Returns an error message per index that was not inserted, so one
+        duplicate does not stop the rest.
+        """
+        now = datetime.utcnow()
+        docs = [{'username': user['username'], 'email': user['email'],
+                 'password_hash': user['password_hash'], 'created_at': now} for user in users]
+        if not docs:
+            return {}
+        try:
+            self._users.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            errors = {}
+            for error in e.details.get('writeErrors', []):
+                if error.get('code') == 11000:
+                    errors[error['index']] = str(DuplicateKey(_duplicate_field(error, ('username', 'email'))))
+                else:
+                    errors[error['index']] = error.get('errmsg', 'Insert failed')
+            return errors
+        return {}
+
+    def find_by_username(self, username: str) -> Optional[Dict]:
+        return self._users.find_one({'username': username})
+
+    def find_by_id(self, user_id: str) -> Optional[Dict]:
+        oid = _object_id(user_id)
+        return self._users.find_one({'_id': oid}) if oid else None
+
+    def usernames(self, user_ids: Iterable[str]) -> Dict[str, str]:
+        object_ids = [oid for oid in map(_object_id, user_ids) if oid]
+        return {str(u['_id']): u.get('username') for u in self._users.find({'_id': {'$in': object_ids}}, {'username': 1})}
+
+    def replace_password_hash(self, user_id: str, old_hash: str, new_hash: str) -> bool:
+        """Swap the hash only if it is still ``old_hash``."""
+        result = self._users.update_one({'_id': _object_id(user_id), 'password_hash': old_hash},
+                                        {'$set': {'password_hash': new_hash}})
+        return result.modified_count == 1
+
+    def set_admin(self, username: str, admin: bool) -> bool:
+        """Grant or withdraw admin rights; False if there is no such user."""
+        update = {'$set': {'is_admin': True}} if admin else {'$unset': {'is_admin': ''}}
+        return self._users.update_one({'username': username}, update).matched_count == 1
+
+
+class MongoProfileRepository:
+    def __init__(self, profiles):
+        self._profiles = profiles
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        return self._profiles.find_one({'user_id': user_id}, {'_id': 0})
+
+    def update(self, user_id: str, fields: Dict) -> None:
+        """Set ``fields`` on the user's profile, creating it if needed."""
+        self._profiles.update_one({'user_id': user_id}, {'$set': {**fields, 'user_id': user_id}}, upsert=True)
+
+    def find_user_ids(self, min_cgpa: float = None, max_backlogs: int = None, branch: str = None) -> List[str]:
+        query = {}
+        if min_cgpa is not None:
+            query['cgpa'] = {'$gte': min_cgpa}
+        if max_backlogs is not None:
+            query['backlogs'] = {'$lte': max_backlogs}
+        if branch:
+            query['branch'] = branch
+        return [p['user_id'] for p in self._profiles.find(query, {'user_id': 1})]
+
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        return {p['user_id']: p for p in self._profiles.find({'user_id': {'$in': list(user_ids)}}, {'_id': 0})}
+
+
+class MongoTestSessionRepository:
+    def __init__(self, sessions):
+        self._sessions = sessions
+
+    def save(self, user_id: str, test_type: str, fields: Dict) -> None:
+        """Store the user's latest attempt at ``test_type``, replacing the previous one."""
+        doc = {**fields, 'user_id': user_id, 'type': test_type}
+        self._sessions.update_one({'user_id': user_id, 'type': test_type}, {'$set': doc}, upsert=True)
+
+    def for_user(self, user_id: str) -> List[Dict]:
+        return list(self._sessions.find({'user_id': user_id}, {'_id': 0}))
+
+
+class MongoQuestionRepository:
+    def __init__(self, questions):
+        self._questions = questions
+
+    def by_category(self, category: str) -> List[Dict]:
+        return list(self._questions.find({'category': category}))
+
+    def get(self, question_id: str) -> Optional[Dict]:
+        """Raises ValueError for a malformed id."""
+        oid = _object_id(question_id)
+        if oid is None:
+            raise ValueError('Invalid question id')
+        return self._questions.find_one({'_id': oid})
+
+    def add_many(self, docs: List[Dict]) -> List[str]:
+        docs = [dict(doc) for doc in docs]
+        return [str(oid) for oid in self._questions.insert_many(docs).inserted_ids]
+
+
+class MongoRevokedTokenRepository:
+    def __init__(self, revoked_tokens):
+        self._revoked = revoked_tokens
+
+    def add(self, jti: str, expires_at: datetime, revoked_at: datetime) -> bool:
+        """False if ``jti`` was already revoked."""
+        try:
+            self._revoked.insert_one({'_id': jti, 'expires_at': expires_at, 'revoked_at': revoked_at})
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def exists(self, jti: str) -> bool:
+        return self._revoked.find_one({'_id': jti}, {'_id': 1}) is not None
+
+    def active_ids(self, now: datetime) -> List[str]:
+        return [doc['_id'] for doc in self._revoked.find({'expires_at': {'$gt': now}}, {'_id': 1})]
+
+    def ids_since(self, since: datetime) -> List[str]:
+        return [doc['_id'] for doc in self._revoked.find({'revoked_at': {'$gte': since}}, {'_id': 1})]
+
+
+class MongoRefreshSessionRepository:
+    def __init__(self, refresh_sessions):
+        self._sessions = refresh_sessions
+
+    def create(self, family: str, user_id: str, jti: str, expires_at: datetime) -> None:
+        try:
+            self._sessions.insert_one({'_id': family, 'user_id': user_id, 'current_jti': jti,
+                                       'previous_jti': None, 'rotated_at': None, 'expires_at': expires_at})
+        except DuplicateKeyError:
+            raise DuplicateKey('family')
+
+    def rotate(self, family: str, jti: str, new_jti: str, rotated_at: datetime, expires_at: datetime) -> bool:
+        """Replace the current jti with ``new_jti`` only if it is still ``jti``."""
+        result = self._sessions.update_one(
+            {'_id': family, 'current_jti': jti},
+            {'$set': {'current_jti': new_jti, 'previous_jti': jti, 'rotated_at': rotated_at,
+                      'expires_at': expires_at}}
+        )
+        return result.matched_count == 1
+
+    def get(self, family: str) -> Optional[Dict]:
+        # The TTL monitor may not have removed an expired session yet
+        return self._sessions.find_one({'_id': family, 'expires_at': {'$gt': datetime.utcnow()}})
+
+    def delete(self, family: str) -> bool:
+        return self._sessions.delete_one({'_id': family}).deleted_count == 1
+
+    def delete_for_user(self, user_id: str) -> int:
+        return self._sessions.delete_many({'user_id': user_id}).deleted_count
+
+
+# --- In memory -------------------------------------------------------------
+
+class MemoryUserRepository:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, Dict] = {}
+        self._by_username: Dict[str, str] = {}
+        self._by_email: Dict[str, str] = {}
+
+    def _insert(self, username: str, email: str, password_hash: str, created_at: datetime) -> str:
+        # Caller holds the lock
+        if username in self._by_username:
+            raise DuplicateKey('username')
+        if email in self._by_email:
+            raise DuplicateKey('email')
+        oid = ObjectId()
+        user_id = str(oid)
+        self._by_id[user_id] = {
+            '_id': oid,
+            'username': username,
+            'email': email,
+            'password_hash': password_hash,
+            'created_at': created_at,
+        }
+        self._by_username[username] = user_id
+        self._by_email[email] = user_id
+        return user_id
+
+    def create(self, username: str, email: str, password_hash: str) -> str:
+        with self._lock:
+            return self._insert(username, email, password_hash, datetime.utcnow())
+
+    def create_many(self, users: List[Dict]) -> Dict[int, str]:
+        errors = {}
+        now = datetime.utcnow()
+        with self._lock:
+            for index, user in enumerate(users):
+                try:
+                    self._insert(user['username'], user['email'], user['password_hash'], now)
+                except DuplicateKey as e:
+                    errors[index] = str(e)
+        return errors
+
+    def find_by_username(self, username: str) -> Optional[Dict]:
+        return self.find_by_id(self._by_username.get(username))
+
+    def find_by_id(self, user_id: str) -> Optional[Dict]:
+        doc = self._by_id.get(user_id)
+        return copy.deepcopy(doc) if doc else None
+
+    def usernames(self, user_ids: Iterable[str]) -> Dict[str, str]:
+        return {user_id: self._by_id[user_id]['username'] for user_id in user_ids if user_id in self._by_id}
+
+    def replace_password_hash(self, user_id: str, old_hash: str, new_hash: str) -> bool:
+        with self._lock:
+            doc = self._by_id.get(user_id)
+            if not doc or doc['password_hash'] != old_hash:
+                return False
+            doc['password_hash'] = new_hash
+        return True
+
+    def set_admin(self, username: str, admin: bool) -> bool:
+        with self._lock:
+            doc = self._by_id.get(self._by_username.get(username))
+            if not doc:
+                return False
+            if admin:
+                doc['is_admin'] = True
+            else:
+                doc.pop('is_admin', None)
+        return True
+
+
+class MemoryProfileRepository:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, Dict] = {}
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        doc = self._profiles.get(user_id)
+        return copy.deepcopy(doc) if doc else None
+
+    def update(self, user_id: str, fields: Dict) -> None:
+        with self._lock:
+            doc = self._profiles.setdefault(user_id, {'user_id': user_id})
+            doc.update(copy.deepcopy(fields))
+            doc['user_id'] = user_id
+
+    def find_user_ids(self, min_cgpa: float = None, max_backlogs: int = None, branch: str = None) -> List[str]:
+        def keep(doc):
+            if min_cgpa is not None and not (doc.get('cgpa') is not None and doc['cgpa'] >= min_cgpa):
+                return False
+            if max_backlogs is not None and not (doc.get('backlogs') is not None and doc['backlogs'] <= max_backlogs):
+                return False
+            return not branch or doc.get('branch') == branch
+        return [user_id for user_id, doc in list(self._profiles.items()) if keep(doc)]
+
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        return {user_id: copy.deepcopy(self._profiles[user_id]) for user_id in user_ids if user_id in self._profiles}
+
+
+class MemoryTestSessionRepository:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Dict]] = {}
+
+    def save(self, user_id: str, test_type: str, fields: Dict) -> None:
+        with self._lock:
+            tests = self._sessions.setdefault(user_id, {})
+            doc = tests.setdefault(test_type, {})
+            doc.update(copy.deepcopy(fields))
+            doc.update({'user_id': user_id, 'type': test_type})
+
+    def for_user(self, user_id: str) -> List[Dict]:
+        return [copy.deepcopy(doc) for doc in list(self._sessions.get(user_id, {}).values())]
+
+
+class MemoryQuestionRepository:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._questions: Dict[str, Dict] = {}
+        self._by_category: Dict[str, List[str]] = {}
+
+    def by_category(self, category: str) -> List[Dict]:
+        return [copy.deepcopy(self._questions[qid]) for qid in list(self._by_category.get(category, []))]
+
+    def get(self, question_id: str) -> Optional[Dict]:
+        if _object_id(question_id) is None:
+            raise ValueError('Invalid question id')
+        doc = self._questions.get(str(question_id))
+        return copy.deepcopy(doc) if doc else None
+
+    def add_many(self, docs: List[Dict]) -> List[str]:
+        ids = []
+        with self._lock:
+            for doc in docs:
+                doc = {**copy.deepcopy(doc), '_id': ObjectId()}
+                qid = str(doc['_id'])
+                self._questions[qid] = doc
+                self._by_category.setdefault(doc.get('category'), []).append(qid)
+                ids.append(qid)
+        return ids
+
+
+class MemoryRevokedTokenRepository:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked: Dict[str, Dict] = {}
+
+    def add(self, jti: str, expires_at: datetime, revoked_at: datetime) -> bool:
+        with self._lock:
+            if jti in self._revoked:
+                return False
+            self._revoked[jti] = {'expires_at': expires_at, 'revoked_at': revoked_at}
+        return True
+
+    def exists(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def active_ids(self, now: datetime) -> List[str]:
+        with self._lock:
+            # Stands in for the TTL index
+            for jti in [jti for jti, doc in self._revoked.items() if doc['expires_at'] <= now]:
+                del self._revoked[jti]
+            return list(self._revoked)
+
+    def ids_since(self, since: datetime) -> List[str]:
+        return [jti for jti, doc in list(self._revoked.items()) if doc['revoked_at'] >= since]
+
+
+class MemoryRefreshSessionRepository:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict] = {}
+
+    def create(self, family: str, user_id: str, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            if family in self._sessions:
+                raise DuplicateKey('family')
+            self._sessions[family] = {'_id': family, 'user_id': user_id, 'current_jti': jti,
+                                      'previous_jti': None, 'rotated_at': None, 'expires_at': expires_at}
+
+    def rotate(self, family: str, jti: str, new_jti: str, rotated_at: datetime, expires_at: datetime) -> bool:
+        with self._lock:
+            doc = self._sessions.get(family)
+            if doc is None or doc['current_jti'] != jti:
+                return False
+            doc.update(current_jti=new_jti, previous_jti=jti, rotated_at=rotated_at, expires_at=expires_at)
+        return True
+
+    def get(self, family: str) -> Optional[Dict]:
+        doc = self._sessions.get(family)
+        # Stands in for the TTL index
+        if doc is None or doc['expires_at'] <= datetime.utcnow():
+            return None
+        return dict(doc)
+
+    def delete(self, family: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(family, None) is not None
+
+    def delete_for_user(self, user_id: str) -> int:
+        with self._lock:
+            families = [family for family, doc in self._sessions.items() if doc['user_id'] == user_id]
+            for family in families:
+                del self._sessions[family]
+        return len(families)
+
+
+# --- Selection -------------------------------------------------------------
+
+class Repositories:
+    def __init__(self, users, profiles, test_sessions, questions, revoked_tokens, refresh_sessions):
+        self.users = users
+        self.profiles = profiles
+        self.test_sessions = test_sessions
+        self.questions = questions
+        self.revoked_tokens = revoked_tokens
+        self.refresh_sessions = refresh_sessions
+
+
+def mongo_repositories(db=None) -> Repositories:
+    """Mongo-backed repositories; ``db`` defaults to this process's lazy client."""
+    if db is None:
+        from services.mongo_client import collection
+        coll = collection
+    else:
+        coll = db.get_collection
+    return Repositories(
+        users=MongoUserRepository(coll('users')),
+        profiles=MongoProfileRepository(coll('profiles')),
+        test_sessions=MongoTestSessionRepository(coll('test_sessions')),
+        questions=MongoQuestionRepository(coll('questions')),
+        revoked_tokens=MongoRevokedTokenRepository(coll('revoked_tokens')),
+        refresh_sessions=MongoRefreshSessionRepository(coll('refresh_sessions')),
+    )
+
+
+def memory_repositories() -> Repositories:
+    return Repositories(
+        users=MemoryUserRepository(),
+        profiles=MemoryProfileRepository(),
+        test_sessions=MemoryTestSessionRepository(),
+        questions=MemoryQuestionRepository(),
+        revoked_tokens=MemoryRevokedTokenRepository(),
+        refresh_sessions=MemoryRefreshSessionRepository(),
+    )
+
+
+_repositories: Optional[Repositories] = None
+_lock = threading.Lock()
+
+
+def repositories() -> Repositories:
+    """The process-wide repositories for the configured REPOSITORY_BACKEND."""
+    global _repositories
+    if _repositories is None:
+        with _lock:
+            if _repositories is None:
+                backend = settings.REPOSITORY_BACKEND
+                if backend == 'mongo':
+                    _repositories = mongo_repositories()
+                elif backend == 'memory':
+                    _repositories = memory_repositories()
+                else:
+                    raise ValueError(f'Unknown REPOSITORY_BACKEND {backend!r} (expected mongo or memory)')
+    return _repositories
+
+
+def reset_repositories() -> None:
+    """Forget the current repositories; the next use builds them for the current setting."""
+    global _repositories
+    with _lock:
+        _repositories = None
+
+
+class LazyRepository:
+    """Module-level stand-in for one repository, resolved through ``repositories()`` on use."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return getattr(getattr(repositories(), self.name), attr)
+
+    def __repr__(self):
+        return f'LazyRepository({self.name!r})'
+
+
+def repository(name: str) -> LazyRepository:
+    """Handle to ``repositories().<name>`` that is safe to create at import time."""
+    return LazyRepository(name)
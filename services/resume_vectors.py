@@ -0,0 +1,112 @@
+"""
+Students' latest resume skill sets, for ranking them against job descriptions.
+
+Each upload stores the skills the resume mentions, the taxonomy key they were
+found under and the resume's tokens (zlib-compressed). A set stored under an
+older taxonomy is re-derived from its tokens when next read and written back,
+so a taxonomy change does not silently drop newly added skills. Sets stored
+without tokens cannot be re-derived; they are used as they are and reported
+as stale until the student uploads again.
+
+Workers keep every student's set as one sparse matrix, rebuilt at most once
+per TTL, when the taxonomy changes, or right after this worker stores a set.
+"""
+
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from bson import Binary
+
+from config import settings
+from utils.lru import TTLCache
+from utils.resume_parser import ParsedResume
+from utils.taxonomy import CompiledTaxonomy, current_taxonomy
+from utils.term_index import TermIndex
+from services.mongo_client import collection
+from services.skill_vectors import resume_skills, skill_matrix, vocabulary
+
+resume_vectors = collection('resume_vectors')
+
+_matrix_cache = TTLCache(maxsize=1, ttl=settings.RANKING_CACHE_SECONDS)
+
+
+def store_resume_vector(user_id: str, parsed: ParsedResume) -> None:
+    """Keep the student's latest skill set, replacing the previous one."""
+    taxonomy = current_taxonomy()
+    resume_vectors.update_one(
+        {'user_id': user_id},
+        {'$set': {
+            'skills': resume_skills(parsed, taxonomy),
+            'taxonomy_version': taxonomy.key,
+            'tokens': Binary(zlib.compress(' '.join(parsed.tokens).encode('utf-8'))),
+            'updated_at': datetime.utcnow(),
+        }},
+        upsert=True
+    )
+    _matrix_cache.clear()
+
+
+def _refresh(doc: Dict, taxonomy: CompiledTaxonomy) -> Tuple[List[str], bool]:
+    """(skills under ``taxonomy``, stale) for a stored vector document."""
+    if doc.get('taxonomy_version') == taxonomy.key:
+        return doc['skills'], False
+    tokens = doc.get('tokens')
+    if tokens is None:
+        tokens = (resume_vectors.find_one({'_id': doc['_id']}, {'tokens': 1}) or {}).get('tokens')
+    if tokens is None:
+        return doc['skills'], True
+    words = zlib.decompress(tokens).decode('utf-8').split()
+    skills = sorted(taxonomy.find_skills(TermIndex.from_tokens(words)))
+    # Conditional, so a concurrent upload's newer set is never overwritten
+    resume_vectors.update_one(
+        {'_id': doc['_id'], 'taxonomy_version': doc.get('taxonomy_version')},
+        {'$set': {'skills': skills, 'taxonomy_version': taxonomy.key}}
+    )
+    return skills, False
+
+
+def student_skills(user_id: str) -> Optional[List[str]]:
+    """The student's current skill set, or None before their first upload."""
+    doc = resume_vectors.find_one({'user_id': user_id}, {'skills': 1, 'taxonomy_version': 1})
+    if not doc:
+        return None
+    return _refresh(doc, current_taxonomy())[0]
+
+
+def ranking_matrix() -> Dict:
+    """Every stored skill set as rows of one matrix over the current vocabulary.
+
+    Returns ``user_ids``, ``skills`` and ``matrix`` in row order, ``rows``
+    mapping user id to row and the set of ``stale`` user ids.
+    """
+    taxonomy = current_taxonomy()
+    vocab = vocabulary()
+    entry = _matrix_cache.get('vectors')
+    if entry is not None and entry['vocab'] is vocab:
+        return entry
+    user_ids, skill_lists, stale = [], [], set()
+    # Tokens are only fetched for the few documents that need re-deriving
+    for doc in resume_vectors.find({}, {'user_id': 1, 'skills': 1, 'taxonomy_version': 1}):
+        skills, is_stale = _refresh(doc, taxonomy)
+        user_ids.append(doc['user_id'])
+        skill_lists.append(skills)
+        if is_stale:
+            stale.add(doc['user_id'])
+    entry = {
+        'vocab': vocab,
+        'user_ids': user_ids,
+        'skills': skill_lists,
+        'rows': {user_id: row for row, user_id in enumerate(user_ids)},
+        'stale': stale,
+        'matrix': skill_matrix(skill_lists),
+    }
+    _matrix_cache.set('vectors', entry)
+    return entry
+
+
+def select_rows(entry: Dict, user_ids: List[str]) -> np.ndarray:
+    """Matrix rows of ``user_ids`` that have a stored skill set, in matrix order."""
+    rows = entry['rows']
+    return np.array(sorted(rows[user_id] for user_id in set(user_ids) if user_id in rows), dtype=np.int64)
@@ -0,0 +1,156 @@
+"""
+Revoked token ids, checked without a database round trip per request.
+
+Revocations (access tokens at logout, and refresh tokens issued before
+refresh families, see ``services.refresh_sessions``) are written to the small
+``revoked_tokens`` collection, which a TTL index (see ``services.indexes``)
+empties as the tokens expire on their own. Each worker mirrors it in a Bloom
+filter: ids missing from the filter are definitely not revoked, so ordinary
+requests never touch Mongo. A filter hit is confirmed with one lookup, which
+also absorbs the rare false positive.
+
+Workers pick up each other's revocations by pulling new entries every
+``REVOCATION_SYNC_SECONDS`` and rebuild the filter from scratch every
+``REVOCATION_REBUILD_SECONDS`` so ids of expired tokens drop out of it. A
+revocation is therefore enforced immediately by the worker that made it and
+within one sync interval by every other worker.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from pymongo.errors import PyMongoError
+
+from config import settings
+from services.metrics import increment, register_source
+from services.repositories import repositories
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.sha256(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+_filter: Optional[BloomFilter] = None
+_synced_until: Optional[datetime] = None
+_next_sync = 0.0
+_next_rebuild = 0.0
+_lock = threading.Lock()
+
+
+def _rebuild() -> None:
+    global _filter, _synced_until
+    started = datetime.utcnow()
+    ids = repositories().revoked_tokens.active_ids(started)
+    bloom = BloomFilter(max(settings.REVOCATION_FILTER_CAPACITY, 2 * len(ids)),
+                        settings.REVOCATION_FILTER_ERROR_RATE)
+    for jti in ids:
+        bloom.add(jti)
+    _filter, _synced_until = bloom, started
+
+
+def _pull_new() -> None:
+    global _synced_until, _next_rebuild
+    started = datetime.utcnow()
+    # Overlap the previous window so entries written by a worker with a
+    # slightly slow clock are not skipped; adding an id twice is harmless
+    since = _synced_until - timedelta(seconds=settings.REVOCATION_SYNC_SECONDS)
+    for jti in repositories().revoked_tokens.ids_since(since):
+        if jti not in _filter:
+            _filter.add(jti)
+    if _filter.count > _filter.capacity:
+        # Past capacity the false-positive rate climbs: rebuild bigger now
+        _next_rebuild = 0.0
+    _synced_until = started
+
+
+def _sync_if_due() -> None:
+    global _next_sync, _next_rebuild
+    now = time.monotonic()
+    if now < _next_sync:
+        return
+    with _lock:
+        if now < _next_sync:
+            return
+        try:
+            if _filter is None or now >= _next_rebuild:
+                _rebuild()
+                _next_rebuild = now + settings.REVOCATION_REBUILD_SECONDS
+            else:
+                _pull_new()
+        except PyMongoError as e:
+            if _filter is None:
+                raise
+            print('Revocation sync error, keeping previous filter:', e)
+        _next_sync = now + settings.REVOCATION_SYNC_SECONDS
+
+
+def revoke(jti: str, exp: int) -> bool:
+    """Record ``jti`` as revoked until ``exp``; False if it already was.
+
+    The insert doubles as an atomic claim, so two concurrent refreshes with
+    the same refresh token cannot both succeed.
+    """
+    _sync_if_due()
+    revoked = repositories().revoked_tokens.add(jti, datetime.utcfromtimestamp(exp), datetime.utcnow())
+    with _lock:
+        if jti not in _filter:
+            _filter.add(jti)
+    return revoked
+
+
+def is_revoked(jti: str) -> bool:
+    """True if ``jti`` was revoked; only Bloom filter hits reach Mongo."""
+    _sync_if_due()
+    if jti not in _filter:
+        return False
+    try:
+        revoked = repositories().revoked_tokens.exists(jti)
+    except PyMongoError as e:
+        # Cannot confirm a filter hit: fail closed
+        print('Revocation lookup error:', e)
+        return True
+    increment('revocation_lookups', 'confirmed' if revoked else 'false_positive')
+    return revoked
+
+
+def filter_stats() -> Dict:
+    bloom = _filter
+    if bloom is None:
+        return {'loaded': False}
+    return {
+        'loaded': True,
+        'entries': bloom.count,
+        'capacity': bloom.capacity,
+        'bits': bloom.size,
+        'hashes': bloom.hashes,
+        'synced_until': _synced_until.isoformat() if _synced_until else None,
+    }
+
+
+register_source('revocation_filter', filter_stats)
@@ -0,0 +1,98 @@
+"""
+Sparse skill vectors for ranking resumes against job descriptions in bulk.
+
+A resume is a binary vector over the taxonomy's skill terms. A job
+description becomes a weight vector chosen so that ``100 * (resume @ weights)``
+equals ``JobAwareResumeScorer``'s skills coverage for that pair, so many
+resumes (or many job descriptions) can be scored with a single sparse
+matrix product.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from utils.taxonomy import CompiledTaxonomy, current_taxonomy
+from utils.resume_parser import ParsedResume
+
+_vocabularies: Dict[str, Dict[str, int]] = {}
+
+
+def vocabulary() -> Dict[str, int]:
+    """Column index of every skill term in the current taxonomy."""
+    taxonomy = current_taxonomy()
+    vocab = _vocabularies.get(taxonomy.key)
+    if vocab is None:
+        vocab = {term: col for col, term in enumerate(sorted(taxonomy.skill_terms))}
+        _vocabularies.clear()
+        _vocabularies[taxonomy.key] = vocab
+    return vocab
+
+
+def resume_skills(parsed: ParsedResume, taxonomy: Optional[CompiledTaxonomy] = None) -> List[str]:
+    """Taxonomy skills the resume mentions on word boundaries, sorted."""
+    return sorted((taxonomy or current_taxonomy()).find_skills(parsed.term_index))
+
+
+def requirement_weights(job_requirements: Dict) -> Dict[str, float]:
+    """Per-skill weights reproducing the scorer's skills coverage as a dot product.
+
+    Coverage averages matched/total over subcategories, then over categories,
+    so each required skill contributes 1 / (categories * subcategories * skills).
+    """
+    categories = []
+    for subcategories in (job_requirements.get('required_skills') or {}).values():
+        subcats = [skills for skills in (subcategories or {}).values() if skills]
+        if subcats:
+            categories.append(subcats)
+
+    weights: Dict[str, float] = {}
+    for subcats in categories:
+        for skills in subcats:
+            share = 1.0 / (len(categories) * len(subcats) * len(skills))
+            for skill in skills:
+                weights[skill] = weights.get(skill, 0.0) + share
+    return weights
+
+
+def skill_matrix(skill_lists: Sequence[Iterable[str]]) -> sparse.csr_matrix:
+    """One binary row per skill list; terms outside the vocabulary are dropped."""
+    vocab = vocabulary()
+    indptr = [0]
+    indices: List[int] = []
+    for skills in skill_lists:
+        indices.extend(sorted({vocab[term] for term in skills if term in vocab}))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(skill_lists), len(vocab)))
+
+
+def weight_matrix(weight_maps: Sequence[Dict[str, float]]) -> sparse.csr_matrix:
+    """One row per requirement weight map."""
+    vocab = vocabulary()
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for weights in weight_maps:
+        cols = {}
+        for term, weight in weights.items():
+            if term in vocab:
+                cols[vocab[term]] = cols.get(vocab[term], 0.0) + weight
+        for col in sorted(cols):
+            indices.append(col)
+            data.append(cols[col])
+        indptr.append(len(indices))
+    return sparse.csr_matrix((np.array(data, dtype=np.float64), indices, indptr),
+                             shape=(len(weight_maps), len(vocab)))
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first."""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.size:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
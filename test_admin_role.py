@@ -0,0 +1,35 @@
+# ===== test_admin_role.py =====
+# Admin rights come from the user record, never from the username alone.
+import pytest
+
+from config import settings
+from utils.jwt_utils import create_token_pair
+
+
+@pytest.fixture(autouse=True)
+def no_metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, 'METRICS_TOKEN', '')
+
+
+def _login(client, username):
+    response = client.post('/api/auth/login', json={'username': username, 'password': 'pw-123456'})
+    assert response.status_code == 200
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+def test_registering_gives_no_admin_rights(client):
+    assert client.post('/api/auth/register', json={
+        'username': 'admin', 'email': 'admin@example.com', 'password': 'pw-123456'}).status_code == 201
+    headers = _login(client, 'admin')
+    assert client.get('/api/metrics', headers=headers).status_code == 403
+    assert client.post('/api/jobs', headers=headers, json={}).status_code == 403
+
+
+def test_admin_flag_is_checked_on_every_request(client, memory_repos):
+    user_id = memory_repos.users.create('tpo', 'tpo@example.com', 'unused-hash')
+    headers = {'Authorization': f"Bearer {create_token_pair(user_id, 'tpo')['token']}"}
+    assert client.get('/api/metrics', headers=headers).status_code == 403
+    memory_repos.users.set_admin('tpo', True)
+    assert client.get('/api/metrics', headers=headers).status_code == 200
+    memory_repos.users.set_admin('tpo', False)
+    assert client.get('/api/metrics', headers=headers).status_code == 403
@@ -0,0 +1,73 @@
+# ===== test_admission.py =====
+import threading
+
+import pytest
+from flask import Flask
+
+from services.admission import AdmissionController, admission_controlled
+
+
+def _controller(**limits):
+    options = dict(max_concurrent=1, max_queue=0, queue_timeout=0.05, per_user=1)
+    options.update(limits)
+    return AdmissionController('test', **options)
+
+
+def test_rejection_reasons():
+    controller = _controller()
+    assert controller.acquire('a') is None
+    assert controller.acquire('a') == 'user_limit'
+    assert controller.acquire('b') == 'queue_full'
+
+    queued = _controller(max_queue=1)
+    assert queued.acquire('a') is None
+    assert queued.acquire('b') == 'timeout'
+    # The timed-out request gave its per-user slot back
+    assert queued._users == {'a': 1}
+
+
+def test_queued_request_is_admitted_when_a_slot_frees():
+    controller = _controller(max_queue=1, queue_timeout=5)
+    assert controller.acquire('a') is None
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(controller.acquire('b')))
+    waiter.start()
+    controller.release('a')
+    waiter.join(5)
+    assert result == [None]
+    assert controller.active == 1 and controller.waiting == 0
+
+
+@pytest.fixture
+def guarded():
+    controller = _controller()
+    entered, proceed = threading.Event(), threading.Event()
+    app = Flask(__name__)
+
+    @app.post('/work')
+    @admission_controlled(controller, retry_after=7)
+    def work():
+        entered.set()
+        proceed.wait(5)
+        return {'ok': True}
+
+    return app, controller, entered, proceed
+
+
+def test_busy_endpoint_answers_429_with_retry_after(guarded):
+    app, controller, entered, proceed = guarded
+    first = []
+    worker = threading.Thread(target=lambda: first.append(app.test_client().post('/work')))
+    worker.start()
+    assert entered.wait(5)
+
+    response = app.test_client().post('/work')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '7'
+    assert response.get_json()['reason'] in ('user_limit', 'queue_full')
+
+    proceed.set()
+    worker.join(5)
+    assert first[0].status_code == 200
+    assert controller.active == 0
+    assert app.test_client().post('/work').status_code == 200
@@ -0,0 +1,71 @@
+# ===== test_auth_cache.py =====
+# The verified-token cache never outlives a token and never skips revocation.
+import time
+
+import pytest
+
+from config import settings
+from services.revocation import revoke
+import utils.auth as auth
+from utils.jwt_utils import create_jwt, verify_jwt
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    auth._token_cache.clear()
+    yield
+    auth._token_cache.clear()
+
+
+@pytest.fixture
+def cached_ttls(monkeypatch):
+    ttls = []
+    original = auth._token_cache.set
+
+    def record(key, value, ttl=None):
+        ttls.append(ttl)
+        original(key, value, ttl=ttl)
+
+    monkeypatch.setattr(auth._token_cache, 'set', record)
+    return ttls
+
+
+def _token(user_id, expires_in):
+    return create_jwt({'sub': user_id, 'username': 'student', 'type': 'access'}, expires_in)
+
+
+def test_cache_ttl_is_capped_by_token_expiry(monkeypatch, cached_ttls):
+    monkeypatch.setattr(settings, 'AUTH_TOKEN_CACHE_TTL_SECONDS', 60)
+    auth.verify_token_cached(_token('u1', 3))
+    auth.verify_token_cached(_token('u1', 600))
+    assert 0 < cached_ttls[0] <= 3
+    assert cached_ttls[1] == 60
+
+
+def test_cache_hit_returns_a_copy_without_reverifying(monkeypatch):
+    token = _token('u1', 600)
+    first = auth.verify_token_cached(token)
+    first['sub'] = 'changed'
+    monkeypatch.setattr(auth, 'verify_jwt', lambda _: pytest.fail('cache miss'))
+    assert auth.verify_token_cached(token)['sub'] == 'u1'
+
+
+def test_revocation_is_checked_on_a_cache_hit(client, memory_repos):
+    user_id = memory_repos.users.create('student', 'student@example.com', 'unused-hash')
+    token = _token(user_id, 600)
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/api/profile', headers=headers).status_code == 200
+    hits = auth._token_cache.stats()['hits']
+
+    payload = verify_jwt(token)
+    revoke(payload['jti'], payload['exp'])
+    assert client.get('/api/profile', headers=headers).status_code == 401
+    assert auth._token_cache.stats()['hits'] == hits + 1
+
+
+def test_expired_cached_token_is_rejected(client, memory_repos):
+    user_id = memory_repos.users.create('student', 'student@example.com', 'unused-hash')
+    headers = {'Authorization': f"Bearer {_token(user_id, 1)}"}
+    assert client.get('/api/profile', headers=headers).status_code == 200
+    time.sleep(1.1)
+    assert client.get('/api/profile', headers=headers).status_code == 401
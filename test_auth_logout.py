@@ -0,0 +1,31 @@
+# ===== test_auth_logout.py =====
+from utils.jwt_utils import create_jwt, create_token_pair
+
+
+def _user(repos, username):
+    user_id = repos.users.create(username, f'{username}@example.com', 'unused-hash')
+    return user_id, create_token_pair(user_id, username)
+
+
+def test_logout_with_expired_access_token_revokes_refresh_token(client, memory_repos):
+    user_id, tokens = _user(memory_repos, 'logout-expired')
+    expired = create_jwt({'sub': user_id, 'username': 'logout-expired', 'type': 'access'}, expires_in=-10)
+
+    response = client.post('/api/auth/logout', headers={'Authorization': f'Bearer {expired}'},
+                           json={'refresh_token': tokens['refresh_token']})
+    assert response.status_code == 200
+    assert response.get_json()['revoked'] == 1
+
+    response = client.post('/api/auth/refresh', json={'refresh_token': tokens['refresh_token']})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_live_access_token(client, memory_repos):
+    _, tokens = _user(memory_repos, 'logout-live')
+    headers = {'Authorization': f"Bearer {tokens['token']}"}
+    assert client.get('/api/profile', headers=headers).status_code == 200
+
+    response = client.post('/api/auth/logout', headers=headers, json={'refresh_token': tokens['refresh_token']})
+    assert response.get_json()['revoked'] == 2
+    assert client.get('/api/profile', headers=headers).status_code == 401
+    assert client.post('/api/auth/refresh', json={'refresh_token': tokens['refresh_token']}).status_code == 401
@@ -0,0 +1,85 @@
+# ===== test_bulk_resume.py =====
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import services.bulk_resume as bulk_resume
+
+
+class _ThreadPool(ThreadPoolExecutor):
+    """Stands in for the process pool so the test can count and pace chunks."""
+
+    def __init__(self, max_workers=None, mp_context=None):
+        super().__init__(max_workers=1)
+
+
+def test_score_many_cancels_remaining_chunks_when_closed(monkeypatch):
+    started = []
+    release = threading.Event()
+
+    def slow_chunk(start, texts, requirements):
+        started.append(start)
+        release.wait(5)
+        return [(start + offset, {'overall_score': 0}) for offset in range(len(texts))]
+
+    monkeypatch.setattr(bulk_resume, 'ProcessPoolExecutor', _ThreadPool)
+    monkeypatch.setattr(bulk_resume, '_match_chunk', slow_chunk)
+
+    results = bulk_resume.score_many(['resume'] * 40, {}, workers=2, chunk_size=4)
+    release.set()
+    assert next(results)[0] == 0
+    release.clear()
+
+    began = time.perf_counter()
+    results.close()  # what a client disconnect does to the streaming generator
+    assert time.perf_counter() - began < 1
+    release.set()
+    time.sleep(0.2)
+    # Only chunks already running finish; the queued ones were cancelled
+    assert len(started) < 10
+
+
+def test_zip_members_keep_their_extension(tmp_path):
+    archive = tmp_path / 'batch.zip'
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('简历.pdf', b'%PDF')
+        zf.writestr('../../etc/cv.docx', b'PK')
+        zf.writestr('notes.txt', b'skip me')
+    files = bulk_resume.collect_resume_files(str(archive), str(tmp_path))
+    assert [key for key, _ in files] == ['简历.pdf', '../../etc/cv.docx']
+    assert [os.path.basename(path) for _, path in files] == ['0_resume.pdf', '1_cv.docx']
+    assert all(os.path.dirname(path) == str(tmp_path) for _, path in files)
+
+
+def test_unsupported_file_is_reported_not_raised():
+    row = bulk_resume.score_resume_file('3_pdf', '/tmp/3_pdf')
+    assert row['file'] == '3_pdf'
+    assert row['error'] == 'Unsupported file type'
+
+
+def test_checkpoint_is_removed_once_the_run_completes(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_resume, 'ProcessPoolExecutor', _ThreadPool)
+    monkeypatch.setattr(bulk_resume, 'score_resume_file',
+                        lambda key, path, jd: {'file': key, 'overall_score': 50})
+    checkpoint = tmp_path / 'run.ndjson'
+    files = [('a.pdf', 'a.pdf'), ('b.pdf', 'b.pdf')]
+
+    rows = bulk_resume.iter_bulk_scores(files, '', str(checkpoint))
+    next(rows)
+    rows.close()
+    # Interrupted: the finished row is kept for the next attempt
+    assert len(bulk_resume.load_checkpoint(str(checkpoint))) == 1
+
+    assert sorted(row['file'] for row in bulk_resume.iter_bulk_scores(files, '', str(checkpoint))) == ['a.pdf', 'b.pdf']
+    assert not checkpoint.exists()
+
+
+def test_prune_checkpoints_removes_only_stale_runs(tmp_path):
+    stale, fresh = tmp_path / 'old.ndjson', tmp_path / 'new.ndjson'
+    stale.write_text('{}\n')
+    fresh.write_text('{}\n')
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+    assert bulk_resume.prune_checkpoints(str(tmp_path), 60) == 1
+    assert fresh.exists() and not stale.exists()
@@ -0,0 +1,55 @@
+# ===== test_docx_text.py =====
+import io
+import zipfile
+
+import pytest
+
+from utils.docx_text import extract_docx_text
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+DOCUMENT_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document {W}><w:body>
+<w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p>
+<w:p><w:r><w:t xml:space="preserve">Email: </w:t></w:r><w:r><w:t>jane@example.com</w:t></w:r></w:p>
+<w:p><w:r><w:t>Skills</w:t><w:tab/><w:t>Python, SQL</w:t></w:r></w:p>
+<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Developed</w:t><w:br/><w:t>APIs</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+<w:p/>
+<w:p><w:r><w:t>Improved latency by 40%</w:t><w:cr/></w:r></w:p>
+</w:body></w:document>"""
+
+HEADER_XML = f'<w:hdr {W}><w:p><w:r><w:t>Resume header</w:t></w:r></w:p></w:hdr>'
+FOOTER_XML = f'<w:ftr {W}><w:p><w:r><w:t>Page footer</w:t></w:r></w:p></w:ftr>'
+
+
+def _build_docx(media_size=0):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', '<Types/>')
+        zf.writestr('word/header1.xml', HEADER_XML)
+        zf.writestr('word/document.xml', DOCUMENT_XML)
+        zf.writestr('word/footer1.xml', FOOTER_XML)
+        if media_size:
+            zf.writestr('word/media/image1.png', b'\x89PNG' + b'\0' * media_size)
+    buf.seek(0)
+    return buf
+
+
+def test_extracts_headers_body_and_footers_in_order():
+    text = extract_docx_text(_build_docx())
+    assert text.startswith('Resume header')
+    assert 'Email: jane@example.com' in text
+    assert 'Skills\tPython, SQL' in text
+    assert 'Developed\nAPIs' in text
+    assert text.endswith('Page footer')
+
+
+def test_ignores_embedded_media():
+    assert extract_docx_text(_build_docx(media_size=4 * 1024 * 1024)) == extract_docx_text(_build_docx())
+
+
+def test_matches_docx2txt(tmp_path):
+    docx2txt = pytest.importorskip('docx2txt')
+    path = tmp_path / 'resume.docx'
+    path.write_bytes(_build_docx(media_size=1024).getvalue())
+    assert extract_docx_text(str(path)) == docx2txt.process(str(path))
@@ -0,0 +1,64 @@
+# ===== test_jd_cache.py =====
+import pytest
+
+import services.jd_cache as jd_cache
+from utils.job_matching import JobDescriptionAnalyzer
+
+TAXONOMY = {
+    'version': 'v1',
+    'role_categories': {'backend': ['backend']},
+    'skill_categories': {'programming_languages': {'python': ['python', 'django']}},
+}
+
+
+@pytest.fixture
+def parses(monkeypatch, taxonomy_file):
+    taxonomy_file(TAXONOMY)
+    jd_cache._cache.clear()
+    calls = []
+
+    class CountingAnalyzer(JobDescriptionAnalyzer):
+        def extract_job_requirements(self, job_description):
+            calls.append(job_description)
+            return super().extract_job_requirements(job_description)
+
+    monkeypatch.setattr(jd_cache, 'JobDescriptionAnalyzer', CountingAnalyzer)
+    yield calls
+    jd_cache._cache.clear()
+
+
+def test_trivially_different_copies_share_one_parse(parses):
+    hits = jd_cache.cache_stats()['hits']
+    first = jd_cache.get_job_requirements('Backend developer:  Python and Django')
+    again = jd_cache.get_job_requirements('  backend DEVELOPER: python\nand django ')
+    assert again is first
+    assert parses == ['backend developer: python and django']
+    assert jd_cache.cache_stats()['hits'] == hits + 1
+
+    jd_cache.get_job_requirements('Backend developer: Python')
+    assert len(parses) == 2
+
+
+def test_taxonomy_change_misses(parses, taxonomy_file):
+    before = jd_cache.get_job_requirements('Python and Flask')
+    assert before['required_skills']['programming_languages']['python'] == ['python']
+    taxonomy_file(dict(TAXONOMY, version='v2', skill_categories={
+        'programming_languages': {'python': ['python', 'django', 'flask']}}))
+    after = jd_cache.get_job_requirements('Python and Flask')
+    assert after['required_skills']['programming_languages']['python'] == ['python', 'flask']
+    assert after['taxonomy_version'] != before['taxonomy_version']
+    assert len(parses) == 2
+
+
+def test_persisted_parse_is_shared_between_workers(parses, monkeypatch):
+    mongomock = pytest.importorskip('mongomock')
+    coll = mongomock.MongoClient().db.jd_requirements
+    monkeypatch.setattr(jd_cache, '_collection', lambda: coll)
+
+    first = jd_cache.get_job_requirements('Python backend', persist=True)
+    assert coll.count_documents({}) == 1
+    # Another worker: empty in-process cache, same Mongo collection
+    jd_cache._cache.clear()
+    shared = jd_cache.get_job_requirements('python   BACKEND', persist=True)
+    assert shared == first
+    assert len(parses) == 1
@@ -0,0 +1,72 @@
+# ===== test_job_catalog.py =====
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+import services.job_catalog as job_catalog
+import services.jd_cache as jd_cache
+
+TAXONOMY = {
+    'version': 'v1',
+    'role_categories': {'backend': ['backend'], 'frontend': ['frontend']},
+    'skill_categories': {
+        'programming_languages': {'python': ['python', 'django'], 'javascript': ['javascript', 'react']},
+    },
+}
+
+
+@pytest.fixture
+def catalog(monkeypatch, taxonomy_file):
+    taxonomy_file(TAXONOMY)
+    jd_cache._cache.clear()
+    coll = mongomock.MongoClient().db.job_catalog
+    monkeypatch.setattr(job_catalog, 'job_catalog', coll)
+    job_catalog._matrix_cache.clear()
+    yield coll
+    job_catalog._matrix_cache.clear()
+    jd_cache._cache.clear()
+
+
+def test_recommendations_rank_by_skills_coverage(catalog):
+    django = job_catalog.add_job('Django dev', 'Acme', 'Backend: Python and Django', 'admin')
+    python = job_catalog.add_job('Python dev', 'Beta', 'Backend work in Python', 'admin')
+    react = job_catalog.add_job('UI dev', 'Gamma', 'Frontend with React', 'admin')
+    assert job_catalog.add_job('Chef', 'Diner', 'Cook pasta', 'admin') is None
+
+    results = job_catalog.recommend_jobs(['python'], k=3)
+    assert [r['id'] for r in results] == [python, django, react]
+    assert [r['skills_coverage'] for r in results] == [100.0, 50.0, 0.0]
+    assert results[1]['matched_skills'] == ['python']
+    assert results[1]['missing_skills'] == ['django']
+    assert results[0]['role_category'] == 'backend'
+
+
+def test_catalog_matrix_is_cached_until_the_catalog_changes(catalog, monkeypatch):
+    removed = []
+    monkeypatch.setattr(job_catalog, 'remove_document', removed.append)
+    first = job_catalog.add_job('Python dev', 'Beta', 'Python', 'admin')
+    job_catalog.recommend_jobs(['python'])
+
+    reads = []
+    find = catalog.find
+    monkeypatch.setattr(catalog, 'find', lambda *a, **kw: reads.append(a) or find(*a, **kw))
+    job_catalog.recommend_jobs(['python'])
+    assert reads == []
+
+    assert job_catalog.deactivate_job(first)
+    assert not job_catalog.deactivate_job(first)
+    # Dropped from the BM25 corpus once, whichever scorer is configured now
+    assert removed == [f'job:{first}']
+    assert job_catalog.recommend_jobs(['python']) == []
+    assert len(reads) == 1
+    assert job_catalog.list_jobs() == []
+
+
+def test_recommendations_endpoint_needs_an_upload(client, memory_repos, monkeypatch, catalog):
+    import services.resume_vectors as resume_vectors
+    from utils.jwt_utils import create_token_pair
+    monkeypatch.setattr(resume_vectors, 'resume_vectors', mongomock.MongoClient().db.resume_vectors)
+    user_id = memory_repos.users.create('student', 'student@example.com', 'unused-hash')
+    headers = {'Authorization': f"Bearer {create_token_pair(user_id, 'student')['token']}"}
+    assert client.get('/api/jobs/recommendations', headers=headers).status_code == 404
+    assert client.get('/api/jobs/recommendations?k=x', headers=headers).status_code == 400
@@ -0,0 +1,24 @@
+# ===== test_metrics_auth.py =====
+# /api/metrics must never be public: a scraper token or an admin's access token.
+from config import settings
+from utils.jwt_utils import create_token_pair
+
+
+def _bearer(repos, username, admin=False):
+    user_id = repos.users.create(username, f'{username}@example.com', 'unused-hash')
+    if admin:
+        repos.users.set_admin(username, True)
+    return {'Authorization': f"Bearer {create_token_pair(user_id, username)['token']}"}
+
+
+def test_metrics_without_token_requires_admin(client, memory_repos, monkeypatch):
+    monkeypatch.setattr(settings, 'METRICS_TOKEN', '')
+    assert client.get('/api/metrics').status_code == 401
+    assert client.get('/api/metrics', headers=_bearer(memory_repos, 'metrics-student')).status_code == 403
+    assert client.get('/api/metrics', headers=_bearer(memory_repos, 'metrics-admin', admin=True)).status_code == 200
+
+
+def test_metrics_with_token(client, monkeypatch):
+    monkeypatch.setattr(settings, 'METRICS_TOKEN', 'scrape-secret')
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
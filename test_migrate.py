@@ -0,0 +1,50 @@
+# ===== test_migrate.py =====
+import importlib.util
+import os
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from services.indexes import apply_indexes, declared_indexes
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def migrate(monkeypatch):
+    spec = importlib.util.spec_from_file_location('migrate', os.path.join(ROOT, 'scripts', 'migrate.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr(module, 'get_db', lambda: db)
+
+    def run(*args):
+        monkeypatch.setattr('sys.argv', ['migrate.py', *args])
+        with pytest.raises(SystemExit) as exit_info:
+            module.main()
+        return exit_info.value.code
+
+    return db, run
+
+
+def test_check_reports_missing_indexes_without_creating_them(migrate, capsys):
+    db, run = migrate
+    assert run('--check') == 1
+    out = capsys.readouterr().out
+    declared = sum(len(models) for models in declared_indexes().values())
+    assert out.count(': missing') == declared
+    assert f'{declared} index(es) need migrating' in out
+    assert db.list_collection_names() == []
+
+
+def test_check_passes_once_migrated_and_flags_a_changed_ttl(migrate, capsys):
+    db, run = migrate
+    apply_indexes(db)
+    assert run('--check') == 0
+    assert 'Indexes up to date' in capsys.readouterr().out
+
+    db.revoked_tokens.drop_index('expires_at_1')
+    db.revoked_tokens.create_index('expires_at', expireAfterSeconds=60)
+    assert run('--check') == 1
+    assert 'revoked_tokens.expires_at_1: options differ' in capsys.readouterr().out
@@ -0,0 +1,76 @@
+# ===== test_mongo_client.py =====
+# One Mongo client per process, created on first use, never at import time.
+import os
+import subprocess
+import sys
+
+import pytest
+
+import services.mongo_client as mongo_client
+
+
+class FakeClient:
+    made = []
+
+    def __init__(self, uri, **options):
+        self.uri, self.options = uri, options
+        FakeClient.made.append(self)
+
+    def __getitem__(self, name):
+        return FakeDatabase(self, name)
+
+
+class FakeDatabase:
+    def __init__(self, client, name):
+        self.client, self.name = client, name
+
+    def __getitem__(self, name):
+        return FakeCollection(self, name)
+
+
+class FakeCollection:
+    def __init__(self, database, name):
+        self.database, self.name = database, name
+
+    def find_one(self, query):
+        return {'client': self.database.client, 'collection': self.name}
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    FakeClient.made = []
+    monkeypatch.setattr(mongo_client, 'MongoClient', FakeClient)
+    monkeypatch.setattr(mongo_client, '_client', None)
+    monkeypatch.setattr(mongo_client, '_client_pid', None)
+    return FakeClient.made
+
+
+def test_client_is_created_once_per_process(fake_clients, monkeypatch):
+    first = mongo_client.get_mongo_client()
+    assert mongo_client.get_mongo_client() is first
+    assert len(fake_clients) == 1
+
+    # A forked worker has a different pid and must not reuse the parent's client
+    monkeypatch.setattr(mongo_client.os, 'getpid', lambda: -1)
+    child = mongo_client.get_mongo_client()
+    assert child is not first
+    assert mongo_client.get_mongo_client() is child
+    assert len(fake_clients) == 2
+
+
+def test_lazy_collection_rebinds_to_the_current_client(fake_clients, monkeypatch):
+    users = mongo_client.collection('users')
+    assert fake_clients == []
+    assert users.find_one({})['client'] is fake_clients[0]
+    assert users.find_one({})['collection'] == 'users'
+
+    monkeypatch.setattr(mongo_client.os, 'getpid', lambda: -1)
+    assert users.find_one({})['client'] is fake_clients[1]
+
+
+def test_importing_the_app_opens_no_client():
+    code = ('import app, services.mongo_client as m; '
+            'assert m._client is None, "client created at import"')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=120,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
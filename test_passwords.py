@@ -0,0 +1,40 @@
+# ===== test_passwords.py =====
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import settings
+import services.passwords as passwords
+
+
+@pytest.fixture
+def tiny_pool(monkeypatch):
+    """One hashing thread and one queue slot, with a task that holds the thread."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(passwords, '_executor', executor)
+    monkeypatch.setattr(passwords, '_slots', threading.BoundedSemaphore(2))
+    release = threading.Event()
+    passwords._run('test', release.wait, 5)
+    yield release
+    release.set()
+    executor.shutdown(wait=True)
+
+
+def test_full_pool_rejects_without_waiting(tiny_pool, monkeypatch):
+    monkeypatch.setattr(settings, 'PASSWORD_HASH_TIMEOUT_SECONDS', 5)
+    passwords._run('test', tiny_pool.wait, 5)  # takes the queue slot
+    began = time.perf_counter()
+    with pytest.raises(passwords.HashPoolBusy):
+        passwords.verify_password('pbkdf2:sha256:1$salt$hash', 'pw')
+    assert time.perf_counter() - began < 0.1
+
+
+def test_queued_hash_times_out_and_frees_its_slot(tiny_pool, monkeypatch):
+    monkeypatch.setattr(settings, 'PASSWORD_HASH_TIMEOUT_SECONDS', 0.1)
+    with pytest.raises(passwords.HashPoolBusy):
+        passwords.hash_password('pw')
+    # The cancelled hash gave its slot back
+    assert passwords._slots.acquire(blocking=False)
+    passwords._slots.release()
@@ -0,0 +1,46 @@
+# ===== test_query_monitor.py =====
+# Slow-query entries record the shape of a query, never the values in it.
+import json
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+from config import settings
+from services.query_monitor import CommandMonitor, query_shape
+
+
+def test_query_shape_masks_every_leaf():
+    query = {
+        'email': 'asha@example.com',
+        '_id': {'$in': [ObjectId() for _ in range(8)]},
+        '$or': [{'cgpa': {'$gte': 8.5}}, {'branch': 'CSE', 'backlogs': 0}],
+        'active': True,
+        'deleted_at': None,
+    }
+    assert query_shape(query) == {
+        'email': '?',
+        '_id': {'$in': ['?'] * 5},
+        '$or': [{'cgpa': {'$gte': '?'}}, {'branch': '?', 'backlogs': '?'}],
+        'active': '?',
+        'deleted_at': '?',
+    }
+    assert query_shape('secret') == '?'
+
+
+def test_slow_command_entry_holds_only_the_shape(monkeypatch):
+    monkeypatch.setattr(settings, 'MONGO_SLOW_QUERY_MS', 0)
+    monkeypatch.setattr(settings, 'MONGO_EXPLAIN_SAMPLE_RATE', 0)
+    monkeypatch.setattr(settings, 'MONGO_SLOW_QUERY_LOG', '')
+    monitor = CommandMonitor()
+    command = {'find': 'users', 'filter': {'username': 'asha', 'password_hash': 'scrypt$abc'},
+               'sort': {'created_at': -1}, 'lsid': {'id': 'session'}}
+    event = SimpleNamespace(command_name='find', command=command, database_name='campusfit',
+                            request_id=1, connection_id=('localhost', 27017), duration_micros=5000)
+    monitor.started(event)
+    monitor.succeeded(event)
+
+    entry = monitor.stats()['recent'][0]
+    assert entry['command'] == 'users.find'
+    assert entry['query'] == {'username': '?', 'password_hash': '?'}
+    assert entry['sort'] == {'created_at': '?'}
+    assert 'asha' not in json.dumps(entry) and 'scrypt' not in json.dumps(entry)
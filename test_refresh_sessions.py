@@ -0,0 +1,60 @@
+# ===== test_refresh_sessions.py =====
+# Refresh-token families: one-time rotation, a grace window for concurrent
+# tabs, and reuse detection, without growing the revocation list.
+from datetime import datetime
+
+import pytest
+
+from config import settings
+from services import refresh_sessions
+from utils.jwt_utils import create_token_pair, verify_jwt
+
+
+@pytest.fixture
+def tokens(memory_repos):
+    user_id = memory_repos.users.create('student', 'student@example.com', 'unused-hash')
+    return refresh_sessions.start(user_id, 'student')
+
+
+def _refresh(client, token):
+    return client.post('/api/auth/refresh', json={'refresh_token': token})
+
+
+def test_rotation_replaces_the_current_jti_without_revoking(client, memory_repos, tokens):
+    response = _refresh(client, tokens['refresh_token'])
+    assert response.status_code == 200
+    rotated = response.get_json()['refresh_token']
+    assert verify_jwt(rotated)['fid'] == verify_jwt(tokens['refresh_token'])['fid']
+    assert _refresh(client, rotated).status_code == 200
+    assert memory_repos.revoked_tokens.active_ids(datetime.utcnow()) == []
+
+
+def test_previous_token_works_within_grace_window(client, tokens):
+    first = _refresh(client, tokens['refresh_token']).get_json()['refresh_token']
+    # A second tab refreshing with the same token gets the current id, so
+    # neither tab's token is invalidated by the other
+    second = _refresh(client, tokens['refresh_token']).get_json()['refresh_token']
+    assert verify_jwt(second)['jti'] == verify_jwt(first)['jti']
+    assert _refresh(client, first).status_code == 200
+
+
+def test_reuse_after_grace_window_ends_the_family(client, tokens, monkeypatch):
+    monkeypatch.setattr(settings, 'REFRESH_GRACE_SECONDS', -1)
+    current = _refresh(client, tokens['refresh_token']).get_json()['refresh_token']
+    assert _refresh(client, tokens['refresh_token']).status_code == 401
+    assert _refresh(client, current).status_code == 401
+
+
+def test_logout_ends_the_family(client, tokens):
+    response = client.post('/api/auth/logout', json={'refresh_token': tokens['refresh_token']})
+    assert response.get_json()['revoked'] == 1
+    assert _refresh(client, tokens['refresh_token']).status_code == 401
+
+
+def test_token_from_before_families_is_claimed_once(client, memory_repos):
+    user_id = memory_repos.users.create('legacy', 'legacy@example.com', 'unused-hash')
+    legacy = create_token_pair(user_id, 'legacy')['refresh_token']
+    response = _refresh(client, legacy)
+    assert response.status_code == 200
+    assert 'fid' in verify_jwt(response.get_json()['refresh_token'])
+    assert _refresh(client, legacy).status_code == 401
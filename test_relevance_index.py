@@ -0,0 +1,93 @@
+# ===== test_relevance_index.py =====
+# Incremental BM25 corpus statistics, on mongomock so no server is needed.
+from collections import Counter
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from config import settings
+import services.relevance_index as relevance_index
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock.MongoClient().db
+    monkeypatch.setattr(relevance_index, '_db', lambda: database)
+    monkeypatch.setattr(relevance_index, '_table', None)
+    return database
+
+
+def _df(db):
+    return {doc['_id']: doc['df'] for doc in db.term_stats.find()}
+
+
+def _corpus(db):
+    doc = db.corpus_stats.find_one({'_id': relevance_index.CORPUS_ID})
+    return doc['docs'], doc['total_length']
+
+
+def test_add_replace_and_remove_keep_df_and_lengths_exact(db):
+    assert relevance_index.index_document('resume:a', Counter({'python': 2, 'flask': 1}), version='h1')
+    assert relevance_index.index_document('resume:b', Counter({'python': 1, 'java': 3}), version='h2')
+    assert _df(db) == {'python': 2, 'flask': 1, 'java': 1}
+    assert _corpus(db) == (2, 7)
+
+    # Same version again: nothing changes
+    assert not relevance_index.index_document('resume:a', Counter({'python': 2, 'flask': 1}), version='h1')
+    assert _corpus(db) == (2, 7)
+
+    # Replacing a document moves only the difference
+    assert relevance_index.index_document('resume:a', Counter({'python': 1, 'django': 1}), version='h3')
+    assert _df(db) == {'python': 2, 'django': 1, 'java': 1}
+    assert _corpus(db) == (2, 6)
+
+    assert relevance_index.remove_document('resume:b')
+    assert not relevance_index.remove_document('resume:b')
+    assert _df(db) == {'python': 1, 'django': 1}
+    assert _corpus(db) == (1, 2)
+
+
+def test_stale_revision_is_retried_not_double_counted(db, monkeypatch):
+    relevance_index.index_document('job:1', Counter({'sql': 1}))
+    real_find_one = db.corpus_docs.find_one
+    raced = []
+
+    class RacingDocs:
+        """Lets a competing writer replace the document between read and write, once."""
+
+        def find_one(self, *args, **kwargs):
+            doc = real_find_one(*args, **kwargs)
+            if not raced:
+                raced.append(True)
+                db.corpus_docs.update_one({'_id': 'job:1'}, {'$set': {'terms': ['sql', 'excel'], 'length': 2},
+                                                            '$inc': {'rev': 1}})
+                db.term_stats.update_one({'_id': 'excel'}, {'$inc': {'df': 1}}, upsert=True)
+                db.corpus_stats.update_one({'_id': relevance_index.CORPUS_ID}, {'$inc': {'total_length': 1}})
+            return doc
+
+        def __getattr__(self, attr):
+            return getattr(db.corpus_docs, attr)
+
+    class RacingDb:
+        corpus_docs = RacingDocs()
+
+        def __getattr__(self, attr):
+            return getattr(db, attr)
+
+    monkeypatch.setattr(relevance_index, '_db', lambda: RacingDb())
+    assert relevance_index.index_document('job:1', Counter({'python': 1}))
+    assert _df(db) == {'python': 1}
+    assert _corpus(db) == (1, 1)
+
+
+def test_idf_table_keeps_the_most_common_terms(db, monkeypatch):
+    monkeypatch.setattr(settings, 'RELEVANCE_MAX_TERMS', 2)
+    monkeypatch.setattr(settings, 'RELEVANCE_IDF_CACHE_SECONDS', 0)
+    relevance_index.index_document('a', Counter({'python': 1, 'sql': 1, 'cobol': 1}))
+    relevance_index.index_document('b', Counter({'python': 1, 'sql': 1}))
+    relevance_index.index_document('c', Counter({'python': 1}))
+    table = relevance_index.idf_table()
+    assert set(table.vocab) == {'python', 'sql'}
+    assert table.docs == 3
+    assert table.avg_length == 2.0
@@ -0,0 +1,167 @@
+# ===== test_repositories.py =====
+# One contract for every repository backend. The in-memory backend always
+# runs; the Mongo backend runs when MONGO_TEST_URI points at a server it may
+# create and drop a scratch database on.
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.repositories import DuplicateKey, memory_repositories, mongo_repositories
+
+
+@pytest.fixture(params=['memory', 'mongo'])
+def repos(request):
+    if request.param == 'memory':
+        yield memory_repositories()
+        return
+    uri = os.getenv('MONGO_TEST_URI')
+    if not uri:
+        pytest.skip('MONGO_TEST_URI not set')
+    from pymongo import MongoClient
+    from services.indexes import apply_indexes
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000)
+    name = f'campusfit_contract_{uuid.uuid4().hex[:8]}'
+    db = client[name]
+    apply_indexes(db)
+    try:
+        yield mongo_repositories(db)
+    finally:
+        client.drop_database(name)
+        client.close()
+
+
+def test_users(repos):
+    user_id = repos.users.create('alice', 'alice@example.com', 'hash-1')
+    user = repos.users.find_by_username('alice')
+    assert str(user['_id']) == user_id
+    assert user['email'] == 'alice@example.com'
+    assert repos.users.find_by_id(user_id)['username'] == 'alice'
+    assert repos.users.find_by_id('not-an-id') is None
+    assert repos.users.find_by_username('bob') is None
+
+    with pytest.raises(DuplicateKey) as e:
+        repos.users.create('alice', 'other@example.com', 'hash')
+    assert e.value.field == 'username'
+    with pytest.raises(DuplicateKey) as e:
+        repos.users.create('alice2', 'alice@example.com', 'hash')
+    assert e.value.field == 'email'
+
+    bob_id = repos.users.create('bob', 'bob@example.com', 'hash-2')
+    assert repos.users.usernames([user_id, bob_id, 'junk']) == {user_id: 'alice', bob_id: 'bob'}
+
+    assert not repos.users.find_by_id(user_id).get('is_admin')
+    assert repos.users.set_admin('alice', True)
+    assert repos.users.find_by_id(user_id)['is_admin'] is True
+    assert repos.users.set_admin('alice', False)
+    assert not repos.users.find_by_id(user_id).get('is_admin')
+    assert not repos.users.set_admin('nobody', True)
+
+    assert not repos.users.replace_password_hash(user_id, 'stale', 'hash-3')
+    assert repos.users.replace_password_hash(user_id, 'hash-1', 'hash-3')
+    assert repos.users.find_by_id(user_id)['password_hash'] == 'hash-3'
+
+
+def test_users_create_many(repos):
+    repos.users.create('taken', 'taken@example.com', 'hash')
+    errors = repos.users.create_many([
+        {'username': 'carol', 'email': 'carol@example.com', 'password_hash': 'h1'},
+        {'username': 'taken', 'email': 'new@example.com', 'password_hash': 'h2'},
+        {'username': 'dave', 'email': 'dave@example.com', 'password_hash': 'h3'},
+        {'username': 'carol', 'email': 'carol2@example.com', 'password_hash': 'h4'},
+    ])
+    assert sorted(errors) == [1, 3]
+    assert all(message.startswith('Duplicate') for message in errors.values())
+    assert repos.users.find_by_username('carol')['password_hash'] == 'h1'
+    assert repos.users.find_by_username('dave')['email'] == 'dave@example.com'
+    assert repos.users.create_many([]) == {}
+
+
+def test_profiles(repos):
+    assert repos.profiles.get('u1') is None
+    repos.profiles.update('u1', {'cgpa': 8.5, 'backlogs': 0, 'branch': 'CSE'})
+    repos.profiles.update('u1', {'resume_score': 72})
+    repos.profiles.update('u2', {'cgpa': 6.9, 'backlogs': 2, 'branch': 'ECE'})
+    repos.profiles.update('u3', {'resume_score': 50})
+
+    profile = repos.profiles.get('u1')
+    assert profile == {'user_id': 'u1', 'cgpa': 8.5, 'backlogs': 0, 'branch': 'CSE', 'resume_score': 72}
+
+    assert sorted(repos.profiles.find_user_ids()) == ['u1', 'u2', 'u3']
+    assert repos.profiles.find_user_ids(min_cgpa=7) == ['u1']
+    assert repos.profiles.find_user_ids(max_backlogs=1) == ['u1']
+    assert repos.profiles.find_user_ids(branch='ECE') == ['u2']
+    assert sorted(repos.profiles.get_many(['u1', 'u2', 'missing'])) == ['u1', 'u2']
+
+
+def test_test_sessions(repos):
+    repos.test_sessions.save('u1', 'APTITUDE', {'score': 10, 'details': [{'q': 1}]})
+    repos.test_sessions.save('u1', 'APTITUDE', {'score': 20, 'details': []})
+    repos.test_sessions.save('u1', 'TECHNICAL', {'score': 5, 'details': []})
+    repos.test_sessions.save('u2', 'APTITUDE', {'score': 1, 'details': []})
+
+    sessions = sorted(repos.test_sessions.for_user('u1'), key=lambda doc: doc['type'])
+    assert [(doc['type'], doc['score']) for doc in sessions] == [('APTITUDE', 20), ('TECHNICAL', 5)]
+    assert all('_id' not in doc and doc['user_id'] == 'u1' for doc in sessions)
+    assert repos.test_sessions.for_user('nobody') == []
+
+
+def test_questions(repos):
+    ids = repos.questions.add_many([
+        {'category': 'APTITUDE', 'question': 'Q1', 'options': ['a', 'b'], 'correct_letter': 'A'},
+        {'category': 'APTITUDE', 'question': 'Q2', 'options': ['a', 'b'], 'correct_letter': 'B'},
+        {'category': 'TECHNICAL', 'question': 'Q3', 'options': ['a', 'b'], 'correct_letter': 'A'},
+    ])
+    assert len(ids) == 3
+    assert sorted(q['question'] for q in repos.questions.by_category('APTITUDE')) == ['Q1', 'Q2']
+    assert repos.questions.by_category('NONE') == []
+    assert repos.questions.get(ids[2])['question'] == 'Q3'
+    assert str(repos.questions.get(ids[2])['_id']) == ids[2]
+    assert repos.questions.get('0' * 24) is None
+    with pytest.raises(ValueError):
+        repos.questions.get('bad-id')
+
+
+def test_revoked_tokens(repos):
+    now = datetime.utcnow().replace(microsecond=0)
+    assert repos.revoked_tokens.add('a', now + timedelta(hours=1), now - timedelta(minutes=5))
+    assert not repos.revoked_tokens.add('a', now + timedelta(hours=1), now)
+    assert repos.revoked_tokens.add('b', now + timedelta(hours=1), now)
+    assert repos.revoked_tokens.add('old', now - timedelta(hours=1), now - timedelta(hours=2))
+    assert repos.revoked_tokens.exists('a')
+    assert not repos.revoked_tokens.exists('c')
+    assert repos.revoked_tokens.ids_since(now - timedelta(minutes=1)) == ['b']
+    assert sorted(repos.revoked_tokens.active_ids(now)) == ['a', 'b']
+
+
+def test_results_are_copies(repos):
+    repos.profiles.update('u1', {'cgpa': 8.0, 'skills': ['python']})
+    profile = repos.profiles.get('u1')
+    profile['cgpa'] = 0
+    profile['skills'].append('java')
+    assert repos.profiles.get('u1') == {'user_id': 'u1', 'cgpa': 8.0, 'skills': ['python']}
+
+
+def test_refresh_sessions(repos):
+    now = datetime.utcnow().replace(microsecond=0)
+    later = now + timedelta(hours=1)
+    repos.refresh_sessions.create('f1', 'u1', 'j1', later)
+    repos.refresh_sessions.create('f2', 'u1', 'k1', later)
+    repos.refresh_sessions.create('f3', 'u2', 'm1', later)
+    with pytest.raises(DuplicateKey):
+        repos.refresh_sessions.create('f1', 'u1', 'j9', later)
+
+    assert repos.refresh_sessions.rotate('f1', 'j1', 'j2', now, later)
+    assert not repos.refresh_sessions.rotate('f1', 'j1', 'j3', now, later)
+    session = repos.refresh_sessions.get('f1')
+    assert (session['current_jti'], session['previous_jti'], session['rotated_at']) == ('j2', 'j1', now)
+
+    assert repos.refresh_sessions.delete('f1')
+    assert not repos.refresh_sessions.delete('f1')
+    assert repos.refresh_sessions.get('f1') is None
+    assert repos.refresh_sessions.delete_for_user('u1') == 1
+    assert repos.refresh_sessions.get('f3')['user_id'] == 'u2'
+
+    repos.refresh_sessions.create('old', 'u3', 'x', now - timedelta(seconds=1))
+    assert repos.refresh_sessions.get('old') is None
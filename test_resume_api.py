@@ -0,0 +1,111 @@
+# ===== test_resume_api.py =====
+# Request validation and resume handles on the resume endpoints; Mongo
+# collections are mongomock stand-ins.
+from datetime import datetime, timedelta
+
+import pytest
+
+import api.resume as resume_api
+from config import settings
+from utils.jwt_utils import create_token_pair
+
+
+@pytest.fixture
+def auth(memory_repos):
+    user_id = memory_repos.users.create('student', 'student@example.com', 'unused-hash')
+    return {'Authorization': f"Bearer {create_token_pair(user_id, 'student')['token']}"}
+
+
+@pytest.mark.parametrize('body', [
+    {'resume_text': 'Python developer', 'format': 1},
+    {'resume_text': 'Python developer', 'format': ['pdf']},
+    {'resume_text': 'Python developer', 'format': 'txt'},
+    {'resume_text': 'Python developer', 'format': 'pdf', 'job_description': 5},
+    {'resume_text': 7, 'format': 'pdf'},
+])
+def test_text_upload_rejects_bad_fields_with_400(client, auth, body):
+    response = client.post('/api/resume/upload', headers=auth, json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    mongomock = pytest.importorskip('mongomock')
+    coll = mongomock.MongoClient().db.resume_sessions
+    monkeypatch.setattr(resume_api, 'resume_sessions', coll)
+    resume_api._handle_cache.clear()
+    yield coll
+    resume_api._handle_cache.clear()
+
+
+def _session(sessions, handle, user_id, age_seconds):
+    sessions.insert_one({'handle': handle, 'user_id': user_id, 'filename': 'cv.pdf', 'file_hash': 'h',
+                         'text': 'Python developer', 'quality': None,
+                         'created_at': datetime.utcnow() - timedelta(seconds=age_seconds)})
+
+
+def test_reloaded_handle_expires_with_the_session(sessions, monkeypatch):
+    ttl = settings.RESUME_HANDLE_TTL_SECONDS
+    cached = []
+    original = resume_api._handle_cache.set
+    monkeypatch.setattr(resume_api._handle_cache, 'set',
+                        lambda key, value, ttl=None: cached.append(ttl) or original(key, value, ttl=ttl))
+    _session(sessions, 'fresh', 'u1', ttl - 30)
+    _session(sessions, 'expired', 'u1', ttl + 1)
+
+    entry = resume_api._load_resume_handle('fresh')
+    assert entry['parsed'].text == 'Python developer'
+    # Cached for what is left of the session, not a fresh TTL
+    assert 0 < cached[0] <= 30
+    assert resume_api._load_resume_handle('expired') is None
+    assert resume_api._load_resume_handle('missing') is None
+
+
+def test_match_checks_owner_and_job_description_size(client, auth, sessions, memory_repos, monkeypatch):
+    monkeypatch.setattr(settings, 'MAX_JOB_DESCRIPTION_CHARS', 100)
+    user_id = memory_repos.users.find_by_username('student')['_id']
+    _session(sessions, 'mine', str(user_id), 0)
+    _session(sessions, 'theirs', 'someone-else', 0)
+
+    assert client.post('/api/resume/theirs/match', headers=auth, json={}).status_code == 404
+    response = client.post('/api/resume/mine/match', headers=auth, json={'job_description': 'x' * 101})
+    assert response.status_code == 413
+    assert response.get_json()['max_chars'] == 100
+    assert client.post('/api/resume/mine/match', headers=auth, json={'job_description': 5}).status_code == 400
+
+
+@pytest.fixture
+def analyses(monkeypatch):
+    mongomock = pytest.importorskip('mongomock')
+    coll = mongomock.MongoClient().db.resume_analyses
+    monkeypatch.setattr(resume_api, 'resume_analyses', coll)
+    return coll
+
+
+def _analysis(score):
+    return {'overall_score': score, 'ats_score': 70, 'quality_score': 60,
+            'content_score': 30, 'structure_score': 25}
+
+
+def test_history_payload_round_trips_through_zlib(client, auth, analyses, memory_repos):
+    user_id = str(memory_repos.users.find_by_username('student')['_id'])
+    response = {'score': 81, 'job_aware': True, 'quality_feedback': ['✅ Strong use of action verbs'],
+                'resume_text': 'Résumé ' * 100, 'handle': 'h', 'handle_expires_in': 60}
+    resume_api._store_analysis(user_id, 'cv.pdf', 'hash-1', _analysis(81), response)
+
+    doc = analyses.find_one({'user_id': user_id})
+    assert isinstance(doc['payload'], bytes)
+    assert doc['overall_score'] == 81 and doc['job_aware'] is True
+
+    latest = client.get('/api/resume/latest', headers=auth).get_json()
+    assert latest['quality_feedback'] == response['quality_feedback']
+    assert latest['resume_text'] == response['resume_text']
+    assert latest['content_score'] == 30 and latest['structure_score'] == 25
+    assert latest['file_hash'] == 'hash-1' and 'handle' not in latest
+
+    items = client.get('/api/resume/history', headers=auth).get_json()['items']
+    assert [item['overall_score'] for item in items] == [81]
+    assert 'payload' not in items[0] and 'resume_text' not in items[0]
+    item = client.get(f"/api/resume/history/{items[0]['id']}", headers=auth).get_json()
+    assert item['resume_text'] == response['resume_text']
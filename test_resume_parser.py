@@ -0,0 +1,58 @@
+# ===== test_resume_parser.py =====
+from collections import Counter
+
+from services.resume_analysis import quality_scanner
+from utils.keyword_scanner import KeywordScanner
+from utils.resume_parser import ParsedResume
+from utils.taxonomy import current_taxonomy
+
+RESUME = """İlker Şahin
+Professional Summary
+Backend developer with 3+ years building REST APIs in Python and Django.
+
+WORK EXPERIENCE
+• Developed and deployed microservices; improved latency by 40%.
+• Led a team of 4 and managed CI/CD pipelines on AWS with Docker.
+
+Technical Skills:
+Python, Java, SQL, MongoDB, React, machine learning
+
+Education
+B.Tech Computer Science, 2019
+"""
+
+
+def naive_count(term, text):
+    # Overlapping occurrences, the semantics the scanner's lookahead gives
+    return sum(1 for i in range(len(text)) if text.startswith(term, i))
+
+
+def test_sections_slice_the_original_text_after_unicode_lowercasing():
+    parsed = ParsedResume(RESUME)
+    # 'İ'.lower() is two characters, so lower and text differ in length
+    assert len(parsed.lower) != len(parsed.text)
+    assert list(parsed.sections) == ['summary', 'experience', 'skills', 'education']
+    assert parsed.section_text('experience').startswith('WORK EXPERIENCE\n')
+    assert parsed.section_text('skills').startswith('Technical Skills:\nPython')
+    assert parsed.section_text('education').endswith('2019\n')
+    assert parsed.section_text('projects') is None
+
+
+def test_term_freq_counts_tokens():
+    parsed = ParsedResume(RESUME)
+    assert parsed.term_freq == Counter(parsed.tokens)
+    assert parsed.term_freq['python'] == 2
+
+
+def test_scanner_hits_match_naive_substring_counts():
+    parsed = ParsedResume(RESUME)
+    scanner = quality_scanner(current_taxonomy())
+    hits = parsed.keyword_hits(scanner)
+    for term in scanner.terms:
+        assert hits[term] == naive_count(term, parsed.lower), term
+        assert (term in hits) == (term in parsed.lower), term
+
+
+def test_scanner_counts_prefixes_and_overlaps():
+    hits = KeywordScanner(['java', 'javascript', 'script', 'aa']).scan('javascript java aaa')
+    assert hits == Counter({'java': 2, 'javascript': 1, 'script': 1, 'aa': 2})
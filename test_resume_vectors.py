@@ -0,0 +1,92 @@
+# ===== test_resume_vectors.py =====
+# Cached ranking matrix and skill sets kept current across taxonomy changes.
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+import services.resume_vectors as resume_vectors
+from utils.jwt_utils import create_token_pair
+from utils.resume_parser import ParsedResume
+
+V1 = {
+    'version': 'v1',
+    'role_categories': {'backend': ['backend']},
+    'skill_categories': {'programming_languages': {'python': ['python', 'django']}},
+}
+V2 = dict(V1, version='v2', skill_categories={
+    'programming_languages': {'python': ['python', 'django', 'flask']}})
+
+
+@pytest.fixture
+def vectors(monkeypatch, taxonomy_file):
+    taxonomy_file(V1)
+    coll = mongomock.MongoClient().db.resume_vectors
+    monkeypatch.setattr(resume_vectors, 'resume_vectors', coll)
+    resume_vectors._matrix_cache.clear()
+    yield coll
+    resume_vectors._matrix_cache.clear()
+
+
+def test_matrix_is_cached_until_this_worker_stores_a_vector(vectors, monkeypatch):
+    resume_vectors.store_resume_vector('a', ParsedResume('Python and Django developer'))
+    first = resume_vectors.ranking_matrix()
+    assert first['user_ids'] == ['a'] and first['skills'] == [['django', 'python']]
+
+    reads = []
+    find = vectors.find
+    monkeypatch.setattr(vectors, 'find', lambda *a, **kw: reads.append(a) or find(*a, **kw))
+    assert resume_vectors.ranking_matrix() is first
+    assert reads == []
+
+    resume_vectors.store_resume_vector('b', ParsedResume('Python only'))
+    second = resume_vectors.ranking_matrix()
+    assert second['user_ids'] == ['a', 'b'] and len(reads) == 1
+    assert second['matrix'].shape[0] == 2
+
+
+def test_taxonomy_change_rederives_stored_skills(vectors, taxonomy_file):
+    resume_vectors.store_resume_vector('a', ParsedResume('Python, Flask and Django'))
+    assert resume_vectors.student_skills('a') == ['django', 'python']
+    old = resume_vectors.ranking_matrix()
+
+    taxonomy_file(V2)
+    entry = resume_vectors.ranking_matrix()
+    assert entry is not old
+    assert entry['skills'] == [['django', 'flask', 'python']]
+    assert entry['stale'] == set()
+    # Written back, so the next rebuild does not repeat the work
+    doc = vectors.find_one({'user_id': 'a'})
+    assert doc['skills'] == ['django', 'flask', 'python'] and doc['taxonomy_version'].startswith('v2-')
+    assert resume_vectors.student_skills('a') == ['django', 'flask', 'python']
+
+
+def test_vectors_without_tokens_are_flagged_stale(vectors):
+    vectors.insert_one({'user_id': 'legacy', 'skills': ['python']})
+    entry = resume_vectors.ranking_matrix()
+    assert entry['user_ids'] == ['legacy']
+    assert entry['skills'] == [['python']]
+    assert entry['stale'] == {'legacy'}
+
+
+def test_ranking_filters_rows_and_reports_stale(vectors, client, memory_repos):
+    admin_id = memory_repos.users.create('tpo', 'tpo@example.com', 'unused-hash')
+    memory_repos.users.set_admin('tpo', True)
+    headers = {'Authorization': f"Bearer {create_token_pair(admin_id, 'tpo')['token']}"}
+    for user_id, text, cgpa in [('u1', 'Python', 9.0), ('u2', 'Python and Django', 6.0), ('u3', 'Django', 8.0)]:
+        resume_vectors.store_resume_vector(user_id, ParsedResume(text))
+        memory_repos.profiles.update(user_id, {'cgpa': cgpa})
+    vectors.insert_one({'user_id': 'u4', 'skills': ['python', 'django']})
+    memory_repos.profiles.update('u4', {'cgpa': 7.0})
+
+    body = {'job_description': 'Backend role: Python and Django', 'k': 10}
+    response = client.post('/api/ranking/students', headers=headers, json=body)
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [r['user_id'] for r in results] == ['u2', 'u4', 'u1', 'u3']
+    assert [r['stale'] for r in results] == [False, True, False, False]
+
+    response = client.post('/api/ranking/students', headers=headers, json=dict(body, min_cgpa=7.5))
+    data = response.get_json()
+    assert data['candidates'] == 2
+    assert [r['user_id'] for r in data['results']] == ['u1', 'u3']
+    assert [r['skills_coverage'] for r in data['results']] == [50.0, 50.0]
@@ -0,0 +1,43 @@
+# ===== test_roster.py =====
+import io
+
+import pytest
+from werkzeug.security import check_password_hash
+
+from config import settings
+from services.roster import import_roster, open_roster
+
+ROSTER = """Username,Email,Password
+asha,asha@example.com,pw-1
+ravi,RAVI@example.com,pw-2
+asha,asha2@example.com,pw-3
+meera,,pw-4
+kiran,ravi@example.com,pw-5
+taken,new@example.com,pw-6
+vik,vik@example.com,pw-7
+"""
+
+
+def test_duplicates_and_missing_fields_are_reported_per_row(memory_repos, monkeypatch):
+    monkeypatch.setattr(settings, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1')
+    memory_repos.users.create('taken', 'taken@example.com', 'hash')
+
+    reports = list(import_roster(open_roster(io.StringIO(ROSTER)), chunk_size=4, workers=1))
+    assert [(r['rows'], r['inserted']) for r in reports] == [([2, 5], 2), ([6, 8], 1)]
+    errors = {e['row']: (e['username'], e['error']) for r in reports for e in r['errors']}
+    assert errors == {
+        4: ('asha', 'Duplicate username'),
+        5: ('meera', 'Missing fields'),
+        6: ('kiran', 'Duplicate email'),
+        7: ('taken', 'Duplicate username'),
+    }
+
+    ravi = memory_repos.users.find_by_username('ravi')
+    assert ravi['email'] == 'ravi@example.com'
+    assert check_password_hash(ravi['password_hash'], 'pw-2')
+    assert memory_repos.users.find_by_username('vik') is not None
+
+
+def test_roster_without_required_columns_is_rejected():
+    with pytest.raises(ValueError, match='password'):
+        open_roster(io.StringIO('username,email\nasha,asha@example.com\n'))
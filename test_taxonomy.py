@@ -0,0 +1,68 @@
+# ===== test_taxonomy.py =====
+import json
+
+import pytest
+
+import utils.taxonomy as taxonomy
+
+GOOD = {
+    'version': 'v1',
+    'role_categories': {'backend': ['backend', 'api']},
+    'skill_categories': {'programming_languages': {'python': ['python', 'django']}},
+    'quality': {'tech_keywords': {'python': 1, 'docker': 0.5}, 'action_verbs': ['built', 'led']},
+}
+
+
+def _with(**changes):
+    data = json.loads(json.dumps(GOOD))
+    for path, value in changes.items():
+        target = data
+        *parents, leaf = path.split('__')
+        for key in parents:
+            target = target[key]
+        target[leaf] = value
+    return data
+
+
+@pytest.mark.parametrize('bad', [
+    _with(role_categories={'backend': ['api', 7]}),
+    _with(skill_categories={'programming_languages': {'python': [None]}}),
+    _with(quality__tech_keywords={'python': 'high'}),
+    _with(quality__tech_keywords={'python': True}),
+    _with(quality__action_verbs=['built', 3]),
+    _with(quality='none'),
+    _with(version=''),
+])
+def test_from_dict_rejects_wrong_types(bad):
+    with pytest.raises(ValueError):
+        taxonomy.CompiledTaxonomy.from_dict(bad)
+
+
+@pytest.mark.parametrize('bad', [
+    '{"version": "v2", ',
+    _with(version='v2', quality__tech_keywords={'python': 'high'}),
+    _with(version='v2', skill_categories={'programming_languages': {'python': [42]}}),
+])
+def test_bad_reload_keeps_the_previous_taxonomy(taxonomy_file, bad):
+    taxonomy_file(GOOD)
+    assert taxonomy.current_taxonomy().version == 'v1'
+
+    taxonomy_file(bad)
+    current = taxonomy.current_taxonomy()
+    assert current.version == 'v1'
+    assert 'django' in current.skill_terms
+
+    taxonomy_file(_with(version='v3'))
+    assert taxonomy.current_taxonomy().version == 'v3'
+
+
+def test_build_errors_beyond_validation_keep_the_previous_taxonomy(taxonomy_file, monkeypatch):
+    taxonomy_file(GOOD)
+    assert taxonomy.current_taxonomy().version == 'v1'
+
+    def broken(path):
+        raise AttributeError('unexpected')
+
+    monkeypatch.setattr(taxonomy, 'load_taxonomy', broken)
+    taxonomy_file(_with(version='v2'))
+    assert taxonomy.current_taxonomy().version == 'v1'
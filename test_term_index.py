@@ -0,0 +1,61 @@
+# ===== test_term_index.py =====
+from utils.job_matching import get_analyzer, get_scorer
+from utils.term_index import TermIndex
+
+
+def test_terms_match_on_word_boundaries():
+    index = TermIndex('A good student fluent in JavaScript and Golang.')
+    assert 'javascript' in index
+    assert 'golang' in index
+    assert 'go' not in index
+    assert 'ts' not in index
+    assert 'java' not in index
+
+
+def test_phrases_and_symbol_terms():
+    index = TermIndex('Built APIs with Flask-RESTful, ASP.NET, C++ and React.js on Google Cloud Platform')
+    for term in ['flask-restful', 'flask restful', 'asp.net', '.net', 'c++', 'react.js', 'react',
+                 'google cloud', 'google cloud platform']:
+        assert term in index, term
+    assert 'c#' not in index
+
+
+def test_skills_coverage_uses_word_boundaries():
+    requirements = get_analyzer().extract_job_requirements(
+        'Backend developer: Python, Django and TypeScript. Students and good communicators welcome.'
+    )
+    python_skills = requirements['required_skills']['programming_languages']['python']
+    assert python_skills == ['python', 'django']
+    # 'students' must not count as TypeScript's 'ts'
+    assert requirements['required_skills']['programming_languages']['javascript'] == ['typescript']
+
+    result = get_scorer().calculate_job_match_score('Python and Django projects for students', requirements)
+    assert 0 < result['skills_coverage'] < 100
+
+
+def test_role_detection_uses_word_boundaries():
+    analyzer = get_analyzer()
+    # 'pm' inside "development" used to make this a product manager role
+    assert analyzer.extract_job_requirements('Web development internship.')['role_category'] == 'general'
+    assert analyzer.extract_job_requirements('Seeking a Product Manager.')['role_category'] == 'product_manager'
+    assert analyzer.extract_job_requirements('Good communicators welcome.')['role_category'] == 'general'
+
+
+def test_role_ties_go_to_the_first_listed_category():
+    analyzer = get_analyzer()
+    taxonomy = analyzer.taxonomy
+    jd = 'Backend developer'
+    hits = taxonomy.role_hits(TermIndex(jd))
+    assert hits == {'software_engineer': 1, 'backend': 1}
+    first = next(c for c in taxonomy.role_categories if c in hits)
+    assert analyzer.extract_job_requirements(jd)['role_category'] == first
+
+
+def test_reverse_indexes_cover_the_taxonomy():
+    taxonomy = get_analyzer().taxonomy
+    for category, subcategories in taxonomy.skill_categories.items():
+        for subcat, skills in subcategories.items():
+            for skill in skills:
+                assert (category, subcat) in taxonomy.skill_index[skill]
+    assert sum(len(categories) for categories in taxonomy.role_index.values()) == sum(
+        len(keywords) for keywords in taxonomy.role_categories.values())
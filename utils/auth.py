@@ -1,6 +1,43 @@
+import hashlib
+import time
 from functools import wraps
 from flask import request, jsonify, g
 from utils.jwt_utils import verify_jwt
+from utils.lru import TTLCache
+from config import settings
+from services.metrics import register_source
+from services.repositories import repository
+from services.revocation import is_revoked
+
+# Decoded payloads of recently verified tokens, keyed by token digest, so a
+# dashboard re-sending the same token skips the HMAC check and JSON decode
+_token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS)
+register_source('auth_token_cache', _token_cache.stats)
+users = repository('users')
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def verify_token_cached(token: str) -> dict:
+    """verify_jwt with a cache that never outlives the token's own exp."""
+    key = _token_digest(token)
+    payload = _token_cache.get(key)
+    if payload is None:
+        payload = verify_jwt(token)
+        ttl = settings.AUTH_TOKEN_CACHE_TTL_SECONDS
+        if 'exp' in payload:
+            ttl = min(ttl, payload['exp'] - time.time())
+        if ttl > 0:
+            _token_cache.set(key, payload, ttl=ttl)
+    # Views get their own copy; the cached payload is shared
+    return dict(payload)
+
+
+def evict_cached_token(token: str) -> None:
+    """Revocation hook: drop one token (logout) from this worker's cache."""
+    _token_cache.pop(_token_digest(token))
 
 
 def require_auth(fn):
@@ -14,9 +51,33 @@ def require_auth(fn):
             return jsonify({'error': 'Missing or invalid Authorization header'}), 401
         token = auth.split(' ', 1)[1].strip()
         try:
-            payload = verify_jwt(token)
-            g.user = payload
+            payload = verify_token_cached(token)
         except Exception:
             return jsonify({'error': 'Invalid or expired token'}), 401
+        # Refresh tokens only work on /api/auth/refresh; tokens without a
+        # type predate refresh tokens and are access tokens
+        if payload.get('type', 'access') != 'access':
+            return jsonify({'error': 'Invalid or expired token'}), 401
+        if payload.get('jti') and is_revoked(payload['jti']):
+            return jsonify({'error': 'Token has been revoked'}), 401
+        g.user = payload
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def require_admin(fn):
+    """Allow only users whose record is flagged ``is_admin``; use after require_auth.
+
+    The flag is set only by ``scripts/set_admin.py``, never from a request,
+    and is read from the user record on every call, so withdrawing it takes
+    effect immediately.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if request.method == 'OPTIONS':
+            return fn(*args, **kwargs)
+        user = users.find_by_id((g.get('user') or {}).get('sub'))
+        if not user or not user.get('is_admin'):
+            return jsonify({'error': 'Admin access required'}), 403
         return fn(*args, **kwargs)
     return wrapper
@@ -0,0 +1,77 @@
+"""
+Streaming text extraction for DOCX resumes.
+
+Only the WordprocessingML text parts (headers, main document, footers) are
+read from the zip archive; embedded media is never touched.  Each part is fed
+through an incremental XML parser so memory stays flat regardless of the
+document size.  Output matches ``docx2txt.process`` for the same file.
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, IO, Union
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BREAKS = (W_NS + 'br', W_NS + 'cr')
+
+HEADER_RE = re.compile(r'word/header[0-9]*\.xml')
+FOOTER_RE = re.compile(r'word/footer[0-9]*\.xml')
+DOCUMENT_PART = 'word/document.xml'
+
+# Read parts in small chunks so a huge document.xml never sits in memory whole
+CHUNK_SIZE = 64 * 1024
+
+
+def _iter_part_text(stream: IO[bytes]) -> Iterator[str]:
+    """Yield text fragments from one XML part in document order."""
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        yield from _drain(parser)
+    parser.close()
+    yield from _drain(parser)
+
+
+def _drain(parser: ET.XMLPullParser) -> Iterator[str]:
+    for event, elem in parser.read_events():
+        tag = elem.tag
+        if event == 'start':
+            # docx2txt walks the tree in pre-order, so paragraph separators
+            # are emitted before the paragraph's own runs
+            if tag == W_P:
+                yield '\n\n'
+            elif tag == W_TAB:
+                yield '\t'
+            elif tag in W_BREAKS:
+                yield '\n'
+        else:
+            # Text is only complete once the closing tag has been parsed
+            if tag == W_T:
+                if elem.text:
+                    yield elem.text
+            elif tag == W_P:
+                elem.clear()
+
+
+def iter_docx_text(source: Union[str, IO[bytes]]) -> Iterator[str]:
+    """Yield text fragments from a DOCX file: headers, body, then footers."""
+    with zipfile.ZipFile(source) as zf:
+        names = zf.namelist()
+        parts = [n for n in names if HEADER_RE.match(n)]
+        parts.append(DOCUMENT_PART)
+        parts.extend(n for n in names if FOOTER_RE.match(n))
+        for name in parts:
+            with zf.open(name) as stream:
+                yield from _iter_part_text(stream)
+
+
+def extract_docx_text(source: Union[str, IO[bytes]]) -> str:
+    """Extract plain text from a DOCX file, equivalent to docx2txt.process."""
+    return ''.join(iter_docx_text(source)).strip()
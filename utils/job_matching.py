@@ -4,88 +4,93 @@ This module provides intelligent resume analysis based on specific job requireme
 """
 
 import re
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple, Union
 from collections import Counter
 import math
 
+from utils.resume_parser import ParsedResume
+from utils.term_index import TermIndex, WORD_RE
+from utils.taxonomy import CompiledTaxonomy, current_taxonomy
+from services.metrics import stage_timer
+
+# Vocabularies that are not part of the versioned taxonomy file
+EDUCATION_KEYWORDS = {
+    'degree_required': ['bachelor', 'master', 'phd', 'degree required', 'bs', 'ms', 'mba'],
+    'preferred_fields': ['computer science', 'engineering', 'mathematics', 'statistics'],
+    'certifications': ['aws certified', 'google cloud', 'microsoft certified', 'cissp', 'pmp']
+}
+
+SOFT_SKILLS = [
+    'leadership', 'communication', 'teamwork', 'problem solving',
+    'analytical', 'creative', 'adaptable', 'collaborative',
+    'detail oriented', 'time management', 'critical thinking'
+]
+
+COMPANY_CONTEXTS = {
+    'startup': ['startup', 'fast-paced', 'agile environment', 'wear many hats'],
+    'enterprise': ['enterprise', 'large scale', 'fortune 500', 'established company'],
+    'remote_friendly': ['remote', 'work from home', 'distributed team', 'flexible'],
+    'tech_focus': ['cutting edge', 'innovative', 'latest technologies', 'research']
+}
+
+# Resume-side evidence for each company context
+CONTEXT_INDICATORS = {
+    'startup': ['agile', 'fast-paced', 'startup', 'mvp', 'rapid'],
+    'enterprise': ['enterprise', 'scale', 'large team', 'process'],
+    'remote_friendly': ['remote', 'distributed', 'collaboration'],
+    'tech_focus': ['innovation', 'research', 'cutting edge', 'latest']
+}
+
+DEGREE_TERMS = ['bachelor', 'master', 'degree', 'bs', 'ms', 'phd']
+
+# Patterns compiled once at import
+EXPERIENCE_PATTERNS = {
+    'entry': re.compile(r'(entry.level|junior|0.2 years?|fresh|graduate|new grad)'),
+    'mid': re.compile(r'(2.5 years?|3.7 years?|mid.level|intermediate)'),
+    'senior': re.compile(r'(5.10 years?|senior|lead|principal|8\+ years?)'),
+    'expert': re.compile(r'(10\+ years?|expert|architect|15\+ years?)')
+}
+YEARS_REQUIRED_RE = re.compile(r'(\d+)[\+\-\s]*years?')
+PRIORITY_WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+
+
 class JobDescriptionAnalyzer:
     """Analyzes job descriptions to extract key requirements and skills."""
     
-    def __init__(self):
-        self.role_categories = {
-            'software_engineer': ['software engineer', 'developer', 'programmer', 'sde', 'software development'],
-            'data_scientist': ['data scientist', 'data analyst', 'ml engineer', 'machine learning', 'ai engineer'],
-            'devops': ['devops', 'site reliability', 'platform engineer', 'infrastructure', 'cloud engineer'],
-            'frontend': ['frontend', 'front-end', 'ui developer', 'react developer', 'angular developer'],
-            'backend': ['backend', 'back-end', 'api developer', 'server developer', 'microservices'],
-            'fullstack': ['fullstack', 'full-stack', 'full stack developer'],
-            'mobile': ['mobile developer', 'ios developer', 'android developer', 'react native', 'flutter'],
-            'qa': ['qa engineer', 'test engineer', 'automation tester', 'quality assurance'],
-            'product_manager': ['product manager', 'product owner', 'pm', 'product lead'],
-            'cybersecurity': ['security engineer', 'cybersecurity', 'infosec', 'security analyst']
-        }
-        
-        self.skill_categories = {
-            'programming_languages': {
-                'python': ['python', 'django', 'flask', 'fastapi', 'pandas', 'numpy'],
-                'javascript': ['javascript', 'js', 'node.js', 'nodejs', 'typescript', 'ts'],
-                'java': ['java', 'spring', 'spring boot', 'hibernate', 'maven', 'gradle'],
-                'csharp': ['c#', 'csharp', '.net', 'dotnet', 'asp.net', 'entity framework'],
-                'cpp': ['c++', 'cpp', 'c plus plus'],
-                'go': ['golang', 'go lang', 'go programming'],
-                'rust': ['rust', 'rust lang'],
-                'php': ['php', 'laravel', 'symfony', 'codeigniter'],
-                'ruby': ['ruby', 'rails', 'ruby on rails'],
-                'swift': ['swift', 'ios', 'xcode'],
-                'kotlin': ['kotlin', 'android'],
-                'scala': ['scala', 'akka', 'play framework'],
-                'r': ['r programming', 'r language', 'rstudio']
-            },
-            'frameworks': {
-                'react': ['react', 'reactjs', 'react.js', 'redux', 'next.js', 'nextjs'],
-                'angular': ['angular', 'angularjs', 'rxjs', 'ngrx'],
-                'vue': ['vue', 'vuejs', 'vue.js', 'nuxt', 'vuex'],
-                'django': ['django', 'django rest framework', 'drf'],
-                'flask': ['flask', 'flask-restful'],
-                'express': ['express', 'expressjs', 'express.js'],
-                'spring': ['spring boot', 'spring framework', 'spring mvc'],
-                'laravel': ['laravel', 'eloquent'],
-                'rails': ['ruby on rails', 'rails']
-            },
-            'databases': {
-                'sql': ['mysql', 'postgresql', 'postgres', 'sql server', 'oracle', 'sqlite'],
-                'nosql': ['mongodb', 'cassandra', 'dynamodb', 'couchdb', 'neo4j'],
-                'cache': ['redis', 'memcached', 'elasticsearch']
-            },
-            'cloud_platforms': {
-                'aws': ['aws', 'amazon web services', 'ec2', 's3', 'lambda', 'rds', 'cloudformation'],
-                'azure': ['azure', 'microsoft azure', 'azure functions', 'cosmos db'],
-                'gcp': ['google cloud', 'gcp', 'google cloud platform', 'firebase', 'bigquery'],
-                'other_cloud': ['heroku', 'digitalocean', 'linode', 'vultr']
-            },
-            'devops_tools': {
-                'containers': ['docker', 'kubernetes', 'k8s', 'containerd', 'podman'],
-                'cicd': ['jenkins', 'gitlab ci', 'github actions', 'circleci', 'travis ci'],
-                'monitoring': ['prometheus', 'grafana', 'elk stack', 'datadog', 'new relic'],
-                'iac': ['terraform', 'ansible', 'chef', 'puppet', 'cloudformation']
-            },
-            'data_science': {
-                'ml_frameworks': ['tensorflow', 'pytorch', 'scikit-learn', 'keras', 'xgboost'],
-                'data_tools': ['pandas', 'numpy', 'matplotlib', 'seaborn', 'jupyter'],
-                'big_data': ['spark', 'hadoop', 'kafka', 'airflow', 'dask'],
-                'visualization': ['tableau', 'power bi', 'plotly', 'd3.js']
-            }
-        }
+    def __init__(self, taxonomy: CompiledTaxonomy = None):
+        # No per-instance setup: vocabularies live in the compiled taxonomy
+        self._taxonomy = taxonomy
+    
+    @property
+    def taxonomy(self) -> CompiledTaxonomy:
+        return self._taxonomy or current_taxonomy()
+    
+    @property
+    def role_categories(self) -> Dict[str, List[str]]:
+        return self.taxonomy.role_categories
+    
+    @property
+    def skill_categories(self) -> Dict[str, Dict[str, List[str]]]:
+        return self.taxonomy.skill_categories
     
     def extract_job_requirements(self, job_description: str) -> Dict:
         """Extract structured requirements from job description."""
+        with stage_timer('jd_parse'):
+            return self._extract_job_requirements(job_description)
+    
+    def _extract_job_requirements(self, job_description: str) -> Dict:
         jd_lower = job_description.lower()
+        jd_tokens = WORD_RE.findall(jd_lower)
+        # One taxonomy for the whole extraction, even if a reload lands mid-way
+        taxonomy = self.taxonomy
+        
+        jd_index = TermIndex.from_tokens(jd_tokens)
         
         # Detect role category
-        role_category = self._detect_role_category(jd_lower)
+        role_category = self._detect_role_category(jd_index, taxonomy)
         
         # Extract required skills
-        required_skills = self._extract_skills(jd_lower)
+        required_skills = self._extract_skills(jd_index, taxonomy)
         
         # Extract experience level
         experience_level = self._extract_experience_level(jd_lower)
@@ -106,52 +111,47 @@ class JobDescriptionAnalyzer:
             'education_requirements': education_req,
             'soft_skills': soft_skills,
             'company_context': company_context,
-            'priority_keywords': self._extract_priority_keywords(jd_lower, role_category)
+            'priority_keywords': self._extract_priority_keywords(jd_lower, role_category, taxonomy),
+            'query_terms': self._extract_query_terms(jd_tokens),
+            'taxonomy_version': taxonomy.key
         }
     
-    def _detect_role_category(self, jd_lower: str) -> str:
+    def _detect_role_category(self, jd_index: TermIndex, taxonomy: CompiledTaxonomy) -> str:
         """Detect the primary role category from job description."""
-        role_scores = {}
-        
-        for category, keywords in self.role_categories.items():
-            score = sum(1 for keyword in keywords if keyword in jd_lower)
-            if score > 0:
-                role_scores[category] = score
+        role_scores = taxonomy.role_hits(jd_index)
         
         if not role_scores:
             return 'general'
         
-        return max(role_scores.keys(), key=role_scores.get)
+        # Ties go to the category listed first in the taxonomy
+        return max(taxonomy.role_categories, key=lambda category: role_scores.get(category, 0))
     
-    def _extract_skills(self, jd_lower: str) -> Dict[str, List[str]]:
+    def _extract_skills(self, jd_index: TermIndex, taxonomy: CompiledTaxonomy) -> Dict[str, List[str]]:
         """Extract technical skills by category."""
-        found_skills = {}
+        present = taxonomy.find_skills(jd_index)
+        found_skills = {
+            category: {subcat: [] for subcat in subcategories}
+            for category, subcategories in taxonomy.skill_categories.items()
+        }
         
-        for category, subcategories in self.skill_categories.items():
-            found_skills[category] = {}
-            for subcat, skills in subcategories.items():
-                found_skills[category][subcat] = [
-                    skill for skill in skills if skill in jd_lower
-                ]
+        # Only subcategories listing a skill that is present need filling;
+        # filtering their lists keeps the taxonomy's order
+        touched = {place for skill in present for place in taxonomy.skill_index[skill]}
+        for category, subcat in touched:
+            skills = taxonomy.skill_categories[category][subcat]
+            found_skills[category][subcat] = [skill for skill in skills if skill in present]
         
         return found_skills
     
     def _extract_experience_level(self, jd_lower: str) -> Dict:
         """Extract experience requirements."""
-        experience_patterns = {
-            'entry': r'(entry.level|junior|0.2 years?|fresh|graduate|new grad)',
-            'mid': r'(2.5 years?|3.7 years?|mid.level|intermediate)',
-            'senior': r'(5.10 years?|senior|lead|principal|8\+ years?)',
-            'expert': r'(10\+ years?|expert|architect|15\+ years?)'
-        }
-        
         levels = {}
-        for level, pattern in experience_patterns.items():
-            if re.search(pattern, jd_lower):
+        for level, pattern in EXPERIENCE_PATTERNS.items():
+            if pattern.search(jd_lower):
                 levels[level] = True
         
         # Extract specific year requirements
-        year_matches = re.findall(r'(\d+)[\+\-\s]*years?', jd_lower)
+        year_matches = YEARS_REQUIRED_RE.findall(jd_lower)
         years_required = [int(year) for year in year_matches if int(year) <= 20]
         
         return {
@@ -162,54 +162,36 @@ class JobDescriptionAnalyzer:
     
     def _extract_education_requirements(self, jd_lower: str) -> Dict:
         """Extract education requirements."""
-        education_keywords = {
-            'degree_required': ['bachelor', 'master', 'phd', 'degree required', 'bs', 'ms', 'mba'],
-            'preferred_fields': ['computer science', 'engineering', 'mathematics', 'statistics'],
-            'certifications': ['aws certified', 'google cloud', 'microsoft certified', 'cissp', 'pmp']
-        }
-        
         found_edu = {}
-        for category, keywords in education_keywords.items():
+        for category, keywords in EDUCATION_KEYWORDS.items():
             found_edu[category] = [kw for kw in keywords if kw in jd_lower]
         
         return found_edu
     
     def _extract_soft_skills(self, jd_lower: str) -> List[str]:
         """Extract soft skills mentioned."""
-        soft_skills = [
-            'leadership', 'communication', 'teamwork', 'problem solving',
-            'analytical', 'creative', 'adaptable', 'collaborative',
-            'detail oriented', 'time management', 'critical thinking'
-        ]
-        
-        return [skill for skill in soft_skills if skill in jd_lower]
+        return [skill for skill in SOFT_SKILLS if skill in jd_lower]
     
     def _extract_company_context(self, jd_lower: str) -> Dict:
         """Extract company context indicators."""
-        contexts = {
-            'startup': ['startup', 'fast-paced', 'agile environment', 'wear many hats'],
-            'enterprise': ['enterprise', 'large scale', 'fortune 500', 'established company'],
-            'remote_friendly': ['remote', 'work from home', 'distributed team', 'flexible'],
-            'tech_focus': ['cutting edge', 'innovative', 'latest technologies', 'research']
-        }
-        
         found_contexts = {}
-        for context, indicators in contexts.items():
+        for context, indicators in COMPANY_CONTEXTS.items():
             found_contexts[context] = any(indicator in jd_lower for indicator in indicators)
         
         return found_contexts
     
-    def _extract_priority_keywords(self, jd_lower: str, role_category: str) -> List[str]:
+    def _extract_query_terms(self, jd_tokens: List[str]) -> List[str]:
+        """Distinct JD tokens, tokenized like resumes, for corpus relevance scoring."""
+        return sorted({token for token in jd_tokens if len(token) > 1 and not token.isdigit()})
+    
+    def _extract_priority_keywords(self, jd_lower: str, role_category: str, taxonomy: CompiledTaxonomy) -> List[str]:
         """Extract high-priority keywords based on frequency and role."""
         # Common technical terms that appear frequently
-        all_words = re.findall(r'\b[a-z]{3,}\b', jd_lower)
+        all_words = PRIORITY_WORD_RE.findall(jd_lower)
         word_freq = Counter(all_words)
         
         # Filter for technical terms and role-specific keywords
-        tech_terms = []
-        for category_skills in self.skill_categories.values():
-            for skills in category_skills.values():
-                tech_terms.extend(skills)
+        tech_terms = taxonomy.skill_terms
         
         priority_words = []
         for word, freq in word_freq.most_common(20):
@@ -222,21 +204,34 @@ class JobDescriptionAnalyzer:
 class JobAwareResumeScorer:
     """Enhanced resume scorer that considers job description requirements."""
     
-    def __init__(self):
-        self.jd_analyzer = JobDescriptionAnalyzer()
+    def __init__(self, analyzer: JobDescriptionAnalyzer = None, keyword_scorer=None):
+        self.jd_analyzer = analyzer or get_analyzer()
+        # Optional (parsed, job_requirements) -> score or None replacing the
+        # priority-keyword component; None falls back to it
+        self.keyword_scorer = keyword_scorer
     
-    def calculate_job_match_score(self, resume_text: str, job_requirements: Dict) -> Dict:
+    def calculate_job_match_score(self, resume: Union[str, ParsedResume], job_requirements: Dict) -> Dict:
         """Calculate how well resume matches specific job requirements."""
-        resume_lower = resume_text.lower()
+        with stage_timer('job_match'):
+            return self._calculate_job_match_score(resume, job_requirements)
+    
+    def _calculate_job_match_score(self, resume: Union[str, ParsedResume], job_requirements: Dict) -> Dict:
+        parsed = resume if isinstance(resume, ParsedResume) else ParsedResume(resume)
+        resume_lower = parsed.lower
         
         # 1. Role-specific keyword matching (40% of ATS score)
-        keyword_score = self._calculate_keyword_match(resume_lower, job_requirements)
+        keyword_score = None
+        if self.keyword_scorer is not None:
+            keyword_score = self.keyword_scorer(parsed, job_requirements)
+        if keyword_score is None:
+            keyword_score = self._calculate_keyword_match(resume_lower, job_requirements)
         
         # 2. Experience level alignment (25% of ATS score)
-        experience_score = self._calculate_experience_alignment(resume_lower, job_requirements)
+        experience_score = self._calculate_experience_alignment(parsed, job_requirements)
         
         # 3. Technical skills coverage (25% of ATS score)
-        skills_score = self._calculate_skills_coverage(resume_lower, job_requirements)
+        skill_matches = self._match_required_skills(parsed, job_requirements)
+        skills_score = self._calculate_skills_coverage(skill_matches)
         
         # 4. Soft skills and culture fit (10% of ATS score)
         culture_score = self._calculate_culture_fit(resume_lower, job_requirements)
@@ -268,7 +263,8 @@ class JobAwareResumeScorer:
             'culture_fit': culture_score,
             'improvement_areas': improvement_areas,
             'detailed_feedback': self._generate_detailed_feedback(
-                resume_lower, job_requirements, keyword_score, experience_score, skills_score, culture_score
+                resume_lower, job_requirements, skill_matches,
+                keyword_score, experience_score, skills_score, culture_score
             )
         }
     
@@ -293,14 +289,13 @@ class JobAwareResumeScorer:
         else:
             return 50
     
-    def _calculate_experience_alignment(self, resume_lower: str, job_req: Dict) -> float:
+    def _calculate_experience_alignment(self, parsed: ParsedResume, job_req: Dict) -> float:
         """Calculate experience level alignment."""
         exp_req = job_req.get('experience_level', {})
         avg_years_req = exp_req.get('avg_years', 0)
         
-        # Extract years from resume
-        resume_years = re.findall(r'(\d+)[\+\s]*years?', resume_lower)
-        resume_years = [int(year) for year in resume_years if int(year) <= 20]
+        # Years mentioned in the resume
+        resume_years = parsed.years_mentioned
         
         if not resume_years and avg_years_req == 0:
             return 80  # Both unclear, give benefit of doubt
@@ -324,27 +319,39 @@ class JobAwareResumeScorer:
         else:
             return max(50, 75 - (diff * 5))
     
-    def _calculate_skills_coverage(self, resume_lower: str, job_req: Dict) -> float:
-        """Calculate technical skills coverage."""
+    def _match_required_skills(self, parsed: ParsedResume, job_req: Dict) -> Dict[str, Dict[str, Tuple[List[str], List[str]]]]:
+        """Split each required skill subcategory into (matched, missing) skills."""
         required_skills = job_req.get('required_skills', {})
-        role_category = job_req.get('role_category', 'general')
+        index = parsed.term_index
         
+        skill_matches = {}
+        for category, subcategories in required_skills.items():
+            skill_matches[category] = {}
+            for subcat, skills in subcategories.items():
+                present = index.matches(skills)
+                skill_matches[category][subcat] = (
+                    [skill for skill in skills if skill in present],
+                    [skill for skill in skills if skill not in present],
+                )
+        return skill_matches
+    
+    def _calculate_skills_coverage(self, skill_matches: Dict) -> float:
+        """Calculate technical skills coverage."""
         total_score = 0
         category_count = 0
         
-        for category, subcategories in required_skills.items():
+        for category, subcategories in skill_matches.items():
             if not subcategories:
                 continue
                 
             category_score = 0
             subcat_count = 0
             
-            for subcat, skills in subcategories.items():
-                if not skills:
+            for subcat, (matched, missing) in subcategories.items():
+                if not matched and not missing:
                     continue
                     
-                matches = sum(1 for skill in skills if skill in resume_lower)
-                subcat_score = (matches / len(skills)) * 100
+                subcat_score = (len(matched) / (len(matched) + len(missing))) * 100
                 category_score += subcat_score
                 subcat_count += 1
             
@@ -371,22 +378,15 @@ class JobAwareResumeScorer:
             score += skill_bonus
         
         # Company context alignment
-        context_indicators = {
-            'startup': ['agile', 'fast-paced', 'startup', 'mvp', 'rapid'],
-            'enterprise': ['enterprise', 'scale', 'large team', 'process'],
-            'remote_friendly': ['remote', 'distributed', 'collaboration'],
-            'tech_focus': ['innovation', 'research', 'cutting edge', 'latest']
-        }
-        
         for context, is_relevant in company_context.items():
-            if is_relevant and context in context_indicators:
-                indicators = context_indicators[context]
+            if is_relevant and context in CONTEXT_INDICATORS:
+                indicators = CONTEXT_INDICATORS[context]
                 if any(indicator in resume_lower for indicator in indicators):
                     score += 5
         
         return min(100, score)
     
-    def _generate_detailed_feedback(self, resume_lower: str, job_req: Dict, 
+    def _generate_detailed_feedback(self, resume_lower: str, job_req: Dict, skill_matches: Dict,
                                   keyword_score: float, exp_score: float, 
                                   skills_score: float, culture_score: float) -> List[str]:
         """Generate detailed, actionable feedback with specific faults and improvements."""
@@ -416,31 +416,28 @@ class JobAwareResumeScorer:
             feedback.append(f"🔧 IMPROVE: Quantify achievements with years/duration (e.g., 'Led team for 3 years')")
         
         # Detailed skills gap analysis
-        required_skills = job_req.get('required_skills', {})
         role_category = job_req.get('role_category', 'general')
         
         if skills_score < 70:
             missing_skill_categories = []
-            for category, subcategories in required_skills.items():
-                for subcat, skills in subcategories.items():
-                    if skills and not any(skill in resume_lower for skill in skills):
+            for category, subcategories in skill_matches.items():
+                for subcat, (matched, missing) in subcategories.items():
+                    if missing and not matched:
                         missing_skill_categories.append(f"{category.replace('_', ' ').title()}")
             
             if missing_skill_categories:
                 feedback.append(f"❌ FAULT: Missing key {role_category.replace('_', ' ')} skills in {', '.join(set(missing_skill_categories[:3]))}")
                 
                 # Specific skill recommendations by category
-                for category, subcategories in required_skills.items():
-                    for subcat, skills in subcategories.items():
-                        missing_skills = [skill for skill in skills if skill not in resume_lower]
+                for category, subcategories in skill_matches.items():
+                    for subcat, (matched, missing_skills) in subcategories.items():
                         if missing_skills and len(missing_skills) <= 3:
                             feedback.append(f"🔧 IMPROVE: Add {category.replace('_', ' ')} skills: {', '.join(missing_skills)}")
         
         # Education and certification gaps
         education_req = job_req.get('education_requirements', {})
         if education_req.get('degree_required'):
-            degree_terms = ['bachelor', 'master', 'degree', 'bs', 'ms', 'phd']
-            if not any(term in resume_lower for term in degree_terms):
+            if not any(term in resume_lower for term in DEGREE_TERMS):
                 feedback.append("❌ FAULT: Education section missing or unclear")
                 feedback.append("🔧 IMPROVE: Clearly state your degree and field of study")
         
@@ -470,3 +467,23 @@ class JobAwareResumeScorer:
             feedback.append("🔧 ACTION PLAN: Rewrite summary to mirror job description language")
         
         return feedback
+
+
+_default_analyzer = None
+_default_scorer = None
+
+
+def get_analyzer() -> JobDescriptionAnalyzer:
+    """Shared analyzer instance; analyzers hold no per-call state."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = JobDescriptionAnalyzer()
+    return _default_analyzer
+
+
+def get_scorer() -> JobAwareResumeScorer:
+    """Shared scorer instance; scorers hold no per-call state."""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = JobAwareResumeScorer(get_analyzer())
+    return _default_scorer
@@ -1,18 +1,43 @@
 import time
+import uuid
 import jwt
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from config import settings
 
 
-def create_jwt(payload: Dict[str, Any], expires_in: int = None) -> str:
+def new_jti() -> str:
+    return uuid.uuid4().hex
+
+
+def create_jwt(payload: Dict[str, Any], expires_in: int = None, jti: Optional[str] = None) -> str:
     if expires_in is None:
         expires_in = settings.JWT_EXPIRES_SECONDS
-    data = {**payload, "exp": int(time.time()) + int(expires_in)}
+    now = int(time.time())
+    # jti names the token so it can be revoked before it expires
+    data = {**payload, "jti": jti or new_jti(), "iat": now, "exp": now + int(expires_in)}
     token = jwt.encode(data, settings.JWT_SECRET, algorithm="HS256")
     if isinstance(token, bytes):
         token = token.decode("utf-8")
     return token
 
 
+def create_token_pair(user_id: str, username: str, family: Optional[str] = None,
+                      refresh_jti: Optional[str] = None) -> Dict[str, Any]:
+    """A short-lived access token plus the refresh token used to renew it.
+
+    ``family`` and ``refresh_jti`` tie the refresh token to a refresh session
+    (see ``services.refresh_sessions``).
+    """
+    claims = {"sub": user_id, "username": username}
+    refresh_claims = {**claims, "type": "refresh"}
+    if family:
+        refresh_claims["fid"] = family
+    return {
+        "token": create_jwt({**claims, "type": "access"}),
+        "refresh_token": create_jwt(refresh_claims, settings.JWT_REFRESH_EXPIRES_SECONDS, refresh_jti),
+        "expires_in": settings.JWT_EXPIRES_SECONDS,
+    }
+
+
 def verify_jwt(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"]) 
@@ -0,0 +1,39 @@
+"""
+Single-pass multi-pattern substring scanner.
+
+Compiles a vocabulary into one alternation regex wrapped in a lookahead, so a
+single walk over the text reports every vocabulary term that occurs anywhere
+in it, with the same semantics as ``term in text`` for each term.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+
+class KeywordScanner:
+    """Finds all occurrences of a fixed set of terms in one pass over the text."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = sorted(set(t for t in terms if t))
+        # Longest alternatives first so the regex reports the longest term
+        # starting at each position; shorter terms starting at the same
+        # position are necessarily prefixes of it and are recovered below.
+        ordered = sorted(self.terms, key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(re.escape(t) for t in ordered) + '))')
+        self._prefixes: Dict[str, List[str]] = {
+            term: [t for t in self.terms if term.startswith(t)] for term in self.terms
+        }
+
+    def scan(self, text: str) -> Counter:
+        """Return a hit table mapping each term found to its occurrence count.
+
+        Terms that never occur are absent from the table, so ``hits[term]``
+        is 0 for them and ``term in hits`` mirrors ``term in text``.
+        """
+        longest = Counter(m.group(1) for m in self._pattern.finditer(text))
+        hits = Counter()
+        for term, count in longest.items():
+            for prefix in self._prefixes[term]:
+                hits[prefix] += count
+        return hits
@@ -0,0 +1,88 @@
+"""
+Structured resume document model.
+
+The raw resume text is processed once per upload into a ``ParsedResume`` and
+the same object is handed to every scorer, so no scorer has to lowercase,
+split or regex-scan the raw string again.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from utils.keyword_scanner import KeywordScanner
+from utils.term_index import TermIndex, WORD_RE
+
+YEARS_RE = re.compile(r'(\d+)[\+\s]*years?')
+BULLET_MARKERS = ['•', '- ', '* ']
+
+# Header line text -> canonical section name
+SECTION_HEADERS = {
+    'summary': 'summary', 'professional summary': 'summary', 'profile': 'summary',
+    'objective': 'objective', 'career objective': 'objective',
+    'experience': 'experience', 'work experience': 'experience',
+    'professional experience': 'experience', 'employment history': 'experience',
+    'internships': 'experience', 'internship': 'experience',
+    'education': 'education', 'academic background': 'education',
+    'skills': 'skills', 'technical skills': 'skills', 'key skills': 'skills',
+    'projects': 'projects', 'academic projects': 'projects',
+    'certifications': 'certifications', 'certificates': 'certifications',
+    'achievements': 'achievements', 'awards': 'achievements',
+    'contact': 'contact', 'contact information': 'contact',
+}
+# Matched against the original text, not ``lower``: lowercasing can change a
+# Unicode string's length ('İ' -> 'i̇'), so offsets found there would not
+# slice the original correctly
+HEADER_LINE_RE = re.compile(r'^[ \t•\-*#]*([a-z][a-z &/]{2,40}?)[ \t:]*$', re.MULTILINE | re.IGNORECASE)
+
+
+class ParsedResume:
+    """Resume text with every derived view the scorers need, computed once."""
+
+    def __init__(self, text: str):
+        self.text = text or ''
+        self.lower = self.text.lower()
+        self.words = self.text.split()
+        self.word_count = len(self.words)
+        self.tokens = WORD_RE.findall(self.lower)
+        self.term_freq = Counter(self.tokens)
+        self.numeric_tokens = [word for word in self.words if any(char.isdigit() for char in word)]
+        self.bullet_count = sum(self.text.count(marker) for marker in BULLET_MARKERS)
+        self.years_mentioned = [int(year) for year in YEARS_RE.findall(self.lower) if int(year) <= 20]
+        self.sections = self._detect_sections()
+        self._hits: Dict[int, Tuple[KeywordScanner, Counter]] = {}
+        self._term_index: Optional[TermIndex] = None
+
+    def _detect_sections(self) -> Dict[str, Tuple[int, int]]:
+        """Map canonical section names to (start, end) offsets in ``text``."""
+        starts: List[Tuple[int, str]] = []
+        for match in HEADER_LINE_RE.finditer(self.text):
+            name = SECTION_HEADERS.get(match.group(1).strip().lower())
+            if name:
+                starts.append((match.start(), name))
+
+        spans: Dict[str, Tuple[int, int]] = {}
+        for i, (start, name) in enumerate(starts):
+            end = starts[i + 1][0] if i + 1 < len(starts) else len(self.text)
+            # Keep the first occurrence of a repeated header
+            spans.setdefault(name, (start, end))
+        return spans
+
+    def section_text(self, name: str) -> Optional[str]:
+        span = self.sections.get(name)
+        return self.text[span[0]:span[1]] if span else None
+
+    @property
+    def term_index(self) -> TermIndex:
+        """Word n-gram index of the text, built on first use (job matching only)."""
+        if self._term_index is None:
+            self._term_index = TermIndex.from_tokens(self.tokens)
+        return self._term_index
+
+    def keyword_hits(self, scanner: KeywordScanner) -> Counter:
+        """Scan the lowercased text with ``scanner``, memoized per scanner."""
+        entry = self._hits.get(id(scanner))
+        # Holding the scanner keeps its id from being reused by a newer one
+        if entry is None or entry[0] is not scanner:
+            entry = self._hits[id(scanner)] = (scanner, scanner.scan(self.lower))
+        return entry[1]
@@ -0,0 +1,175 @@
+"""
+Versioned skill taxonomy loaded from ``data/taxonomy.json``.
+
+The file holds the role and skill vocabularies used by job matching plus the
+tech keywords and action verbs used by the quality scorer. It is compiled
+into lookup structures once per version. ``current_taxonomy()`` checks the
+file's mtime every few seconds and, when it changes, compiles the new version
+and swaps it in with a single reference assignment, so callers always see one
+complete taxonomy. A file that fails to load leaves the previous version in
+place, whatever was wrong with it.
+
+Caches of derived results key on ``CompiledTaxonomy.key``: the declared
+version plus a digest of the file, so an edit that forgets to bump the
+version still invalidates them.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from config import settings
+from utils.term_index import TermIndex, term_key
+
+
+def _is_term_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(term, str) and term.strip() for term in value)
+
+
+def _is_weight(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class CompiledTaxonomy:
+    """Role and skill vocabularies compiled into frozen lookup structures."""
+
+    def __init__(self, role_categories: Dict[str, List[str]],
+                 skill_categories: Dict[str, Dict[str, List[str]]], version: str = 'builtin',
+                 tech_keywords: Optional[Dict[str, float]] = None, action_verbs: Optional[List[str]] = None,
+                 digest: str = ''):
+        self.version = version
+        self.key = f'{version}-{digest}' if digest else version
+        self.role_categories = role_categories
+        self.skill_categories = skill_categories
+        self.tech_keywords = tech_keywords or {}
+        self.action_verbs = action_verbs or []
+
+        # Every skill term, for O(1) membership tests
+        self.skill_terms: FrozenSet[str] = frozenset(
+            skill for subcategories in skill_categories.values()
+            for skills in subcategories.values() for skill in skills
+        )
+
+        # Token form of each skill -> skills spelled that way
+        skill_keys: Dict[str, List[str]] = {}
+        for skill in self.skill_terms:
+            skill_keys.setdefault(term_key(skill), []).append(skill)
+        self.skill_keys: Dict[str, Tuple[str, ...]] = {
+            key: tuple(skills) for key, skills in skill_keys.items()
+        }
+
+        # Skill -> every (category, subcategory) listing it
+        skill_index: Dict[str, List[Tuple[str, str]]] = {}
+        for category, subcategories in skill_categories.items():
+            for subcat, skills in subcategories.items():
+                for skill in skills:
+                    skill_index.setdefault(skill, []).append((category, subcat))
+        self.skill_index: Dict[str, Tuple[Tuple[str, str], ...]] = {
+            term: tuple(places) for term, places in skill_index.items()
+        }
+
+        # Token form of each role keyword -> the category of every keyword
+        # spelled that way, once per keyword
+        role_index: Dict[str, List[str]] = {}
+        for category, keywords in role_categories.items():
+            for keyword in keywords:
+                role_index.setdefault(term_key(keyword), []).append(category)
+        self.role_index: Dict[str, Tuple[str, ...]] = {
+            key: tuple(categories) for key, categories in role_index.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, digest: str = '') -> 'CompiledTaxonomy':
+        """Validate and compile the parsed contents of a taxonomy file."""
+        version = data.get('version')
+        roles = data.get('role_categories')
+        skills = data.get('skill_categories')
+        quality = data.get('quality') or {}
+        if not isinstance(version, str) or not version:
+            raise ValueError('taxonomy needs a non-empty "version"')
+        if not isinstance(roles, dict) or not all(_is_term_list(v) for v in roles.values()):
+            raise ValueError('"role_categories" must map categories to lists of non-empty strings')
+        if not isinstance(skills, dict) or not all(
+            isinstance(sub, dict) and all(_is_term_list(v) for v in sub.values()) for sub in skills.values()
+        ):
+            raise ValueError('"skill_categories" must map categories to subcategory lists of non-empty strings')
+        if not isinstance(quality, dict):
+            raise ValueError('"quality" must be an object')
+        tech_keywords = quality.get('tech_keywords') or {}
+        if not isinstance(tech_keywords, dict) or not all(
+            isinstance(term, str) and term.strip() and _is_weight(weight) for term, weight in tech_keywords.items()
+        ):
+            raise ValueError('"quality.tech_keywords" must map terms to numeric weights')
+        action_verbs = quality.get('action_verbs') or []
+        if not _is_term_list(action_verbs):
+            raise ValueError('"quality.action_verbs" must be a list of non-empty strings')
+        return cls(roles, skills, version, tech_keywords=dict(tech_keywords),
+                   action_verbs=list(action_verbs), digest=digest)
+
+    def find_skills(self, index: TermIndex) -> Set[str]:
+        """Every taxonomy skill present in ``index`` on word boundaries."""
+        found = set()
+        for key in index.grams & self.skill_keys.keys():
+            found.update(self.skill_keys[key])
+        return found
+
+    def role_hits(self, index: TermIndex) -> Dict[str, int]:
+        """Number of each category's role keywords present in ``index``."""
+        hits: Dict[str, int] = {}
+        for key in index.grams & self.role_index.keys():
+            for category in self.role_index[key]:
+                hits[category] = hits.get(category, 0) + 1
+        return hits
+
+
+def load_taxonomy(path: str) -> CompiledTaxonomy:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return CompiledTaxonomy.from_dict(json.loads(raw.decode('utf-8')), hashlib.sha256(raw).hexdigest()[:12])
+
+
+_current: Optional[CompiledTaxonomy] = None
+_loaded_mtime: Optional[int] = None
+_next_check = 0.0
+_lock = threading.Lock()
+
+
+def _reload_if_changed() -> None:
+    global _current, _loaded_mtime
+    path = settings.TAXONOMY_PATH
+    mtime = None
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        if _current is not None and mtime == _loaded_mtime:
+            return
+        taxonomy = load_taxonomy(path)
+    except Exception as e:
+        # Validation should catch a bad edit, but nothing that goes wrong
+        # while building a new version may take the current one down
+        if _current is None:
+            raise
+        if mtime != _loaded_mtime:
+            print('Taxonomy reload error, keeping version', _current.version, '-', e)
+            # Report a broken file once; the next edit changes the mtime again
+            _loaded_mtime = mtime
+        return
+    _current, _loaded_mtime = taxonomy, mtime
+
+
+def current_taxonomy() -> CompiledTaxonomy:
+    """The active taxonomy, reloaded when the file changes."""
+    global _next_check
+    now = time.monotonic()
+    if now >= _next_check:
+        with _lock:
+            if now >= _next_check:
+                try:
+                    _reload_if_changed()
+                finally:
+                    # Without any taxonomy yet, keep trying on every call
+                    if _current is not None:
+                        _next_check = now + settings.TAXONOMY_RELOAD_SECONDS
+    return _current
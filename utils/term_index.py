@@ -0,0 +1,64 @@
+"""
+Word-boundary term matching over a token index.
+
+Text is tokenized once into a set of word n-grams; a taxonomy term matches
+when its own tokens appear as a contiguous run. Unlike ``term in text`` this
+does not let 'go' match "good", 'java' match "javascript" or 'ts' match
+"students", and each lookup is a set probe instead of a scan of the text.
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Set
+
+# The one tokenizer for resumes and job descriptions: ParsedResume.tokens,
+# BM25 terms and taxonomy lookups all split text the same way. Words keep '+'
+# and '#' (c++, c#) and inner dots (node.js, asp.net); a leading dot is kept
+# for .net. Hyphens and other punctuation separate words.
+WORD_RE = re.compile(r'\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*')
+MAX_NGRAM = 4
+
+
+def tokenize(text: str) -> List[str]:
+    return WORD_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=4096)
+def term_key(term: str) -> str:
+    """Canonical token form of a term, e.g. 'flask-restful' -> 'flask restful'."""
+    return ' '.join(tokenize(term))
+
+
+class TermIndex:
+    """Set of word n-grams in a text, for word-boundary term lookups."""
+
+    def __init__(self, text: str, max_ngram: int = MAX_NGRAM):
+        self._build(tokenize(text), max_ngram)
+
+    @classmethod
+    def from_tokens(cls, tokens: List[str], max_ngram: int = MAX_NGRAM) -> 'TermIndex':
+        """Index text already split by ``tokenize``, without tokenizing it again."""
+        index = cls.__new__(cls)
+        index._build(tokens, max_ngram)
+        return index
+
+    def _build(self, tokens: List[str], max_ngram: int) -> None:
+        grams: Set[str] = set(tokens)
+        for n in range(2, max_ngram + 1):
+            for i in range(len(tokens) - n + 1):
+                grams.add(' '.join(tokens[i:i + n]))
+        # Dotted words also count as their parts: 'react.js' mentions react,
+        # 'asp.net' mentions .net
+        for token in tokens:
+            if '.' in token.strip('.'):
+                head, *tail = token.lstrip('.').split('.')
+                grams.add(head)
+                grams.update('.' + part for part in tail)
+        self.grams: FrozenSet[str] = frozenset(grams)
+
+    def __contains__(self, term: str) -> bool:
+        return term_key(term) in self.grams
+
+    def matches(self, terms: Iterable[str]) -> Set[str]:
+        """The subset of ``terms`` present in the text."""
+        return {term for term in terms if term_key(term) in self.grams}